@@ -8,21 +8,16 @@ Author: DICOM Automation Team
 """
 
 import os
-from pathlib import Path
 import requests
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 import logging
 from datetime import datetime
 
-from dotenv import load_dotenv
+from env_bootstrap import ensure_env_loaded
 
-# Load .env file from project root
-project_root = Path(__file__).resolve().parent
-dotenv_path = project_root / ".env"
-
-if dotenv_path.exists():
-    load_dotenv(dotenv_path)
+# Load .env file from project root (once per process)
+ensure_env_loaded()
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -12,13 +12,15 @@ Author: DICOM Automation Team
 """
 
 import os
-from pathlib import Path
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 import logging
 from datetime import datetime
 
-from dotenv import load_dotenv
+from env_bootstrap import ensure_env_loaded
 from pynetdicom import AE, evt, debug_logger
 from pynetdicom.sop_class import (
     StudyRootQueryRetrieveInformationModelFind,
@@ -26,12 +28,8 @@ from pynetdicom.sop_class import (
 )
 from pydicom.dataset import Dataset
 
-# Load .env file from project root
-project_root = Path(__file__).resolve().parent
-dotenv_path = project_root / ".env"
-
-if dotenv_path.exists():
-    load_dotenv(dotenv_path)
+# Load .env file from project root (once per process)
+ensure_env_loaded()
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -79,6 +77,38 @@ class CompassCFindConfig:
         )
 
 
+# Return keys requested by find_study_by_uid at STUDY level (empty = "return this")
+DEFAULT_STUDY_FIELDS = (
+    'PatientID',
+    'PatientName',
+    'StudyDate',
+    'AccessionNumber',
+    'NumberOfStudyRelatedInstances',
+    'StudyDescription',
+)
+
+# Attributes copied by dataset_to_dict when no explicit field list is given
+DATASET_DICT_FIELDS = (
+    'StudyInstanceUID',
+    'PatientID',
+    'PatientName',
+    'PatientBirthDate',
+    'PatientSex',
+    'StudyDate',
+    'StudyTime',
+    'AccessionNumber',
+    'StudyDescription',
+    'ModalitiesInStudy',
+    'NumberOfStudyRelatedSeries',
+    'NumberOfStudyRelatedInstances',
+    'SeriesInstanceUID',
+    'SeriesNumber',
+    'SeriesDescription',
+    'Modality',
+    'NumberOfSeriesRelatedInstances',
+)
+
+
 _REJECT_RESULT = {1: "rejected-permanent", 2: "rejected-transient"}
 _REJECT_SOURCE = {
     1: "DICOM UL service-user",
@@ -141,27 +171,27 @@ class CompassCFindClient:
         self.ae.add_requested_context(StudyRootQueryRetrieveInformationModelFind)
         self.ae.add_requested_context(PatientRootQueryRetrieveInformationModelFind)
         
+        # Optional long-lived association (see reusing_association)
+        self.reuse_association = False
+        self._assoc = None
+        self._assoc_lock = threading.Lock()
+        
+        # Recently verified studies (see cached_study / remember_study)
+        self._study_cache: Dict[Tuple[str, Optional[str]], Tuple[float, Dict[str, Any]]] = {}
+        self._study_cache_lock = threading.Lock()
+        
         logger.info(f"C-FIND Client initialized: {config.local_ae_title} -> {config.remote_ae_title}")
     
-    def _execute_find(self, query_dataset: Dataset) -> List[Dataset]:
+    def _associate(self):
         """
-        Execute a C-FIND query and return all matching datasets.
-        
-        Args:
-            query_dataset: DICOM dataset with query parameters
-            
+        Open an association to the C-FIND server.
+
         Returns:
-            List of matching DICOM datasets
+            The established association
+
+        Raises:
+            ConnectionError: If the association is rejected
         """
-        results = []
-        
-        # Choose query model
-        if self.config.query_model.upper() == "STUDY":
-            query_model = StudyRootQueryRetrieveInformationModelFind
-        else:
-            query_model = PatientRootQueryRetrieveInformationModelFind
-        
-        # Associate with C-FIND server
         target = f"{self.config.host}:{self.config.port}"
         try:
             assoc = self.ae.associate(
@@ -191,38 +221,146 @@ class CompassCFindClient:
                 f"Calling AE: '{self.config.local_ae_title}'. "
                 f"{reject_info}"
             )
-        
+        return assoc
+    
+    def _shared_association(self):
+        """Return the long-lived association, (re)opening it if needed. Caller holds _assoc_lock."""
+        if self._assoc is not None and self._assoc.is_established:
+            return self._assoc
+        self._assoc = self._associate()
+        return self._assoc
+    
+    def _close_shared_association(self) -> None:
+        """Release the long-lived association, if any. Caller holds _assoc_lock."""
+        if self._assoc is not None and self._assoc.is_established:
+            self._assoc.release()
+        self._assoc = None
+    
+    @contextmanager
+    def reusing_association(self):
+        """
+        Run every C-FIND in the block over one association.
+
+        Queries are serialized on that association. If the server drops it,
+        the next query re-associates.
+        """
+        self.reuse_association = True
         try:
-            # Send C-FIND request
-            responses = assoc.send_c_find(query_dataset, query_model)
+            yield self
+        finally:
+            self.reuse_association = False
+            with self._assoc_lock:
+                self._close_shared_association()
+    
+    def cached_study(
+        self, study_uid: str, patient_id: Optional[str] = None, ttl: float = 30.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a study recorded by remember_study() less than ttl seconds ago.
+        
+        Returns a copy of the stored dict, or None on a miss or when the entry
+        has expired (expired entries are dropped). last_find_strategy is left
+        alone, as another thread's query may own it; callers label the result.
+        """
+        key = (study_uid, patient_id)
+        with self._study_cache_lock:
+            entry = self._study_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, study = entry
+            if time.monotonic() - stored_at > ttl:
+                del self._study_cache[key]
+                return None
+            return dict(study)
+    
+    def remember_study(
+        self, study_uid: str, patient_id: Optional[str], study: Dict[str, Any]
+    ) -> None:
+        """Record a verified study for later cached_study() lookups."""
+        with self._study_cache_lock:
+            self._study_cache[(study_uid, patient_id)] = (time.monotonic(), dict(study))
+    
+    def invalidate_study(self, study_uid: str) -> None:
+        """Forget cached results for study_uid so the next check queries the server."""
+        with self._study_cache_lock:
+            for key in [k for k in self._study_cache if k[0] == study_uid]:
+                del self._study_cache[key]
+    
+    def _execute_find(self, query_dataset: Dataset) -> List[Dataset]:
+        """
+        Execute a C-FIND query and return all matching datasets.
+        
+        Uses a fresh association per query, or the shared one inside
+        reusing_association().
+        
+        Args:
+            query_dataset: DICOM dataset with query parameters
             
-            for (status, identifier) in responses:
-                if status:
-                    # If status is pending, we have a match
-                    if status.Status in (0xFF00, 0xFF01):
-                        if identifier:
-                            results.append(identifier)
-                    # Success or no more matches
-                    elif status.Status == 0x0000:
-                        logger.info(f"C-FIND completed successfully, found {len(results)} matches")
-                    else:
-                        logger.warning(f"C-FIND status: 0x{status.Status:04X}")
-                        raise RuntimeError(f"C-FIND failed with status 0x{status.Status:04X}")
-                else:
-                    logger.error("Connection timed out or was aborted")
-                    break
-                    
+        Returns:
+            List of matching DICOM datasets
+        """
+        # Choose query model
+        if self.config.query_model.upper() == "STUDY":
+            query_model = StudyRootQueryRetrieveInformationModelFind
+        else:
+            query_model = PatientRootQueryRetrieveInformationModelFind
+        
+        if self.reuse_association:
+            with self._assoc_lock:
+                assoc = self._shared_association()
+                try:
+                    return self._collect_find_responses(assoc, query_dataset, query_model)
+                finally:
+                    if not assoc.is_established:
+                        # Aborted/released by the peer; reopen on the next query
+                        self._close_shared_association()
+        
+        # Associate with C-FIND server
+        assoc = self._associate()
+        try:
+            return self._collect_find_responses(assoc, query_dataset, query_model)
         finally:
             assoc.release()
+    
+    def _collect_find_responses(self, assoc, query_dataset: Dataset, query_model) -> List[Dataset]:
+        """Send one C-FIND on ``assoc`` and collect the matching identifiers."""
+        results = []
+        
+        # Send C-FIND request
+        responses = assoc.send_c_find(query_dataset, query_model)
+        
+        for (status, identifier) in responses:
+            if status:
+                # If status is pending, we have a match
+                if status.Status in (0xFF00, 0xFF01):
+                    if identifier:
+                        results.append(identifier)
+                # Success or no more matches
+                elif status.Status == 0x0000:
+                    logger.info(f"C-FIND completed successfully, found {len(results)} matches")
+                else:
+                    logger.warning(f"C-FIND status: 0x{status.Status:04X}")
+                    raise RuntimeError(f"C-FIND failed with status 0x{status.Status:04X}")
+            else:
+                logger.error("Connection timed out or was aborted")
+                break
         
         return results
     
     def find_study_by_uid(
-        self, study_uid: str, patient_id: Optional[str] = None
+        self,
+        study_uid: str,
+        patient_id: Optional[str] = None,
+        *,
+        fields: Sequence[str] = DEFAULT_STUDY_FIELDS,
     ) -> Optional[Dataset]:
         """
         Find a study by Study Instance UID.
 
+        ``fields`` lists the return keys included in the STUDY-level
+        identifier; only those attributes come back in the response, so
+        callers that need a handful of tags can ask for just those.
+
         Strategy (in order):
         1. Patient Root STUDY level — some servers require this model.
         2. Study Root STUDY level — most servers support this.
@@ -248,12 +386,9 @@ class CompassCFindClient:
             ds = Dataset()
             ds.QueryRetrieveLevel = "STUDY"
             ds.StudyInstanceUID = study_uid
-            ds.PatientID = ""
-            ds.PatientName = ""
-            ds.StudyDate = ""
-            ds.AccessionNumber = ""
-            ds.NumberOfStudyRelatedInstances = ""
-            ds.StudyDescription = ""
+            for keyword in fields:
+                if keyword != "StudyInstanceUID":
+                    setattr(ds, keyword, "")
 
             logger.info(f"Querying for study (model={model}, level=STUDY): {study_uid}")
             try:
@@ -294,6 +429,76 @@ class CompassCFindClient:
         self.config.query_model = original_model
         return None
     
+    def find_studies_by_uids(
+        self,
+        study_uids: Sequence[str],
+        *,
+        fields: Sequence[str] = DEFAULT_STUDY_FIELDS,
+    ) -> Dict[str, Optional[Dataset]]:
+        """
+        Find several studies with one STUDY-level C-FIND per query model.
+
+        The identifier carries all UIDs as a multi-valued StudyInstanceUID
+        (DICOM list-of-UID matching), so N studies cost one association and
+        one C-FIND-RQ instead of N. Responses are indexed by their
+        StudyInstanceUID. Query models are tried in the same order as
+        find_study_by_uid; the second model is only asked for UIDs the first
+        did not return. There is no PATIENT-level fallback here.
+
+        Sets ``last_find_strategy`` to the strategy that matched last and
+        ``last_find_level`` to ``"STUDY"`` when anything matched.
+
+        Returns:
+            Dict mapping every requested UID to its Dataset, or None if not found
+
+        Raises:
+            RuntimeError or ValueError if the query failed under every query
+            model (e.g. the server rejects UID-list matching).
+            OSError (including socket.gaierror and ConnectionError) on network
+            or association failures.
+        """
+        found: Dict[str, Optional[Dataset]] = dict.fromkeys(study_uids)
+        original_model = self.config.query_model
+        self.last_find_strategy = None
+        self.last_find_level = None
+        query_error: Optional[Exception] = None
+        answered = False
+
+        try:
+            for model in ("PATIENT", "STUDY"):
+                missing = [uid for uid, ds in found.items() if ds is None]
+                if not missing:
+                    break
+                self.config.query_model = model
+                query = Dataset()
+                query.QueryRetrieveLevel = "STUDY"
+                query.StudyInstanceUID = missing
+                for keyword in fields:
+                    if keyword != "StudyInstanceUID":
+                        setattr(query, keyword, "")
+
+                logger.info(f"Querying for {len(missing)} studies (model={model}, level=STUDY)")
+                try:
+                    results = self._execute_find(query)
+                except (RuntimeError, ValueError) as e:
+                    logger.warning(f"Batched C-FIND with model={model} level=STUDY failed: {e}")
+                    query_error = e
+                    continue
+                answered = True
+
+                for result in results:
+                    uid = str(getattr(result, 'StudyInstanceUID', ''))
+                    if uid in found and found[uid] is None:
+                        found[uid] = result
+                        self.last_find_strategy = f"{model} Root, STUDY level (batched)"
+                        self.last_find_level = "STUDY"
+        finally:
+            self.config.query_model = original_model
+
+        if query_error is not None and not answered:
+            raise query_error
+        return found
+
     def find_studies_by_patient_id(
         self,
         patient_id: str,
@@ -481,40 +686,22 @@ class CompassCFindClient:
         logger.info(f"Querying series for study: {study_uid}")
         return self._execute_find(ds)
     
-    def dataset_to_dict(self, ds: Dataset) -> Dict[str, Any]:
+    def dataset_to_dict(
+        self, ds: Dataset, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         """
         Convert DICOM dataset to dictionary for easier handling.
         
         Args:
             ds: DICOM dataset
+            fields: Attribute keywords to copy (defaults to DATASET_DICT_FIELDS)
             
         Returns:
             Dictionary with DICOM attributes
         """
         result = {}
         
-        # Common study attributes
-        attrs = [
-            'StudyInstanceUID',
-            'PatientID',
-            'PatientName',
-            'PatientBirthDate',
-            'PatientSex',
-            'StudyDate',
-            'StudyTime',
-            'AccessionNumber',
-            'StudyDescription',
-            'ModalitiesInStudy',
-            'NumberOfStudyRelatedSeries',
-            'NumberOfStudyRelatedInstances',
-            'SeriesInstanceUID',
-            'SeriesNumber',
-            'SeriesDescription',
-            'Modality',
-            'NumberOfSeriesRelatedInstances',
-        ]
-        
-        for attr in attrs:
+        for attr in fields if fields is not None else DATASET_DICT_FIELDS:
             if hasattr(ds, attr):
                 value = getattr(ds, attr)
                 # Convert to string for consistency
@@ -13,20 +13,15 @@ Author: DICOM Automation Team
 """
 
 import os
-from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 
-from dotenv import load_dotenv
+from env_bootstrap import ensure_env_loaded
 
-# Load .env file from project root
-project_root = Path(__file__).resolve().parent
-dotenv_path = project_root / ".env"
-
-if dotenv_path.exists():
-    load_dotenv(dotenv_path)
+# Load .env file from project root (once per process)
+ensure_env_loaded()
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -532,6 +527,34 @@ class CompassDatabaseClient:
         results = self.execute_query(query)
         return [row['TABLE_NAME'] for row in results]
     
+    def discover_interesting_tables(self, keywords: List[str]) -> List[str]:
+        """
+        Discover tables whose names contain any of the given keywords.
+        
+        The keyword filter runs server-side, so only matching table names
+        are sent back instead of the full table list.
+        
+        Args:
+            keywords: Case-insensitive substrings to match (e.g. ['job', 'study'])
+            
+        Returns:
+            List of matching table names
+        """
+        if not keywords:
+            return []
+        
+        like_clauses = " OR ".join("LOWER(TABLE_NAME) LIKE ?" for _ in keywords)
+        query = f"""
+        SELECT TABLE_NAME 
+        FROM INFORMATION_SCHEMA.TABLES 
+        WHERE TABLE_TYPE = 'BASE TABLE'
+          AND ({like_clauses})
+        ORDER BY TABLE_NAME
+        """
+        params = tuple(f"%{keyword.lower()}%" for keyword in keywords)
+        results = self.execute_query(query, params)
+        return [row['TABLE_NAME'] for row in results]
+    
     def get_table_schema(self, table_name: str) -> List[Dict[str, Any]]:
         """
         Get schema information for a specific table.
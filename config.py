@@ -9,7 +9,8 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping, Tuple
 
 
 # ============================================================================
@@ -64,7 +65,7 @@ def _routes_from_env() -> Dict[str, Tuple[str, str]]:
     return routes
 
 
-@dataclass
+@dataclass(frozen=True)
 class DicomEndpointConfig:
     """
     DICOM connection configuration - WHERE to send data.
@@ -72,6 +73,8 @@ class DicomEndpointConfig:
     Supports three named routes (HTM_GI, HTM_OPH, HTM_ORTHO). Set COMPASS_ROUTE
     to choose the active one; each route has REMOTE_AE_* and LOCAL_AE_*.
     If COMPASS_ROUTE is unset, falls back to COMPASS_AE_TITLE + LOCAL_AE_TITLE.
+    Frozen (routes is a read-only mapping); use DicomSender.with_endpoint()
+    for per-test AE titles.
     
     Used by: All tests
     """
@@ -79,7 +82,11 @@ class DicomEndpointConfig:
     port: int
     remote_ae_title: str  # Compass's AE Title (called AET)
     local_ae_title: str   # Default calling AE Title (can be overridden per test)
-    routes: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # name -> (remote_ae, local_ae)
+    routes: Mapping[str, Tuple[str, str]] = field(default_factory=dict)  # name -> (remote_ae, local_ae)
+
+    def __post_init__(self):
+        # Read-only view so the frozen config cannot be changed through routes
+        object.__setattr__(self, "routes", MappingProxyType(dict(self.routes)))
 
     @classmethod
     def from_env(cls) -> "DicomEndpointConfig":
@@ -112,6 +119,7 @@ class LoadProfileConfig:
     load_multiplier: float
     test_duration_seconds: int
     concurrency: int
+    images_per_association: int = 1  # 1 = new association per image
 
     @classmethod
     def from_env(cls) -> "LoadProfileConfig":
@@ -120,6 +128,7 @@ class LoadProfileConfig:
             load_multiplier=_env_float("LOAD_MULTIPLIER", 3.0),
             test_duration_seconds=_env_int("TEST_DURATION_SECONDS", 300),
             concurrency=_env_int("LOAD_CONCURRENCY", 8),
+            images_per_association=_env_int("LOAD_IMAGES_PER_ASSOCIATION", 1),
         )
 
 
@@ -173,7 +182,11 @@ class IntegrationTestConfig:
     cfind_verify: bool = True              # Enable C-FIND verification after sends
     cfind_initial_delay: float = 5.0      # Seconds to wait before first C-FIND attempt
     cfind_timeout: int = 60               # Poll timeout in seconds
-    cfind_poll_interval: float = 5.0      # Poll interval in seconds
+    cfind_poll_interval: float = 5.0      # Poll interval in seconds (upper bound of the backoff)
+    cfind_poll_min_interval: float = 0.1  # First retry delay; doubles up to cfind_poll_interval
+    cfind_cache_ttl: float = 30.0         # Seconds a verified study is reused without re-querying
+    cfind_batch: bool = True              # Poll several studies with one UID-list C-FIND
+    parallel_sends: int = 1               # Associations integration tests may open at once
     iims_scu_ae_title: str = "TEAM_SCP"  # Calling AE (SCU) that triggers IIMS routing rules
     iims_scp_ae_title: str = "LB-HTM-IM"  # Called AE (SCP) for non-ordered studies route
     iims_cfind_ae_title: str = "CLINICAL_SCP"  # Called AE for C-FIND verification against MIDIA
@@ -187,6 +200,10 @@ class IntegrationTestConfig:
             cfind_initial_delay=_env_float("CFIND_INITIAL_DELAY", 5.0),
             cfind_timeout=_env_int("CFIND_TIMEOUT", 60),
             cfind_poll_interval=_env_float("CFIND_POLL_INTERVAL", 5.0),
+            cfind_poll_min_interval=_env_float("CFIND_POLL_MIN_INTERVAL", 0.1),
+            cfind_cache_ttl=_env_float("CFIND_CACHE_TTL", 30.0),
+            cfind_batch=_env_str("CFIND_BATCH", "true").lower() not in ("false", "0", "no"),
+            parallel_sends=_env_int("PARALLEL_SENDS", 1),
             iims_scu_ae_title=_env_str("IIMS_SCU_AE_TITLE", "TEAM_SCP"),
             iims_scp_ae_title=_env_str("IIMS_SCP_AE_TITLE", "LB-HTM-IM"),
             iims_cfind_ae_title=_env_str("IIMS_CFIND_AE_TITLE", "CLINICAL_SCP"),
@@ -7,14 +7,20 @@ DICOM file discovery and loading with automatic decompression for performance te
 from __future__ import annotations
 
 import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
 import pydicom
-from pydicom.uid import ImplicitVRLittleEndian, ExplicitVRLittleEndian
+from pydicom.uid import ImplicitVRLittleEndian, ExplicitVRLittleEndian, ExplicitVRBigEndian
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def is_dicom_file(path: Path) -> bool:
     """Check if file is a valid DICOM file by verifying magic string."""
@@ -28,53 +34,124 @@ def is_dicom_file(path: Path) -> bool:
         return False
 
 
-def find_dicom_files(root: Path, recursive: bool = True) -> List[Path]:
-    """Find DICOM files in directory by validating magic string."""
+@dataclass(frozen=True, order=True)
+class DicomFileEntry:
+    """A discovered DICOM file with the stat fields captured during the walk."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+def iter_dicom_entries(root: Path, recursive: bool = True) -> Iterator[DicomFileEntry]:
+    """Lazily yield DICOM files under root using an os.scandir walk (symlinked dirs not followed)."""
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(Path(entry.path))
+                    continue
+
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+
+                path = Path(entry.path)
+                # Validate that the file is actually a DICOM file
+                if is_dicom_file(path):
+                    st = entry.stat()
+                    yield DicomFileEntry(path, st.st_size, st.st_mtime_ns)
+
+
+def find_dicom_file_entries(root: Path, recursive: bool = True) -> List[DicomFileEntry]:
+    """Find DICOM files (sorted by path) along with their size and mtime."""
     if not root.exists():
         raise FileNotFoundError(f"DICOM root directory does not exist: {root}")
 
-    pattern = "**/*" if recursive else "*"
-    files: List[Path] = []
-    for path in root.glob(pattern):
-        if not path.is_file():
-            continue
+    entries = sorted(iter_dicom_entries(root, recursive=recursive))
+    if not entries:
+        raise RuntimeError(f"No DICOM files found under: {root}")
+
+    return entries
+
 
-        if path.name.startswith("."):
-            continue
+def find_dicom_files(root: Path, recursive: bool = True) -> List[Path]:
+    """Find DICOM files in directory by validating magic string."""
+    return [entry.path for entry in find_dicom_file_entries(root, recursive=recursive)]
 
-        # Validate that the file is actually a DICOM file
-        if not is_dicom_file(path):
-            continue
 
-        files.append(path)
+def read_modality(path: Path) -> str:
+    """Read only the Modality tag (no pixel data, no decompression), 'UNKNOWN' if absent."""
+    ds = pydicom.dcmread(
+        str(path),
+        specific_tags=["Modality"],
+        stop_before_pixels=True,
+        defer_size="1 KB",
+    )
+    return ds.get("Modality", "UNKNOWN")
 
-    if not files:
-        raise RuntimeError(f"No DICOM files found under: {root}")
 
-    return sorted(files)
+# Files above this size are parsed with deferred reads by default, so large
+# values (PixelData) stay on disk until the dataset is encoded for sending.
+LARGE_FILE_DEFER_BYTES = 4 << 20   # 4MB
+_LARGE_FILE_DEFER_SIZE = "64 KB"
 
+# Uncompressed transfer syntax UIDs
+_UNCOMPRESSED_SYNTAXES = frozenset(
+    {ImplicitVRLittleEndian, ExplicitVRLittleEndian, ExplicitVRBigEndian}
+)
+
+
+def load_dataset(
+    path: Path,
+    stop_before_pixels: bool = False,
+    defer_size: Optional[str] = None,
+    specific_tags: Optional[Sequence[str]] = None,
+    size: Optional[int] = None,
+):
+    """
+    Load DICOM dataset and automatically decompress if needed.
+
+    With stop_before_pixels=True only the header is parsed (no PixelData, so
+    nothing to decompress); use it when a test only reads tags and never
+    sends the dataset.
+
+    defer_size (e.g. "1 KB") is passed to dcmread: larger values such as
+    PixelData are read from the file only when accessed, e.g. when the
+    dataset is encoded for C-STORE. The file must still exist at that point.
+    Files larger than LARGE_FILE_DEFER_BYTES get a default defer_size; pass
+    the file's size (e.g. DicomFileEntry.size) to skip the stat that check
+    otherwise needs.
+
+    specific_tags (keywords such as ["PatientID"]) limits parsing to those
+    elements plus the character set; combine it with stop_before_pixels for
+    header-only inspection of a file that is loaded in full elsewhere.
+    """
+    if defer_size is None and not stop_before_pixels:
+        if size is None:
+            size = Path(path).stat().st_size
+        if size > LARGE_FILE_DEFER_BYTES:
+            defer_size = _LARGE_FILE_DEFER_SIZE
 
-def load_dataset(path: Path):
-    """Load DICOM dataset and automatically decompress if needed."""
-    # Uncompressed transfer syntax UIDs
-    UNCOMPRESSED_SYNTAXES = {
-        '1.2.840.10008.1.2',      # Implicit VR Little Endian
-        '1.2.840.10008.1.2.1',    # Explicit VR Little Endian
-        '1.2.840.10008.1.2.2',    # Explicit VR Big Endian
-    }
-    
     # Load the dataset
-    ds = pydicom.dcmread(path, force=True)
+    ds = pydicom.dcmread(
+        path,
+        force=True,
+        stop_before_pixels=stop_before_pixels,
+        defer_size=defer_size,
+        specific_tags=specific_tags,
+    )
     
     # Ensure encoding consistency
     ds = ensure_encoding_consistency(ds)
     
     # Check if decompression is needed
-    if hasattr(ds, 'file_meta') and hasattr(ds.file_meta, 'TransferSyntaxUID'):
+    if not stop_before_pixels and hasattr(ds, 'file_meta') and hasattr(ds.file_meta, 'TransferSyntaxUID'):
         transfer_syntax = ds.file_meta.TransferSyntaxUID
         
         # If compressed, decompress automatically
-        if transfer_syntax not in UNCOMPRESSED_SYNTAXES:
+        if transfer_syntax not in _UNCOMPRESSED_SYNTAXES:
             logger.info(f"Auto-decompressing {path.name} (transfer syntax: {transfer_syntax})")
             
             try:
@@ -99,6 +176,52 @@ def load_dataset(path: Path):
     return ds
 
 
+def prefetch(items: Iterable[T], depth: int = 4) -> Iterator[T]:
+    """
+    Iterate items while a background thread produces the next ones.
+
+    Wrap a generator that loads datasets (e.g. ``cached_dataset(f) for f in
+    files``) so parsing overlaps with whatever the consumer does with each
+    dataset, typically sending it. At most ``depth`` items are buffered;
+    an exception raised by the producer is re-raised in the consumer.
+
+    Closing the returned iterator early (e.g. ``close()`` after a timed
+    load run over an endless generator) stops the producer thread.
+    """
+    done = object()
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in items:
+                buffer.put((item, None))
+                if stop.is_set():
+                    return
+        except BaseException as exc:
+            buffer.put((done, exc))
+            return
+        buffer.put((done, None))
+
+    threading.Thread(target=produce, name="dataset-prefetch", daemon=True).start()
+    try:
+        while True:
+            item, exc = buffer.get()
+            if item is done:
+                if exc is not None:
+                    raise exc
+                return
+            yield item
+    finally:
+        stop.set()
+        # Free a slot for a producer blocked on a full buffer so it can exit
+        while True:
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                break
+
+
 def ensure_encoding_consistency(ds):
     """Ensure dataset encoding flags match transfer syntax UID."""
     if not hasattr(ds, 'file_meta') or not hasattr(ds.file_meta, 'TransferSyntaxUID'):
@@ -111,17 +234,17 @@ def ensure_encoding_consistency(ds):
     # but is necessary until pydicom v4.0 provides an alternative approach.
     
     # Check if flags are already correct to minimize unnecessary assignments
-    if transfer_syntax == '1.2.840.10008.1.2':  # Implicit VR Little Endian
+    if transfer_syntax == ImplicitVRLittleEndian:
         if not (getattr(ds, 'is_implicit_VR', None) == True and 
                 getattr(ds, 'is_little_endian', None) == True):
             ds.is_implicit_VR = True
             ds.is_little_endian = True
-    elif transfer_syntax == '1.2.840.10008.1.2.1':  # Explicit VR Little Endian
+    elif transfer_syntax == ExplicitVRLittleEndian:
         if not (getattr(ds, 'is_implicit_VR', None) == False and 
                 getattr(ds, 'is_little_endian', None) == True):
             ds.is_implicit_VR = False
             ds.is_little_endian = True
-    elif transfer_syntax == '1.2.840.10008.1.2.2':  # Explicit VR Big Endian
+    elif transfer_syntax == ExplicitVRBigEndian:
         if not (getattr(ds, 'is_implicit_VR', None) == False and 
                 getattr(ds, 'is_little_endian', None) == False):
             ds.is_implicit_VR = False
@@ -136,6 +259,20 @@ def ensure_encoding_consistency(ds):
     return ds
 
 
+# (implicit_vr, little_endian) to save with, keyed by transfer syntax; every
+# other syntax (compressed or decompressed) is written Explicit VR Little Endian
+_SAVE_ENCODINGS = {
+    ImplicitVRLittleEndian: (True, True),
+    ExplicitVRBigEndian: (False, False),
+}
+
+
+def save_encoding(ds) -> Tuple[bool, bool]:
+    """Return (implicit_vr, little_endian) for ds.save_as based on its transfer syntax."""
+    transfer_syntax = getattr(getattr(ds, 'file_meta', None), 'TransferSyntaxUID', None)
+    return _SAVE_ENCODINGS.get(transfer_syntax, (False, True))
+
+
 def iter_datasets(paths: Iterable[Path]):
     """Generator that yields (path, dataset) pairs for iteration."""
     for path in paths:
@@ -8,8 +8,11 @@ from __future__ import annotations
 
 import itertools
 import logging
+import queue
 import threading
 import time
+from contextlib import contextmanager
+from dataclasses import replace
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Iterable, Optional
 
@@ -17,6 +20,7 @@ from pynetdicom import AE, AllStoragePresentationContexts
 from pynetdicom.sop_class import Verification
 
 from config import DicomEndpointConfig, LoadProfileConfig
+from data_loader import ensure_encoding_consistency
 from metrics import PerfMetrics, Sample
 
 logger = logging.getLogger(__name__)
@@ -34,6 +38,24 @@ class DicomSender:
     ) -> None:
         self.endpoint = endpoint
         self.load_profile = load_profile
+        # Optional long-lived association (see reusing_association)
+        self.reuse_association = False
+        self._assoc = None
+        self._assoc_ae: Optional[AE] = None
+        self._assoc_lock = threading.Lock()
+
+    def with_endpoint(self, **changes) -> "DicomSender":
+        """
+        Return a sender for a copy of this endpoint with ``changes`` applied.
+
+        DicomEndpointConfig is frozen, so per-test AE titles are set this way
+        instead of mutating the shared session sender. AEs are built per
+        association, so the copy shares nothing mutable with the original.
+
+        Example:
+            sender = dicom_sender.with_endpoint(remote_ae_title="LB-HTM-GI")
+        """
+        return DicomSender(replace(self.endpoint, **changes), self.load_profile)
 
     def _build_ae(self) -> AE:
         ae = AE(ae_title=self.endpoint.local_ae_title.encode("ascii", "ignore"))
@@ -45,16 +67,62 @@ class DicomSender:
         ae.add_requested_context(Verification)
         return ae
 
+    def _associate(self, ae: AE):
+        return ae.associate(
+            self.endpoint.host,
+            self.endpoint.port,
+            ae_title=self.endpoint.remote_ae_title.encode("ascii", "ignore"),
+        )
+
+    def _shared_association(self):
+        """Return the long-lived association, (re)opening it if needed. Caller holds _assoc_lock."""
+        if self._assoc is not None and self._assoc.is_established:
+            return self._assoc
+        self._close_shared_association()
+        self._assoc_ae = self._build_ae()
+        self._assoc = self._associate(self._assoc_ae)
+        return self._assoc
+
+    def _close_shared_association(self) -> None:
+        """Release the long-lived association, if any. Caller holds _assoc_lock."""
+        if self._assoc is not None and self._assoc.is_established:
+            self._assoc.release()
+        if self._assoc_ae is not None:
+            self._assoc_ae.shutdown()
+        self._assoc = None
+        self._assoc_ae = None
+
+    @contextmanager
+    def reusing_association(self):
+        """
+        Send and ping over one association for the duration of the block.
+
+        Sends are serialized on that association, so use this for sequential
+        tests only; tests that depend on a fresh association per send (calling
+        AE routing, idle-timeout/pause scenarios, load tests) should not.
+        """
+        self.reuse_association = True
+        try:
+            yield self
+        finally:
+            self.reuse_association = False
+            with self._assoc_lock:
+                self._close_shared_association()
+
     def _send_single_dataset(
         self,
         ds,
         metrics: PerfMetrics,
     ) -> None:
-        """Send single dataset using fresh association."""
+        """Send single dataset using a fresh (or the shared, if reusing) association."""
+        if self.reuse_association:
+            with self._assoc_lock:
+                self._send_on_shared_association(ds, metrics)
+            return
+
         start = time.perf_counter()
         ae = self._build_ae()
         try:
-            from data_loader import ensure_encoding_consistency
             ds = ensure_encoding_consistency(ds)
             
             assoc = ae.associate(
@@ -106,6 +174,208 @@ class DicomSender:
         finally:
             ae.shutdown()
 
+    def _send_batch_on_association(
+        self,
+        datasets: Iterable,
+        called_aet: Optional[str],
+        metrics: PerfMetrics,
+        stop_on_association_failure: bool = False,
+    ) -> bool:
+        """
+        Send several datasets over one association to called_aet.
+
+        Records one Sample per dataset pulled, in order, timing each C-STORE;
+        errors (encoding, socket, rejected association) are recorded as a
+        failed Sample for the dataset in hand only. If the association is
+        aborted or cannot be opened, the next dataset opens a new one.
+        called_aet=None uses the endpoint's remote AE title. Datasets are
+        pulled one at a time, so a generator keeps producing while earlier
+        datasets are on the wire; an empty input never associates.
+
+        With stop_on_association_failure=True, returns right after recording
+        a failed association instead of pulling further datasets, so a
+        shared iterator is left to other senders.
+
+        Returns:
+            True if datasets was exhausted, False if it stopped early.
+        """
+        ae_title = called_aet if called_aet is not None else self.endpoint.remote_ae_title
+        ae: Optional[AE] = None
+        assoc = None
+        try:
+            for ds in datasets:
+                start = time.perf_counter()
+                try:
+                    ds = ensure_encoding_consistency(ds)
+                    if assoc is None or not assoc.is_established:
+                        if ae is None:
+                            ae = self._build_ae()
+                        assoc = ae.associate(
+                            self.endpoint.host,
+                            self.endpoint.port,
+                            ae_title=ae_title.encode("ascii", "ignore"),
+                            max_pdu=0,
+                        )
+                        if not assoc.is_established:
+                            metrics.record(
+                                Sample(
+                                    start_time=start,
+                                    end_time=time.perf_counter(),
+                                    success=False,
+                                    error="Association failed",
+                                )
+                            )
+                            if stop_on_association_failure:
+                                return False
+                            continue
+                        # C-STORE timing starts once the association is up
+                        start = time.perf_counter()
+                    status = assoc.send_c_store(ds)
+                except Exception as exc:
+                    logger.exception("Error while sending dataset")
+                    metrics.record(
+                        Sample(
+                            start_time=start,
+                            end_time=time.perf_counter(),
+                            success=False,
+                            error=str(exc),
+                        )
+                    )
+                    continue
+
+                end = time.perf_counter()
+                success = status and status.Status in (0x0000,)
+                if success:
+                    uid = str(ds.StudyInstanceUID) if hasattr(ds, 'StudyInstanceUID') else None
+                    if uid:
+                        sent_study_uids.append(uid)
+                metrics.record(
+                    Sample(
+                        start_time=start,
+                        end_time=end,
+                        success=success,
+                        status_code=getattr(status, "Status", None),
+                        error=None if success else f"Non-success status: {status!r}",
+                    )
+                )
+            return True
+        finally:
+            if assoc is not None and assoc.is_established:
+                assoc.release()
+            if ae is not None:
+                ae.shutdown()
+
+    def _send_on_shared_association(self, ds, metrics: PerfMetrics) -> None:
+        """C-STORE on the long-lived association. Caller holds _assoc_lock."""
+        start = time.perf_counter()
+        try:
+            ds = ensure_encoding_consistency(ds)
+
+            assoc = self._shared_association()
+            if not assoc.is_established:
+                self._close_shared_association()
+                metrics.record(
+                    Sample(
+                        start_time=start,
+                        end_time=time.perf_counter(),
+                        success=False,
+                        error="Association failed",
+                    )
+                )
+                return
+
+            status = assoc.send_c_store(ds)
+
+            end = time.perf_counter()
+            success = status and status.Status in (0x0000,)
+            if success:
+                uid = str(ds.StudyInstanceUID) if hasattr(ds, 'StudyInstanceUID') else None
+                if uid:
+                    sent_study_uids.append(uid)
+            elif not assoc.is_established:
+                # Aborted/released by the peer; reopen on the next send
+                self._close_shared_association()
+            metrics.record(
+                Sample(
+                    start_time=start,
+                    end_time=end,
+                    success=success,
+                    status_code=getattr(status, "Status", None),
+                    error=None if success else f"Non-success status: {status!r}",
+                )
+            )
+        except Exception as exc:
+            end = time.perf_counter()
+            logger.exception("Error while sending dataset")
+            self._close_shared_association()
+            metrics.record(
+                Sample(
+                    start_time=start,
+                    end_time=end,
+                    success=False,
+                    error=str(exc),
+                )
+            )
+
+    def send_datasets(
+        self,
+        datasets: Iterable,
+        metrics: PerfMetrics,
+        concurrency: int = 1,
+    ) -> None:
+        """
+        Send each dataset once over up to ``concurrency`` parallel associations.
+
+        Each worker lane pulls datasets from the shared iterable and streams
+        them over a single association (_send_batch_on_association), so N
+        datasets cost at most ``concurrency`` association handshakes instead
+        of N. A lane whose association is rejected records a failure for the
+        dataset it was about to send and retires, leaving the remaining
+        datasets to the other lanes. Because datasets are pulled on demand, a
+        generator (e.g. one that loads files, or data_loader.prefetch)
+        overlaps loading with the sends already in flight. Defaults to one
+        association; callers opt into more (integration tests pass
+        PARALLEL_SENDS). Inside reusing_association() the datasets go over
+        the shared association.
+        """
+        if self.reuse_association:
+            for ds in datasets:
+                self._send_single_dataset(ds, metrics)
+            return
+
+        lanes = max(1, concurrency)
+
+        source = iter(datasets)
+        source_lock = threading.Lock()
+        active = [lanes]
+
+        def lane():
+            while True:
+                with source_lock:
+                    ds = next(source, None)
+                if ds is None:
+                    return
+                yield ds
+
+        def run_lane():
+            # A rejected association records only the dataset in hand; the
+            # lane then retires and leaves the rest to the lanes still
+            # connected. The last lane keeps reconnecting, one dataset per
+            # attempt, so every dataset is still sent or recorded once.
+            while True:
+                exhausted = self._send_batch_on_association(
+                    lane(), None, metrics, stop_on_association_failure=True
+                )
+                with source_lock:
+                    if exhausted or active[0] > 1:
+                        active[0] -= 1
+                        return
+
+        with ThreadPoolExecutor(max_workers=lanes) as executor:
+            futures = [executor.submit(run_lane) for _ in range(lanes)]
+            for f in as_completed(futures):
+                _ = f.result()
+
     def load_test_for_duration(
         self,
         datasets: Iterable,
@@ -113,10 +383,20 @@ class DicomSender:
         duration_seconds: int,
         concurrency: Optional[int] = None,
         rate_limit_images_per_second: Optional[float] = None,
+        images_per_association: Optional[int] = None,
     ) -> int:
-        """Run load test for specified duration with rate limiting."""
+        """
+        Run load test for specified duration with rate limiting.
+
+        With images_per_association > 1 (default: the load profile's), each
+        of ``concurrency`` workers sends up to that many images over one
+        association before releasing it, instead of associating per image;
+        samples then time the C-STORE alone.
+        """
         if concurrency is None:
             concurrency = self.load_profile.concurrency
+        if images_per_association is None:
+            images_per_association = self.load_profile.images_per_association
 
         target_rate = rate_limit_images_per_second
         if target_rate is None:
@@ -134,6 +414,12 @@ class DicomSender:
             ds_iter = itertools.cycle(datasets)
         else:
             ds_iter = iter(datasets)
+
+        if images_per_association > 1:
+            return self._load_test_on_associations(
+                ds_iter, metrics, stop_at, concurrency, period, images_per_association
+            )
+
         executor = ThreadPoolExecutor(max_workers=concurrency)
         futures = []
 
@@ -160,8 +446,73 @@ class DicomSender:
 
         return total_sent
 
+    def _load_test_on_associations(
+        self,
+        ds_iter,
+        metrics: PerfMetrics,
+        stop_at: float,
+        concurrency: int,
+        period: float,
+        images_per_association: int,
+    ) -> int:
+        """
+        Paced load loop for load_test_for_duration with per-worker associations.
+
+        The calling thread releases one dataset per period into a queue;
+        ``concurrency`` workers each take up to images_per_association of
+        them over one association (_send_batch_on_association), then
+        reassociate. Returns the number of datasets released.
+        """
+        work: queue.Queue = queue.Queue()
+        done = object()
+
+        def worker() -> None:
+            finished = False
+
+            def batch():
+                nonlocal finished
+                for _ in range(images_per_association):
+                    ds = work.get()
+                    if ds is done:
+                        finished = True
+                        work.put(done)  # let the other workers see it too
+                        return
+                    yield ds
+
+            while not finished:
+                self._send_batch_on_association(batch(), None, metrics)
+
+        total_sent = 0
+        next_send_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(worker) for _ in range(concurrency)]
+            try:
+                while time.perf_counter() < stop_at:
+                    now = time.perf_counter()
+                    if period > 0 and now < next_send_time:
+                        time.sleep(max(next_send_time - now, 0.0))
+                    next_send_time = time.perf_counter() + period
+
+                    work.put(next(ds_iter))
+                    total_sent += 1
+            finally:
+                work.put(done)
+            for f in as_completed(futures):
+                _ = f.result()
+
+        return total_sent
+
     def ping(self, timeout_seconds: int = 5) -> bool:
         """Ping Compass using C-ECHO to check reachability."""
+        if self.reuse_association:
+            with self._assoc_lock:
+                assoc = self._shared_association()
+                if not assoc.is_established:
+                    self._close_shared_association()
+                    return False
+                status = assoc.send_c_echo()
+                return bool(status) and status.Status == 0x0000
+
         ae = self._build_ae()
         # Verification is already included in _build_ae(), no need to append again
         try:
@@ -0,0 +1,39 @@
+# env_bootstrap.py
+
+"""
+One-time, process-wide loading of the project-root .env file.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+project_root = Path(__file__).resolve().parent
+dotenv_path = project_root / ".env"
+
+
+@functools.lru_cache(maxsize=None)
+def ensure_env_loaded() -> Optional[Path]:
+    """
+    Load the project-root .env file exactly once per process.
+
+    Safe to call from every module that reads configuration; only the first
+    call stats and parses the file. Existing environment variables win
+    (``override=False``).
+
+    Returns:
+        Path of the loaded .env file, or None if it does not exist.
+    """
+    if not dotenv_path.exists():
+        logger.info(f".env file not found at {dotenv_path}")
+        return None
+    load_dotenv(dotenv_path, override=False)
+    logger.info(f"Loaded .env from: {dotenv_path}")
+    return dotenv_path
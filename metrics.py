@@ -39,6 +39,11 @@ class PerfMetrics:
         with self._lock:
             self._samples.append(sample)
 
+    def reset(self) -> None:
+        """Drop all recorded samples so the instance can be reused."""
+        with self._lock:
+            self._samples.clear()
+
     @property
     def samples(self) -> List[Sample]:
         with self._lock:
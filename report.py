@@ -15,8 +15,14 @@ import math
 import platform
 from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
 
 @dataclass
 class TestResult:
@@ -26,7 +32,7 @@ class TestResult:
     outcome: str  # "passed", "failed", "skipped", "error"
     duration: float  # seconds
     perf_snapshot: Optional[Dict[str, Any]] = None
-    perf_samples: Optional[List[Dict[str, Any]]] = None  # serialized Sample dicts
+    perf_samples: Optional[Dict[str, List[Any]]] = None  # columnar samples (see sample_columns)
     thresholds: Optional[Dict[str, float]] = None
     markers: List[str] = field(default_factory=list)
     error_message: Optional[str] = None
@@ -43,9 +49,24 @@ class ReportData:
     config_summary: Optional[Dict[str, Any]] = None
 
 
-def _compute_latency_histogram(samples: List[Dict], bins: int = 30) -> Dict:
+# Sample fields captured for the report, stored column-wise
+SAMPLE_COLUMNS = ("start_time", "end_time", "latency_ms", "success", "error")
+
+
+def sample_columns(samples) -> Dict[str, List[Any]]:
+    """Convert metrics Sample objects to {field: [values...]} columns."""
+    getter = attrgetter(*SAMPLE_COLUMNS)
+    rows = list(map(getter, samples))
+    if not rows:
+        return {name: [] for name in SAMPLE_COLUMNS}
+    return {name: list(col) for name, col in zip(SAMPLE_COLUMNS, zip(*rows))}
+
+
+def _compute_latency_histogram(samples: Dict[str, List], bins: int = 30) -> Dict:
     """Pre-compute histogram bins for Chart.js bar chart."""
-    latencies = [s["latency_ms"] for s in samples if s.get("success")]
+    latencies = [
+        lat for lat, ok in zip(samples["latency_ms"], samples["success"]) if ok
+    ]
     if not latencies:
         return {"labels": [], "values": []}
 
@@ -63,16 +84,17 @@ def _compute_latency_histogram(samples: List[Dict], bins: int = 30) -> Dict:
     return {"labels": labels, "values": counts, "bin_width": bin_width}
 
 
-def _compute_throughput_timeline(samples: List[Dict], bucket_seconds: float = 1.0) -> Dict:
+def _compute_throughput_timeline(samples: Dict[str, List], bucket_seconds: float = 1.0) -> Dict:
     """Compute 1-second bucket throughput time series."""
-    if not samples:
+    start_times = samples["start_time"]
+    if not start_times:
         return {"labels": [], "values": []}
 
-    start = min(s["start_time"] for s in samples)
-    end = max(s["end_time"] for s in samples)
+    start = min(start_times)
+    end = max(samples["end_time"])
     duration = end - start
     if duration <= 0:
-        return {"labels": ["0"], "values": [len(samples)]}
+        return {"labels": ["0"], "values": [len(start_times)]}
 
     num_buckets = max(1, int(math.ceil(duration / bucket_seconds)))
     # Cap buckets to prevent huge arrays
@@ -81,8 +103,8 @@ def _compute_throughput_timeline(samples: List[Dict], bucket_seconds: float = 1.
         num_buckets = 600
 
     counts = [0] * num_buckets
-    for s in samples:
-        idx = min(int((s["start_time"] - start) / bucket_seconds), num_buckets - 1)
+    for t in start_times:
+        idx = min(int((t - start) / bucket_seconds), num_buckets - 1)
         counts[idx] += 1
 
     # Convert counts to rate (per second)
@@ -91,18 +113,19 @@ def _compute_throughput_timeline(samples: List[Dict], bucket_seconds: float = 1.
     return {"labels": labels, "values": rates}
 
 
-def _compute_latency_scatter(samples: List[Dict], max_points: int = 5000) -> Dict:
+def _compute_latency_scatter(samples: Dict[str, List], max_points: int = 5000) -> Dict:
     """Compute latency-over-time scatter data, downsampling if needed."""
-    if not samples:
+    start_times = samples["start_time"]
+    if not start_times:
         return {"success": [], "failure": []}
 
-    start = min(s["start_time"] for s in samples)
+    start = min(start_times)
 
     success_pts = []
     failure_pts = []
-    for s in samples:
-        pt = {"x": round(s["start_time"] - start, 3), "y": round(s["latency_ms"], 2)}
-        if s.get("success"):
+    for t, lat, ok in zip(start_times, samples["latency_ms"], samples["success"]):
+        pt = {"x": round(t - start, 3), "y": round(lat, 2)}
+        if ok:
             success_pts.append(pt)
         else:
             failure_pts.append(pt)
@@ -115,6 +138,13 @@ def _compute_latency_scatter(samples: List[Dict], max_points: int = 5000) -> Dic
     return {"success": success_pts, "failure": failure_pts}
 
 
+def _to_json(obj: Any) -> str:
+    """Serialize chart payloads for embedding in the page (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj)
+
+
 def _esc(text: str) -> str:
     """HTML-escape text."""
     return html.escape(str(text))
@@ -518,10 +548,10 @@ def _render_js(data: ReportData) -> str:
     document.addEventListener('DOMContentLoaded', function() {{
         {chart_defaults}
 
-        const perfChartData = {json.dumps(perf_chart_data)};
-        const testNames = {json.dumps(test_names)};
-        const testDurations = {json.dumps(test_durations)};
-        const testColors = {json.dumps(test_colors)};
+        const perfChartData = {_to_json(perf_chart_data)};
+        const testNames = {_to_json(test_names)};
+        const testDurations = {_to_json(test_durations)};
+        const testColors = {_to_json(test_colors)};
 
         // --- Summary donut chart ---
         const donutCtx = document.getElementById('summaryDonut');
@@ -1007,7 +1037,7 @@ def _render_perf_details(data: ReportData) -> str:
         sections.append(f"""
         <div class="perf-section">
             <h3>{_esc(short_name)}</h3>
-            <script type="application/json" id="perf-thresholds-{i}">{json.dumps(js_thresholds)}</script>
+            <script type="application/json" id="perf-thresholds-{i}">{_to_json(js_thresholds)}</script>
             <div class="gauge-grid">
                 <div class="gauge-card">
                     <div class="gauge-value" style="color: var(--accent-blue);">{total_sent}</div>
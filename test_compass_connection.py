@@ -23,17 +23,12 @@ Usage:
 import argparse
 import sys
 import logging
-from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
+from env_bootstrap import ensure_env_loaded
 
-# Load .env file from project root
-project_root = Path(__file__).resolve().parent
-dotenv_path = project_root / ".env"
-
-if dotenv_path.exists():
-    load_dotenv(dotenv_path)
+# Load .env file from project root (once per process)
+ensure_env_loaded()
 
 # Setup logging
 logging.basicConfig(
@@ -42,14 +37,57 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Troubleshooting hints logged (as one record) when a connection test fails
+_CFIND_HELP = (
+    "\nPossible issues:",
+    "1. Host/port incorrect",
+    "2. Compass not responding to C-FIND queries",
+    "3. AE Title mismatch",
+    "4. Network/firewall blocking connection",
+    "\nCheck environment variables:",
+    "  COMPASS_HOST (default: roelbc200a.mayo.edu)",
+    "  COMPASS_PORT (default: 11112)",
+    "  COMPASS_AE_TITLE (default: COMPASS)",
+    "  LOCAL_AE_TITLE (default: QUERY_SCU)",
+)
+_PYNETDICOM_HELP = (
+    "\nMake sure pynetdicom is installed:",
+    "  pip install pynetdicom",
+)
+_PYODBC_HELP = (
+    "\nTo install required packages:",
+    "  pip install pyodbc",
+)
+_DB_HELP = (
+    "\nMake sure to set environment variables:",
+    "  COMPASS_DB_SERVER (default: ROCFDN019Q)",
+    "  COMPASS_DB_NAME (default: ODM)",
+    "  COMPASS_DB_PORT (default: 1433)",
+    "\nFor SQL Server authentication:",
+    "  COMPASS_DB_USER=your_username",
+    "  COMPASS_DB_PASSWORD=your_password",
+    "\nFor Windows authentication:",
+    "  COMPASS_DB_WINDOWS_AUTH=true",
+)
+_API_HELP = (
+    "\nAPI connection failed. This could mean:",
+    "1. Authentication is required",
+    "2. The API endpoint is different",
+    "3. API is not available",
+    "\nSet environment variables:",
+    "  COMPASS_API_URL (default: http://roelbc200a.mayo.edu:10400)",
+    "  COMPASS_API_USER=your_username (if needed)",
+    "  COMPASS_API_PASSWORD=your_password (if needed)",
+    "  COMPASS_API_KEY=your_api_key (if using API key)",
+)
+
 
 def test_cfind_connection():
     """Test C-FIND (DICOM Query) connection."""
     try:
         from compass_cfind_client import CompassCFindConfig, CompassCFindClient
     except ImportError as e:
-        logger.error(f"Import failed: {e}")
-        logger.error("Make sure compass_cfind_client.py is in the same directory")
+        logger.error(f"Import failed: {e}\nMake sure compass_cfind_client.py is in the same directory")
         return False
     
     try:
@@ -87,23 +125,11 @@ def test_cfind_connection():
         return True
         
     except ConnectionError as e:
-        logger.error(f"\nConnection failed: {e}")
-        logger.error("\nPossible issues:")
-        logger.error("1. Host/port incorrect")
-        logger.error("2. Compass not responding to C-FIND queries")
-        logger.error("3. AE Title mismatch")
-        logger.error("4. Network/firewall blocking connection")
-        logger.error("\nCheck environment variables:")
-        logger.error("  COMPASS_HOST (default: roelbc200a.mayo.edu)")
-        logger.error("  COMPASS_PORT (default: 11112)")
-        logger.error("  COMPASS_AE_TITLE (default: COMPASS)")
-        logger.error("  LOCAL_AE_TITLE (default: QUERY_SCU)")
+        logger.error("\n".join((f"\nConnection failed: {e}", *_CFIND_HELP)))
         return False
         
     except Exception as e:
-        logger.error(f"\nError: {e}")
-        logger.error("\nMake sure pynetdicom is installed:")
-        logger.error("  pip install pynetdicom")
+        logger.error("\n".join((f"\nError: {e}", *_PYNETDICOM_HELP)))
         return False
 
 
@@ -112,8 +138,7 @@ def test_database_connection():
     try:
         from compass_db_query import CompassDatabaseConfig, CompassDatabaseClient
     except ImportError as e:
-        logger.error(f"Import failed: {e}")
-        logger.error("Make sure compass_db_query.py is in the same directory")
+        logger.error(f"Import failed: {e}\nMake sure compass_db_query.py is in the same directory")
         return False
     
     try:
@@ -133,20 +158,15 @@ def test_database_connection():
             
             logger.info("Connection successful!")
             
-            # Discover tables
-            logger.info("\nDiscovering tables...")
-            tables = client.discover_tables()
-            logger.info(f"\nFound {len(tables)} tables in database:")
-            for i, table in enumerate(tables, 1):
+            # Discover interesting tables (keyword filter runs in SQL)
+            logger.info("\nDiscovering DICOM-related tables...")
+            interesting_keywords = ['job', 'study', 'series', 'instance', 'image', 'dicom', 'tag']
+            interesting_tables = client.discover_interesting_tables(interesting_keywords)
+            logger.info(f"\nFound {len(interesting_tables)} matching tables in database:")
+            for i, table in enumerate(interesting_tables, 1):
                 logger.info(f"  {i}. {table}")
             
             # Get schema for interesting tables
-            interesting_keywords = ['job', 'study', 'series', 'instance', 'image', 'dicom', 'tag']
-            interesting_tables = [
-                t for t in tables 
-                if any(keyword in t.lower() for keyword in interesting_keywords)
-            ]
-            
             if interesting_tables:
                 logger.info(f"\nInteresting tables (likely DICOM-related):")
                 for table in interesting_tables[:5]:  # Show first 5
@@ -159,22 +179,11 @@ def test_database_connection():
             return True
             
     except ImportError as e:
-        logger.error(f"\nMissing dependency: {e}")
-        logger.error("\nTo install required packages:")
-        logger.error("  pip install pyodbc")
+        logger.error("\n".join((f"\nMissing dependency: {e}", *_PYODBC_HELP)))
         return False
         
     except Exception as e:
-        logger.error(f"\nError: {e}")
-        logger.error("\nMake sure to set environment variables:")
-        logger.error("  COMPASS_DB_SERVER (default: ROCFDN019Q)")
-        logger.error("  COMPASS_DB_NAME (default: ODM)")
-        logger.error("  COMPASS_DB_PORT (default: 1433)")
-        logger.error("\nFor SQL Server authentication:")
-        logger.error("  COMPASS_DB_USER=your_username")
-        logger.error("  COMPASS_DB_PASSWORD=your_password")
-        logger.error("\nFor Windows authentication:")
-        logger.error("  COMPASS_DB_WINDOWS_AUTH=true")
+        logger.error("\n".join((f"\nError: {e}", *_DB_HELP)))
         return False
 
 
@@ -183,8 +192,7 @@ def test_api_connection():
     try:
         from compass_api_client import CompassAPIConfig, CompassAPIClient
     except ImportError as e:
-        logger.error(f"Import failed: {e}")
-        logger.error("Make sure compass_api_client.py is in the same directory")
+        logger.error(f"Import failed: {e}\nMake sure compass_api_client.py is in the same directory")
         return False
     
     try:
@@ -225,16 +233,7 @@ def test_api_connection():
             return False
             
     except Exception as e:
-        logger.error(f"\nError: {e}")
-        logger.error("\nAPI connection failed. This could mean:")
-        logger.error("1. Authentication is required")
-        logger.error("2. The API endpoint is different")
-        logger.error("3. API is not available")
-        logger.error("\nSet environment variables:")
-        logger.error("  COMPASS_API_URL (default: http://roelbc200a.mayo.edu:10400)")
-        logger.error("  COMPASS_API_USER=your_username (if needed)")
-        logger.error("  COMPASS_API_PASSWORD=your_password (if needed)")
-        logger.error("  COMPASS_API_KEY=your_api_key (if using API key)")
+        logger.error("\n".join((f"\nError: {e}", *_API_HELP)))
         return False
 
 
@@ -288,8 +287,8 @@ def print_discovery_instructions():
     print()
 
 
-def main():
-    """Main entry point."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser (constructed once, at import time)."""
     parser = argparse.ArgumentParser(
         description="Test Compass connectivity and discover query methods",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -340,7 +339,15 @@ Environment Variables:
         help='Test mode: cfind (recommended), api, database, discover, or all'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main():
+    """Main entry point."""
+    args = _PARSER.parse_args()
     
     print("="*80)
     print("COMPASS CONNECTIVITY TEST")
@@ -18,14 +18,10 @@ Author: DICOM Automation Team
 """
 
 import sys
-from pathlib import Path
-from dotenv import load_dotenv
+from env_bootstrap import dotenv_path, ensure_env_loaded
 
 # Load .env file
-project_root = Path(__file__).resolve().parent
-dotenv_path = project_root / ".env"
-if dotenv_path.exists():
-    load_dotenv(dotenv_path)
+if ensure_env_loaded():
     print(f"Loaded .env from: {dotenv_path}\n")
 else:
     print(f"WARNING: .env file not found at {dotenv_path}")
@@ -34,6 +30,16 @@ else:
 from compass_db_query import CompassDatabaseClient, CompassDatabaseConfig
 
 
+def _schema_lines(schema):
+    """Format INFORMATION_SCHEMA column rows as printable lines (one write for the table)."""
+    lines = []
+    for col in schema:
+        nullable = "NULL" if col['IS_NULLABLE'] == 'YES' else "NOT NULL"
+        max_len = f"({col['CHARACTER_MAXIMUM_LENGTH']})" if col['CHARACTER_MAXIMUM_LENGTH'] else ""
+        lines.append(f"  {col['COLUMN_NAME']:30s} {col['DATA_TYPE']:15s}{max_len:10s} {nullable}\n")
+    return lines
+
+
 def test_connection():
     """Test basic database connectivity."""
     print("=" * 80)
@@ -105,10 +111,7 @@ def test_connection():
             if "Jobs" in tables:
                 schema = client.get_table_schema("Jobs")
                 print(f"Jobs table has {len(schema)} columns:\n")
-                for col in schema:
-                    nullable = "NULL" if col['IS_NULLABLE'] == 'YES' else "NOT NULL"
-                    max_len = f"({col['CHARACTER_MAXIMUM_LENGTH']})" if col['CHARACTER_MAXIMUM_LENGTH'] else ""
-                    print(f"  {col['COLUMN_NAME']:30s} {col['DATA_TYPE']:15s}{max_len:10s} {nullable}")
+                sys.stdout.writelines(_schema_lines(schema))
             else:
                 print("WARNING: 'Jobs' table not found. Actual table name may be different.")
                 print("Available tables:", tables[:5])
@@ -119,10 +122,7 @@ def test_connection():
             if "DicomTags" in tables:
                 schema = client.get_table_schema("DicomTags")
                 print(f"DicomTags table has {len(schema)} columns:\n")
-                for col in schema:
-                    nullable = "NULL" if col['IS_NULLABLE'] == 'YES' else "NOT NULL"
-                    max_len = f"({col['CHARACTER_MAXIMUM_LENGTH']})" if col['CHARACTER_MAXIMUM_LENGTH'] else ""
-                    print(f"  {col['COLUMN_NAME']:30s} {col['DATA_TYPE']:15s}{max_len:10s} {nullable}")
+                sys.stdout.writelines(_schema_lines(schema))
             else:
                 print("WARNING: 'DicomTags' table not found. Actual table name may be different.")
             
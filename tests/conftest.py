@@ -4,18 +4,32 @@
 Global pytest fixtures for DICOM testing with automatic configuration and dataset loading.
 """
 
+import asyncio
+import copy
+import functools
+import itertools
+import json
+import logging
 import os
 import platform
 import socket
 import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime
+from io import BytesIO, StringIO
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import pytest
-from dotenv import load_dotenv
+from pydicom import dcmread
+from pydicom.dataset import Dataset
+from pydicom.datadict import dictionary_VR, tag_for_keyword
+from pydicom.tag import BaseTag, Tag
+from pydicom.uid import PYDICOM_ROOT_UID
 
 # Add project root to Python path to ensure modules can be imported
 project_root = Path(__file__).resolve().parent.parent
@@ -24,18 +38,22 @@ if str(project_root) not in sys.path:
 
 # Import from root-level modules (compass_perf contents moved to root)
 from config import TestConfig
+from env_bootstrap import dotenv_path, ensure_env_loaded
 from compass_cfind_client import CompassCFindClient, CompassCFindConfig
-from data_loader import find_dicom_files, load_dataset
+from data_loader import (
+    LARGE_FILE_DEFER_BYTES,
+    DicomFileEntry,
+    find_dicom_file_entries,
+    load_dataset,
+    read_modality,
+    save_encoding,
+)
 from dicom_sender import DicomSender, sent_study_uids
 from metrics import PerfMetrics
-from report import ReportData, TestResult, generate_html_report
+from report import ReportData, TestResult, generate_html_report, sample_columns
 
-# Load .env file from project root
-dotenv_path = project_root / ".env"
-
-if dotenv_path.exists():
-    load_dotenv(dotenv_path)
-else:
+# Load .env file from project root (once per process)
+if ensure_env_loaded() is None:
     print(f"WARNING: .env file not found at {dotenv_path}")
 
 # ---------------------------------------------------------------------------
@@ -44,35 +62,98 @@ else:
 _report_test_results: List[TestResult] = []
 _report_session_start: float = 0.0
 _report_config: Optional[TestConfig] = None
+_report_config_summary: Optional[dict] = None  # built once when perf_config is created
+_REPORT_PATH = project_root / "test_report.html"
 
 # ---------------------------------------------------------------------------
 # StudyInstanceUID tracking (written to study_uids.txt at session end)
 # ---------------------------------------------------------------------------
 _uid_log: List[tuple] = []  # [(node_id, [uids])]
 
+# ---------------------------------------------------------------------------
+# On-disk modality index (written back at session end if it changed)
+# ---------------------------------------------------------------------------
+_MODALITY_CACHE_PATH = project_root / ".pytest_cache" / "dicom_index.json"
+_modality_cache: Dict[str, list] = {}  # {path: [mtime_ns, size, modality]}
+_modality_cache_dirty = False
+
+
+def _modality_cache_enabled() -> bool:
+    """DICOM_INDEX_CACHE=0 disables the on-disk modality index."""
+    return os.getenv("DICOM_INDEX_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+def _load_modality_cache(path: Path) -> Dict[str, list]:
+    """Load the modality index, or an empty one if missing/unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _build_config_summary(cfg: TestConfig) -> dict:
+    """Snapshot of the run configuration shown in the HTML report."""
+    return {
+        "endpoint": {
+            "host": cfg.endpoint.host,
+            "port": cfg.endpoint.port,
+            "remote_ae_title": cfg.endpoint.remote_ae_title,
+            "local_ae_title": cfg.endpoint.local_ae_title,
+        },
+        "load_profile": {
+            "peak_images_per_second": cfg.load_profile.peak_images_per_second,
+            "load_multiplier": cfg.load_profile.load_multiplier,
+            "test_duration_seconds": cfg.load_profile.test_duration_seconds,
+            "concurrency": cfg.load_profile.concurrency,
+        },
+        "thresholds": {
+            "max_error_rate": f"{cfg.thresholds.max_error_rate:.1%}",
+            "max_p95_latency_ms": f"{cfg.thresholds.max_p95_latency_ms:.0f} ms",
+            "max_p95_latency_ms_short": f"{cfg.thresholds.max_p95_latency_ms_short:.0f} ms",
+        },
+        "dataset": {
+            "dicom_root_dir": str(cfg.dataset.dicom_root_dir),
+            "recursive": cfg.dataset.recursive,
+        },
+    }
+
 
 @pytest.fixture(scope="session")
 def perf_config() -> TestConfig:
     """Performance configuration from environment variables."""
-    global _report_config
+    global _report_config, _report_config_summary
     cfg = TestConfig.from_env()
     _report_config = cfg
+    _report_config_summary = _build_config_summary(cfg)
     return cfg
 
 
 @pytest.fixture(scope="session")
-def dicom_files(perf_config: TestConfig) -> List[Path]:
-    """List of DICOM files for testing."""
-    return find_dicom_files(
+def dicom_file_entries(perf_config: TestConfig) -> List[DicomFileEntry]:
+    """DICOM files for testing, with size/mtime captured once during discovery."""
+    return find_dicom_file_entries(
         perf_config.dataset.dicom_root_dir,
         recursive=perf_config.dataset.recursive,
     )
 
 
 @pytest.fixture(scope="session")
-def dicom_datasets(dicom_files: List[Path]):
-    """Loaded DICOM datasets."""
-    return [load_dataset(p) for p in dicom_files]
+def dicom_files(dicom_file_entries: List[DicomFileEntry]) -> List[Path]:
+    """List of DICOM files for testing."""
+    return [entry.path for entry in dicom_file_entries]
+
+
+@pytest.fixture(scope="session")
+def dicom_datasets(dicom_file_entries: List[DicomFileEntry]) -> list:
+    """
+    Loaded DICOM datasets, each file parsed once at fixture setup.
+
+    Parsing up front keeps it out of the timed load loops, which then cycle
+    over the already-parsed datasets.
+    """
+    return [load_dataset(entry.path, size=entry.size) for entry in dicom_file_entries]
 
 
 @pytest.fixture
@@ -116,11 +197,132 @@ def compass_config(perf_config):
 
 @pytest.fixture(scope="session")
 def cfind_client(perf_config) -> Optional[CompassCFindClient]:
-    """Session-scoped C-FIND client for verifying studies arrived in Compass."""
+    """
+    Session-scoped C-FIND client for verifying studies arrived in Compass.
+
+    All queries share one association, released at session end.
+    """
     if not perf_config.integration.cfind_verify:
-        return None
+        yield None
+        return
     config = CompassCFindConfig.from_env()
-    return CompassCFindClient(config)
+    client = CompassCFindClient(config)
+    with client.reusing_association():
+        yield client
+
+
+# C-FIND return keys needed by verify_study_arrived callers. Only these are
+# requested in the identifier and copied into the result dict.
+_VERIFY_FIELDS = (
+    "StudyInstanceUID",
+    "PatientID",
+    "PatientName",
+    "StudyDate",
+    "AccessionNumber",
+    "NumberOfStudyRelatedInstances",
+    "StudyDescription",
+)
+
+
+def _interpret_cfind_result(
+    cfind_client: CompassCFindClient,
+    result,
+    study_uid: str,
+    patient_id: Optional[str],
+    start: float,
+    attempts: int,
+    strategy: Optional[str] = None,
+    level: Optional[str] = None,
+) -> Optional[dict]:
+    """
+    Turn one ``find_study_by_uid`` response into a verification outcome.
+
+    Returns the study dict on a definitive STUDY-level match, or None when the
+    caller should keep polling (no result, or a mismatched StudyInstanceUID).
+    ``strategy``/``level`` default to the client's ``last_find_*`` attributes.
+
+    Raises:
+        AssertionError on a PATIENT-level-only match (see verify_study_arrived).
+    """
+    if result is None:
+        return None
+
+    study_dict = cfind_client.dataset_to_dict(result, fields=_VERIFY_FIELDS)
+    strategy = strategy or getattr(cfind_client, 'last_find_strategy', None) or 'unknown'
+    level = level or getattr(cfind_client, 'last_find_level', None) or 'unknown'
+    study_dict['_cfind_level'] = level
+    study_dict['_cfind_strategy'] = strategy
+
+    if level == "STUDY":
+        # STUDY-level: validate that the returned UID matches
+        returned_uid = study_dict.get('StudyInstanceUID', '')
+        if returned_uid and returned_uid != study_uid:
+            print(
+                f"  [CFIND VERIFY] WARNING: C-FIND returned StudyInstanceUID "
+                f"'{returned_uid}' but we queried for '{study_uid}'. "
+                f"Ignoring this result (strategy: {strategy})."
+            )
+            # Caller retries
+            return None
+        elapsed = time.time() - start
+        print(f"  [CFIND VERIFY] Study CONFIRMED after {elapsed:.1f}s ({attempts} attempt(s))")
+        print(f"  [CFIND VERIFY] Strategy: {strategy} | Level: STUDY (definitive)")
+        for key, val in study_dict.items():
+            if not key.startswith('_'):
+                print(f"    {key}: {val}")
+        return study_dict
+
+    # PATIENT-level result: the patient exists on the server but
+    # the specific study was NOT found at STUDY level.
+    # At MIDIA this is the QA-queue signature — the study arrived
+    # but is hidden because the order is invalid or not yet placed.
+    # Treat this as a definitive failure rather than a soft pass.
+    elapsed = time.time() - start
+    print(f"  [CFIND VERIFY] PATIENT-level result after {elapsed:.1f}s ({attempts} attempt(s))")
+    print(f"  [CFIND VERIFY] Strategy: {strategy} | Level: PATIENT")
+    print(
+        f"  [CFIND VERIFY] PatientID '{patient_id}' exists on the server, "
+        f"but StudyInstanceUID '{study_uid}' was NOT found at STUDY level."
+    )
+    for key, val in study_dict.items():
+        if not key.startswith('_'):
+            print(f"    {key}: {val}")
+    raise AssertionError(
+        f"C-FIND verification failed: study '{study_uid}' not confirmed at STUDY level. "
+        f"The patient (PatientID='{patient_id}') exists on the server, but the study "
+        f"is not visible via STUDY-level C-FIND. At MIDIA this typically means the "
+        f"study is in the QA queue because the order is invalid or not yet placed. "
+        f"Verify the order exists in the RIS/ordering system before routing."
+    )
+
+
+def _poll_delays(perf_config: TestConfig) -> Iterator[float]:
+    """
+    C-FIND retry delays: start at cfind_poll_min_interval and double up to
+    cfind_poll_interval, so a study that is indexed quickly is seen quickly
+    without hammering the server during a long wait. A min interval of 0
+    (or less) is raised to 0.05s so the backoff still grows.
+    """
+    delay = max(perf_config.integration.cfind_poll_min_interval, 0.05)
+    interval = perf_config.integration.cfind_poll_interval
+    while True:
+        yield min(delay, interval)
+        delay *= 2
+
+
+def _cached_study(
+    cfind_client: CompassCFindClient,
+    study_uid: str,
+    patient_id: Optional[str],
+    perf_config: TestConfig,
+) -> Optional[dict]:
+    """Study verified within cfind_cache_ttl, labelled ``_cfind_strategy='cached'``; else None."""
+    cached = cfind_client.cached_study(
+        study_uid, patient_id, ttl=perf_config.integration.cfind_cache_ttl
+    )
+    if cached is not None:
+        cached['_cfind_strategy'] = 'cached'
+    return cached
 
 
 def verify_study_arrived(
@@ -152,6 +354,13 @@ def verify_study_arrived(
           that the specific study arrived — only that the patient has data on
           the server.
 
+        The dict also has ``_cfind_strategy``, the strategy that matched;
+        read it there rather than from ``cfind_client.last_find_strategy``,
+        which a background verifier may have overwritten. A study verified
+        within ``cfind_cache_ttl`` seconds is returned from the client's
+        cache without querying (``_cfind_strategy`` is then ``'cached'``);
+        call ``cfind_client.invalidate_study(uid)`` to force a fresh query.
+
     Raises:
         AssertionError if nothing is found within the timeout.
     """
@@ -159,6 +368,11 @@ def verify_study_arrived(
         print("  [CFIND VERIFY] Skipped (CFIND_VERIFY=false)")
         return None
 
+    cached = _cached_study(cfind_client, study_uid, patient_id, perf_config)
+    if cached is not None:
+        print(f"  [CFIND VERIFY] Study {study_uid} verified recently (cached)")
+        return cached
+
     timeout = perf_config.integration.cfind_timeout
     interval = perf_config.integration.cfind_poll_interval
     initial_delay = perf_config.integration.cfind_initial_delay
@@ -166,7 +380,10 @@ def verify_study_arrived(
     print(f"  [CFIND VERIFY] C-FIND enabled. Using C-FIND server: {cfg.host}:{cfg.port}")
     print(f"  [CFIND VERIFY] Called AE: {cfg.remote_ae_title}, Calling AE: {cfg.local_ae_title}")
     print(f"  [CFIND VERIFY] Polling for StudyInstanceUID: {study_uid}")
-    print(f"  [CFIND VERIFY] Initial delay: {initial_delay}s, timeout: {timeout}s, poll interval: {interval}s")
+    print(
+        f"  [CFIND VERIFY] Initial delay: {initial_delay}s, timeout: {timeout}s, "
+        f"poll interval: {perf_config.integration.cfind_poll_min_interval}s backing off to {interval}s"
+    )
 
     if initial_delay > 0:
         print(f"  [CFIND VERIFY] Waiting {initial_delay}s before first query (IM indexing delay)...")
@@ -174,11 +391,9 @@ def verify_study_arrived(
 
     # Diagnostic: check if the calling AE can retrieve ANY studies (today).
     # Zero results here means the calling AE is not authorized to query this server.
-    from datetime import datetime as _dt
-    from pydicom.dataset import Dataset as _Dataset
-    _diag = _Dataset()
+    _diag = Dataset()
     _diag.QueryRetrieveLevel = "STUDY"
-    _diag.StudyDate = _dt.now().strftime("%Y%m%d")
+    _diag.StudyDate = datetime.now().strftime("%Y%m%d")
     _diag.StudyInstanceUID = ""
     _diag.PatientID = ""
     try:
@@ -198,73 +413,34 @@ def verify_study_arrived(
 
     start = time.time()
     attempts = 0
+    delays = _poll_delays(perf_config)
 
     while True:
         attempts += 1
         print(f"  [CFIND VERIFY] Attempt {attempts}: sending C-FIND query...")
         try:
-            result = cfind_client.find_study_by_uid(study_uid, patient_id=patient_id)
+            result = cfind_client.find_study_by_uid(
+                study_uid, patient_id=patient_id, fields=_VERIFY_FIELDS
+            )
         except socket.gaierror as e:
             raise AssertionError(
                 f"C-FIND host could not be resolved: '{cfg.host}' (getaddrinfo failed). "
                 f"Check .env: set CFIND_HOST or COMPASS_HOST to a valid hostname or IP. "
                 f"If using a separate C-FIND server, ensure CFIND_HOST is correct."
             ) from e
-        if result is not None:
-            study_dict = cfind_client.dataset_to_dict(result)
-            strategy = getattr(cfind_client, 'last_find_strategy', None) or 'unknown'
-            level = getattr(cfind_client, 'last_find_level', None) or 'unknown'
-            study_dict['_cfind_level'] = level
-            study_dict['_cfind_strategy'] = strategy
-
-            if level == "STUDY":
-                # STUDY-level: validate that the returned UID matches
-                returned_uid = study_dict.get('StudyInstanceUID', '')
-                if returned_uid and returned_uid != study_uid:
-                    print(
-                        f"  [CFIND VERIFY] WARNING: C-FIND returned StudyInstanceUID "
-                        f"'{returned_uid}' but we queried for '{study_uid}'. "
-                        f"Ignoring this result (strategy: {strategy})."
-                    )
-                    # Fall through to retry
-                else:
-                    elapsed = time.time() - start
-                    print(f"  [CFIND VERIFY] Study CONFIRMED after {elapsed:.1f}s ({attempts} attempt(s))")
-                    print(f"  [CFIND VERIFY] Strategy: {strategy} | Level: STUDY (definitive)")
-                    for key, val in study_dict.items():
-                        if not key.startswith('_'):
-                            print(f"    {key}: {val}")
-                    return study_dict
-            else:
-                # PATIENT-level result: the patient exists on the server but
-                # the specific study was NOT found at STUDY level.
-                # At MIDIA this is the QA-queue signature — the study arrived
-                # but is hidden because the order is invalid or not yet placed.
-                # Treat this as a definitive failure rather than a soft pass.
-                elapsed = time.time() - start
-                print(f"  [CFIND VERIFY] PATIENT-level result after {elapsed:.1f}s ({attempts} attempt(s))")
-                print(f"  [CFIND VERIFY] Strategy: {strategy} | Level: PATIENT")
-                print(
-                    f"  [CFIND VERIFY] PatientID '{patient_id}' exists on the server, "
-                    f"but StudyInstanceUID '{study_uid}' was NOT found at STUDY level."
-                )
-                for key, val in study_dict.items():
-                    if not key.startswith('_'):
-                        print(f"    {key}: {val}")
-                raise AssertionError(
-                    f"C-FIND verification failed: study '{study_uid}' not confirmed at STUDY level. "
-                    f"The patient (PatientID='{patient_id}') exists on the server, but the study "
-                    f"is not visible via STUDY-level C-FIND. At MIDIA this typically means the "
-                    f"study is in the QA queue because the order is invalid or not yet placed. "
-                    f"Verify the order exists in the RIS/ordering system before routing."
-                )
+        study_dict = _interpret_cfind_result(
+            cfind_client, result, study_uid, patient_id, start, attempts
+        )
+        if study_dict is not None:
+            cfind_client.remember_study(study_uid, patient_id, study_dict)
+            return study_dict
 
         elapsed = time.time() - start
         if elapsed >= timeout:
             print(f"  [CFIND VERIFY] Study not found after {attempts} attempt(s) in {timeout}s (timeout)")
             break
         remaining = timeout - elapsed
-        sleep_time = min(interval, remaining)
+        sleep_time = min(next(delays), remaining)
         print(f"  [CFIND VERIFY] Attempt {attempts}: no match, retrying in {sleep_time:.1f}s...")
         if sleep_time > 0:
             time.sleep(sleep_time)
@@ -275,6 +451,330 @@ def verify_study_arrived(
     )
 
 
+def _host_unresolved(cfind_client: CompassCFindClient) -> AssertionError:
+    """AssertionError for a C-FIND host that does not resolve."""
+    return AssertionError(
+        f"C-FIND host could not be resolved: '{cfind_client.config.host}' "
+        f"(getaddrinfo failed). Check .env: set CFIND_HOST or COMPASS_HOST "
+        f"to a valid hostname or IP."
+    )
+
+
+def _verify_each(
+    cfind_client: CompassCFindClient,
+    uids: List[str],
+    patient_ids: Dict[str, Optional[str]],
+    confirmed: Dict[str, Optional[dict]],
+    start: float,
+    attempts: int,
+) -> int:
+    """
+    Query each of ``uids`` with find_study_by_uid, adding matches to ``confirmed``.
+
+    Unlike the batched query this falls back to PATIENT level, so a study
+    held in the QA queue raises the verify_study_arrived diagnostic.
+    Returns the number of studies confirmed.
+    """
+    matched = 0
+    for uid in uids:
+        try:
+            result = cfind_client.find_study_by_uid(
+                uid, patient_id=patient_ids[uid], fields=_VERIFY_FIELDS
+            )
+        except socket.gaierror as e:
+            raise _host_unresolved(cfind_client) from e
+        study_dict = _interpret_cfind_result(
+            cfind_client, result, uid, patient_ids[uid], start, attempts
+        )
+        if study_dict is not None:
+            cfind_client.remember_study(uid, patient_ids[uid], study_dict)
+            confirmed[uid] = study_dict
+            matched += 1
+    return matched
+
+
+def verify_studies_arrived(
+    cfind_client: Optional[CompassCFindClient],
+    pairs,
+    perf_config: TestConfig,
+) -> Dict[str, Optional[dict]]:
+    """
+    Poll C-FIND for many studies at once, one batched query per poll.
+
+    Each poll sends a single multi-UID C-FIND (find_studies_by_uids) for the
+    studies that are still pending, instead of one association per study.
+    A poll in which the batched query matches nothing is followed by one
+    find_study_by_uid per pending study, so a PATIENT-level-only match (the
+    QA-queue signature) fails right away. If the batched query errors, or
+    matches nothing while the per-study queries do, the server is taken not
+    to support UID-list matching and the remaining polls query per study.
+
+    Args:
+        cfind_client: CompassCFindClient instance (None means verification disabled).
+        pairs: Iterable of ``(study_uid, patient_id)`` tuples.
+        perf_config: TestConfig for timeout / poll-interval settings.
+
+    Returns:
+        Dict mapping each StudyInstanceUID to its study dict (see
+        verify_study_arrived), or to None when verification is disabled.
+
+    Raises:
+        AssertionError listing the studies not found within the timeout, or
+        the QA-queue diagnostic when a study matches only at PATIENT level
+        (see verify_study_arrived).
+    """
+    pairs = list(pairs)
+    if cfind_client is None:
+        print("  [CFIND VERIFY] Skipped (CFIND_VERIFY=false)")
+        return {uid: None for uid, _ in pairs}
+
+    timeout = perf_config.integration.cfind_timeout
+    initial_delay = perf_config.integration.cfind_initial_delay
+    patient_ids = dict(pairs)
+    confirmed: Dict[str, Optional[dict]] = {}
+    for uid, patient_id in patient_ids.items():
+        cached = _cached_study(cfind_client, uid, patient_id, perf_config)
+        if cached is not None:
+            confirmed[uid] = cached
+    pending = [uid for uid in patient_ids if uid not in confirmed]
+    if not pending:
+        print(f"  [CFIND VERIFY] All {len(confirmed)} StudyInstanceUID(s) verified recently (cached)")
+        return confirmed
+    print(f"  [CFIND VERIFY] Polling for {len(pending)} StudyInstanceUID(s) with batched C-FIND")
+
+    if initial_delay > 0:
+        print(f"  [CFIND VERIFY] Waiting {initial_delay}s before first query (IM indexing delay)...")
+        time.sleep(initial_delay)
+
+    start = time.time()
+    attempts = 0
+    delays = _poll_delays(perf_config)
+    batched = True
+
+    while True:
+        attempts += 1
+        matched = 0
+        if batched:
+            try:
+                found = cfind_client.find_studies_by_uids(pending, fields=_VERIFY_FIELDS)
+            except socket.gaierror as e:
+                raise _host_unresolved(cfind_client) from e
+            except (RuntimeError, ValueError) as e:
+                print(f"  [CFIND VERIFY] Batched C-FIND failed ({e}); querying each study instead")
+                batched = False
+                found = {}
+            strategy = getattr(cfind_client, 'last_find_strategy', None) or 'unknown'
+            for uid, result in found.items():
+                study_dict = _interpret_cfind_result(
+                    cfind_client, result, uid, patient_ids[uid], start, attempts,
+                    strategy=strategy, level="STUDY",
+                )
+                if study_dict is not None:
+                    cfind_client.remember_study(uid, patient_ids[uid], study_dict)
+                    confirmed[uid] = study_dict
+                    matched += 1
+            pending = [uid for uid in pending if uid not in confirmed]
+        checked_each = not matched and bool(pending)
+        if checked_each:
+            if _verify_each(cfind_client, pending, patient_ids, confirmed, start, attempts) and batched:
+                print("  [CFIND VERIFY] Server does not match UID lists; querying each study instead")
+                batched = False
+            pending = [uid for uid in pending if uid not in confirmed]
+        if not pending:
+            return confirmed
+
+        elapsed = time.time() - start
+        if elapsed >= timeout:
+            break
+        sleep_time = min(next(delays), timeout - elapsed)
+        print(f"  [CFIND VERIFY] Attempt {attempts}: {len(pending)} pending, retrying in {sleep_time:.1f}s...")
+        time.sleep(sleep_time)
+
+    # The last poll matched some studies in the batch, so the rest were not
+    # yet checked at PATIENT level; do that before reporting them missing.
+    if not checked_each:
+        _verify_each(cfind_client, pending, patient_ids, confirmed, start, attempts)
+        pending = [uid for uid in pending if uid not in confirmed]
+        if not pending:
+            return confirmed
+
+    raise AssertionError(
+        f"C-FIND verification failed: {len(pending)} of {len(patient_ids)} studies not found "
+        f"after {timeout}s ({attempts} attempts): {', '.join(pending)}"
+    )
+
+
+async def verify_study_arrived_async(
+    cfind_client: Optional[CompassCFindClient],
+    study_uid: str,
+    perf_config: TestConfig,
+    patient_id: Optional[str] = None,
+    find_lock: Optional[asyncio.Lock] = None,
+) -> Optional[dict]:
+    """
+    Async variant of :func:`verify_study_arrived` for verifying many studies at once.
+
+    The blocking C-FIND call runs in the default executor and the poll interval
+    is an ``asyncio.sleep``, so several studies can be polled on one event loop.
+    ``find_study_by_uid`` mutates per-client state (query model and
+    ``last_find_*``), so concurrent pollers sharing a client must pass the same
+    ``find_lock``; only the short C-FIND round-trip is serialized, not the waits.
+
+    Returns / Raises:
+        Same as :func:`verify_study_arrived`, including the cached fast path.
+    """
+    if cfind_client is None:
+        print("  [CFIND VERIFY] Skipped (CFIND_VERIFY=false)")
+        return None
+
+    cached = _cached_study(cfind_client, study_uid, patient_id, perf_config)
+    if cached is not None:
+        print(f"  [CFIND VERIFY] Study {study_uid} verified recently (cached)")
+        return cached
+
+    timeout = perf_config.integration.cfind_timeout
+    initial_delay = perf_config.integration.cfind_initial_delay
+    if find_lock is None:
+        find_lock = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+    print(f"  [CFIND VERIFY] Polling (async) for StudyInstanceUID: {study_uid}")
+
+    if initial_delay > 0:
+        await asyncio.sleep(initial_delay)
+
+    start = time.time()
+    attempts = 0
+    delays = _poll_delays(perf_config)
+
+    while True:
+        attempts += 1
+        async with find_lock:
+            try:
+                result = await loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        cfind_client.find_study_by_uid,
+                        study_uid, patient_id=patient_id, fields=_VERIFY_FIELDS,
+                    ),
+                )
+            except socket.gaierror as e:
+                raise _host_unresolved(cfind_client) from e
+            strategy = getattr(cfind_client, 'last_find_strategy', None)
+            level = getattr(cfind_client, 'last_find_level', None)
+
+        study_dict = _interpret_cfind_result(
+            cfind_client, result, study_uid, patient_id, start, attempts,
+            strategy=strategy or 'unknown', level=level or 'unknown',
+        )
+        if study_dict is not None:
+            cfind_client.remember_study(study_uid, patient_id, study_dict)
+            return study_dict
+
+        elapsed = time.time() - start
+        if elapsed >= timeout:
+            print(f"  [CFIND VERIFY] Study {study_uid} not found after {attempts} attempt(s) in {timeout}s (timeout)")
+            break
+        await asyncio.sleep(min(next(delays), timeout - elapsed))
+
+    raise AssertionError(
+        f"C-FIND verification failed: study {study_uid} not found "
+        f"after {timeout}s ({attempts} attempts)"
+    )
+
+
+class StudyVerifier:
+    """
+    Verifies several studies concurrently.
+
+    By default (CFIND_BATCH=true) all studies are polled together with one
+    batched multi-UID C-FIND per interval (verify_studies_arrived). With
+    ``batch=False`` each study gets its own poller on one long-lived event
+    loop, for servers that reject UID-list matching. Either way, wall time
+    for K studies is roughly max(timeout) instead of K * timeout.
+    """
+
+    def __init__(self, cfind_client: Optional[CompassCFindClient], perf_config: TestConfig):
+        self.cfind_client = cfind_client
+        self.perf_config = perf_config
+        self._loop = asyncio.new_event_loop()
+        self._background: Optional[ThreadPoolExecutor] = None
+
+    async def _gather(self, pairs):
+        find_lock = asyncio.Lock()
+        return await asyncio.gather(*(
+            verify_study_arrived_async(
+                self.cfind_client, uid, self.perf_config,
+                patient_id=patient_id, find_lock=find_lock,
+            )
+            for uid, patient_id in pairs
+        ))
+
+    def verify_all(self, pairs, batch: Optional[bool] = None) -> List[Optional[dict]]:
+        """
+        Verify ``(study_uid, patient_id)`` pairs concurrently.
+
+        ``batch`` defaults to the cfind_batch setting. Returns results in
+        input order; raises AssertionError on failure.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        if batch is None:
+            batch = self.perf_config.integration.cfind_batch
+        if batch:
+            by_uid = verify_studies_arrived(self.cfind_client, pairs, self.perf_config)
+            return [by_uid[uid] for uid, _ in pairs]
+        return self._loop.run_until_complete(self._gather(pairs))
+
+    def submit(self, pairs) -> Future:
+        """
+        Start verify_all(pairs) on a background thread and return its Future.
+
+        Lets paced tests verify earlier studies while they wait to send the
+        next one. Submissions run one after another on a single thread, but
+        that thread shares the C-FIND client with the caller: drain() the
+        Futures before any assert and before the test queries C-FIND itself,
+        so no check keeps polling into later tests or loses its error.
+        """
+        if self._background is None:
+            self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cfind-verify")
+        return self._background.submit(self.verify_all, list(pairs))
+
+    @staticmethod
+    def drain(futures, cancel: bool = False) -> Optional[BaseException]:
+        """
+        Wait for submitted checks to finish; return the first error, if any.
+
+        With ``cancel=True`` checks that have not started yet are cancelled
+        first (use it when the test is already failing).
+        """
+        if cancel:
+            for future in futures:
+                future.cancel()
+        error = None
+        for future in futures:
+            if future.cancelled():
+                continue
+            exc = future.exception()
+            if error is None:
+                error = exc
+        return error
+
+    def close(self) -> None:
+        if self._background is not None:
+            self._background.shutdown(wait=True)
+        self._loop.run_until_complete(self._loop.shutdown_default_executor())
+        self._loop.close()
+
+
+@pytest.fixture(scope="session")
+def verifier(cfind_client, perf_config) -> StudyVerifier:
+    """Session-scoped concurrent C-FIND verifier (see StudyVerifier)."""
+    v = StudyVerifier(cfind_client, perf_config)
+    yield v
+    v.close()
+
+
 @contextmanager
 def manual_verification_required(description: str):
     """Wrap assertions that require manual verification if they fail.
@@ -299,74 +799,145 @@ def manual_verification_required(description: str):
         raise AssertionError(banner) from e
 
 
+class BufferedOutput:
+    """
+    Collects a test's console lines in memory and writes them in one go.
+
+    ``line()`` takes the same arguments as ``print()``. Call ``flush()``
+    before anything that prints directly (e.g. C-FIND verification) to keep
+    the output in order.
+    """
+
+    def __init__(self) -> None:
+        self._buf = StringIO()
+
+    def line(self, *args, **kwargs) -> None:
+        print(*args, file=self._buf, **kwargs)
+
+    def flush(self) -> None:
+        text = self._buf.getvalue()
+        if text:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            self._buf = StringIO()
+
+
+@pytest.fixture
+def console() -> BufferedOutput:
+    """Per-test BufferedOutput, flushed at teardown (pass or fail)."""
+    out = BufferedOutput()
+    yield out
+    out.flush()
+
+
 # ============================================================================
 # Test Data Selection Fixtures
 # ============================================================================
 
+# Data-selection fixtures report through this logger; INFO messages are only
+# emitted with -v (see pytest_configure), warnings always.
+_fixture_log = logging.getLogger("dicom_fixtures")
+
+
+# Size thresholds shared by the size-based selection fixtures
+_SMALL_FILE_BYTES = 1 << 20    # 1MB
+_LARGE_FILE_BYTES = 10 << 20   # 10MB
+
+
 @pytest.fixture(scope="session")
-def large_dicom_file(dicom_files: List[Path]):
+def dicom_file_sizes(dicom_file_entries: List[DicomFileEntry]) -> List[tuple]:
     """
-    Select the largest DICOM file available for testing.
-    Gracefully skips if no file exceeds 10 MB.
+    (path, size_in_bytes) for every DICOM file, from the discovery-time stat.
+
+    The size-based selection fixtures below all read from this list instead
+    of calling stat() on the same files again.
     """
-    large_threshold_bytes = 10 * 1024 * 1024  # 10MB
+    return [(entry.path, entry.size) for entry in dicom_file_entries]
 
-    largest = max(dicom_files, key=lambda f: f.stat().st_size)
-    largest_size = largest.stat().st_size
 
-    if largest_size <= large_threshold_bytes:
+@pytest.fixture(scope="session")
+def large_dicom_entry(dicom_file_entries: List[DicomFileEntry]) -> DicomFileEntry:
+    """
+    Select the largest DICOM file available for testing, with its size.
+    Gracefully skips if no file exceeds 10 MB.
+    """
+    largest = max(dicom_file_entries, key=lambda e: e.size)
+
+    if largest.size <= _LARGE_FILE_BYTES:
         pytest.skip(f"No large DICOM file (>10MB) found in dataset. "
-                    f"Available files: {len(dicom_files)}")
+                    f"Available files: {len(dicom_file_entries)}")
 
-    size_mb = largest_size / (1024 * 1024)
-    print(f"\n[INFO] Selected large file: {largest.name} ({size_mb:.2f}MB)")
+    size_mb = largest.size / (1024 * 1024)
+    _fixture_log.info("Selected large file: %s (%.2fMB)", largest.path.name, size_mb)
     return largest
 
 
 @pytest.fixture(scope="session")
-def small_dicom_files(dicom_files: List[Path]):
+def large_dicom_file(large_dicom_entry: DicomFileEntry) -> Path:
+    """Path of large_dicom_entry."""
+    return large_dicom_entry.path
+
+
+@pytest.fixture(scope="session")
+def small_dicom_files(dicom_file_sizes: List[tuple]):
     """
     Select up to 10 small DICOM files (<1MB) for batch testing.
     Gracefully skips if fewer than 3 small files available.
     """
-    small_threshold_bytes = 1 * 1024 * 1024  # 1MB
     min_required = 3
     max_returned = 10
     
-    small_files = [f for f in dicom_files if f.stat().st_size < small_threshold_bytes]
+    small_files = [(f, size) for f, size in dicom_file_sizes if size < _SMALL_FILE_BYTES]
     
     if len(small_files) < min_required:
         pytest.skip(f"Need at least {min_required} small files (<1MB), "
                     f"only found {len(small_files)}")
     
     selected = small_files[:max_returned]
-    total_size_mb = sum(f.stat().st_size for f in selected) / (1024 * 1024)
-    print(f"\n[INFO] Selected {len(selected)} small files (total: {total_size_mb:.2f}MB)")
-    return selected
+    total_size_mb = sum(size for _, size in selected) / (1024 * 1024)
+    _fixture_log.info("Selected %d small files (total: %.2fMB)", len(selected), total_size_mb)
+    return [f for f, _ in selected]
 
 
 @pytest.fixture(scope="session")
-def medium_dicom_files(dicom_files: List[Path]):
+def medium_dicom_files(dicom_file_sizes: List[tuple]):
     """
     Select medium-sized DICOM files (1MB - 10MB) for testing.
     Gracefully skips if no medium files available.
     """
-    min_size = 1 * 1024 * 1024  # 1MB
-    max_size = 10 * 1024 * 1024  # 10MB
-    
-    medium_files = [f for f in dicom_files 
-                    if min_size <= f.stat().st_size <= max_size]
+    medium_files = [f for f, size in dicom_file_sizes
+                    if _SMALL_FILE_BYTES <= size <= _LARGE_FILE_BYTES]
     
     if not medium_files:
         pytest.skip(f"No medium-sized DICOM files (1-10MB) found. "
-                    f"Total files available: {len(dicom_files)}")
+                    f"Total files available: {len(dicom_file_sizes)}")
     
-    print(f"\n[INFO] Found {len(medium_files)} medium-sized files")
+    _fixture_log.info("Found %d medium-sized files", len(medium_files))
     return medium_files
 
 
+def _lookup_modality(entry: DicomFileEntry, use_cache: bool) -> tuple:
+    """
+    Resolve one file's modality, from the on-disk index when still valid.
+
+    Returns (file, modality, new_cache_entry_or_None, error_or_None); never
+    raises, so it can run in a worker thread.
+    """
+    file = entry.path
+    try:
+        if not use_cache:
+            return file, read_modality(file), None, None
+        cached = _modality_cache.get(str(file))
+        if cached and cached[:2] == [entry.mtime_ns, entry.size]:
+            return file, cached[2], None, None
+        modality = read_modality(file)
+        return file, modality, [entry.mtime_ns, entry.size, modality], None
+    except Exception as e:
+        return file, None, None, e
+
+
 @pytest.fixture(scope="session")
-def dicom_by_modality(dicom_files: List[Path]):
+def dicom_by_modality(dicom_file_entries: List[DicomFileEntry]):
     """
     Organize DICOM files by modality (CT, MR, CR, etc.).
     Returns dict: {modality: [files]}
@@ -378,36 +949,45 @@ def dicom_by_modality(dicom_files: List[Path]):
                 pytest.skip(f"No {modality} files available")
             files = dicom_by_modality[modality]
     """
+    global _modality_cache, _modality_cache_dirty
     by_modality = {}
     skipped_files = 0
+    use_cache = _modality_cache_enabled()
+    if use_cache:
+        _modality_cache = _load_modality_cache(_MODALITY_CACHE_PATH)
     
-    for file in dicom_files:
-        try:
-            ds = load_dataset(file)
-            modality = ds.Modality if hasattr(ds, 'Modality') else 'UNKNOWN'
-            
-            if modality not in by_modality:
-                by_modality[modality] = []
-            by_modality[modality].append(file)
-        except Exception as e:
+    # Header reads are I/O bound, so overlap them; aggregate in file order
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        results = list(pool.map(lambda e: _lookup_modality(e, use_cache), dicom_file_entries))
+    
+    for file, modality, cache_entry, error in results:
+        if error is not None:
             skipped_files += 1
-            print(f"\n[WARNING] Could not read modality from {file.name}: {e}")
+            _fixture_log.warning("Could not read modality from %s: %s", file.name, error)
+            continue
+        if cache_entry is not None:
+            _modality_cache[str(file)] = cache_entry
+            _modality_cache_dirty = True
+        
+        if modality not in by_modality:
+            by_modality[modality] = []
+        by_modality[modality].append(file)
     
     if not by_modality:
         pytest.skip("Could not determine modality for any files")
     
-    print(f"\n[INFO] Files organized by modality:")
-    for modality, files in sorted(by_modality.items()):
-        print(f"  - {modality}: {len(files)} files")
-    
-    if skipped_files > 0:
-        print(f"  - Skipped: {skipped_files} files (read errors)")
+    if _fixture_log.isEnabledFor(logging.INFO):
+        lines = ["Files organized by modality:"]
+        lines.extend(f"  - {modality}: {len(files)} files" for modality, files in sorted(by_modality.items()))
+        if skipped_files > 0:
+            lines.append(f"  - Skipped: {skipped_files} files (read errors)")
+        _fixture_log.info("\n".join(lines))
     
     return by_modality
 
 
 @pytest.fixture(scope="session")
-def dicom_by_size_category(dicom_files: List[Path]):
+def dicom_by_size_category(dicom_file_sizes: List[tuple]):
     """
     Organize DICOM files into size categories.
     Returns dict: {'small': [files], 'medium': [files], 'large': [files]}
@@ -417,40 +997,43 @@ def dicom_by_size_category(dicom_files: List[Path]):
         'medium': [],  # 1-10MB
         'large': []    # >10MB
     }
+    total_bytes = dict.fromkeys(categories, 0)
     
-    for file in dicom_files:
-        size_mb = file.stat().st_size / (1024 * 1024)
-        
-        if size_mb < 1:
-            categories['small'].append(file)
-        elif size_mb <= 10:
-            categories['medium'].append(file)
+    for file, size in dicom_file_sizes:
+        if size < _SMALL_FILE_BYTES:
+            category = 'small'
+        elif size <= _LARGE_FILE_BYTES:
+            category = 'medium'
         else:
-            categories['large'].append(file)
+            category = 'large'
+        categories[category].append(file)
+        total_bytes[category] += size
     
-    print(f"\n[INFO] Files by size category:")
-    for category, files in categories.items():
-        if files:
-            total_mb = sum(f.stat().st_size for f in files) / (1024 * 1024)
-            print(f"  - {category}: {len(files)} files ({total_mb:.2f}MB total)")
+    if _fixture_log.isEnabledFor(logging.INFO):
+        lines = ["Files by size category:"]
+        lines.extend(
+            f"  - {category}: {len(files)} files ({total_bytes[category] / (1024 * 1024):.2f}MB total)"
+            for category, files in categories.items() if files
+        )
+        _fixture_log.info("\n".join(lines))
     
     return categories
 
 
 @pytest.fixture(scope="session")
-def single_dicom_file(dicom_files: List[Path]):
+def single_dicom_file(dicom_file_sizes: List[tuple]):
     """
     Select a single representative DICOM file.
     Gracefully skips if no files available.
     
     Useful for simple integration tests that just need any valid file.
     """
-    if not dicom_files:
+    if not dicom_file_sizes:
         pytest.skip("No DICOM files available for testing")
     
-    file = dicom_files[0]
-    size_mb = file.stat().st_size / (1024 * 1024)
-    print(f"\n[INFO] Using single file: {file.name} ({size_mb:.2f}MB)")
+    file, size = dicom_file_sizes[0]
+    size_mb = size / (1024 * 1024)
+    _fixture_log.info("Using single file: %s (%.2fMB)", file.name, size_mb)
     return file
 
 
@@ -470,7 +1053,7 @@ def dicom_file_subset(dicom_files: List[Path], request):
         pytest.skip(f"Need {count} files, only {len(dicom_files)} available")
     
     subset = dicom_files[:count]
-    print(f"\n[INFO] Selected subset of {len(subset)} files")
+    _fixture_log.info("Selected subset of %d files", len(subset))
     return subset
 
 
@@ -503,8 +1086,177 @@ def get_files_by_modality(dicom_by_modality: dict, modality: str, count: int = N
     return files[:count] if count else files
 
 
+def patient_id_of(ds) -> Optional[str]:
+    """PatientID as a string for C-FIND verification, or None if the tag is absent."""
+    value = ds.get('PatientID')
+    return str(value) if value is not None else None
+
+
+def uid_sequence(prefix: str = PYDICOM_ROOT_UID) -> Iterator[str]:
+    """
+    Yield unique UIDs without calling generate_uid per UID.
+
+    One random draw fixes a root for the sequence; each UID is that root
+    plus a counter, e.g. ``<prefix><nonce>.1``, ``<prefix><nonce>.2``.
+    The 64-bit nonce keeps the UIDs well under the 64-character limit.
+    """
+    root = f"{prefix}{int.from_bytes(os.urandom(8), 'big')}."
+    for i in itertools.count(1):
+        yield f"{root}{i}"
+
+
+def accession_sequence() -> Iterator[str]:
+    """
+    Yield unique accession numbers without reading the clock per value.
+
+    Each value is a compact timestamp plus a counter, e.g.
+    ``2500112000000001`` is ``%y%j%H%M%S`` + ``00001``: 16 characters, the
+    SH limit. After 99999 values the stamp is taken again.
+    """
+    while True:
+        stamp = datetime.now().strftime('%y%j%H%M%S')
+        for i in range(1, 100000):
+            yield f"{stamp}{i:05d}"
+
+
+# One accession sequence for the whole session, so test modules drawing in
+# the same second cannot hand out the same value
+_ACCESSION_NUMBERS = accession_sequence()
+_ACCESSION_LOCK = threading.Lock()
+
+
+def next_accession_number() -> str:
+    """Next value from the session-wide accession sequence (thread-safe)."""
+    with _ACCESSION_LOCK:
+        return next(_ACCESSION_NUMBERS)
+
+
+def update_tags_recursively(ds, tags: Dict[BaseTag, Tuple[str, object]]) -> int:
+    """
+    Update several tags in the dataset and all nested sequences in one walk.
+
+    Sequence items are visited from an explicit stack rather than by
+    recursion, so each item is checked for every tag exactly once.
+
+    Args:
+        ds: pydicom Dataset object
+        tags: Mapping of Tag -> (VR, value) to set (Tag keys avoid
+              re-coercing tuples on every lookup)
+
+    Returns:
+        Count of how many tag values were updated
+    """
+    count = 0
+    stack = [ds]
+
+    while stack:
+        item = stack.pop()
+        for tag, (_, value) in tags.items():
+            if tag in item:
+                item[tag].value = value
+                count += 1
+
+        # elements() yields raw (undecoded) elements, so only sequences get
+        # converted; implicit VR raw elements carry no VR and must be decoded
+        for raw in item.elements():
+            if raw.VR is not None and raw.VR != "SQ":
+                continue
+            elem = item[raw.tag]
+            if elem.VR == "SQ" and elem.value:
+                stack.extend(elem.value)
+
+    return count
+
+
+def _save_with_transfer_syntax_encoding(ds, target) -> None:
+    """Save ds to a path or buffer, encoding as its TransferSyntaxUID dictates."""
+    implicit_vr, little_endian = save_encoding(ds)
+    ds.save_as(target, implicit_vr=implicit_vr, little_endian=little_endian)
+
+
+@pytest.fixture(scope="session")
+def dicom_template_bytes(single_dicom_file) -> bytes:
+    """
+    single_dicom_file loaded (decompressed, encoding-normalized) once and
+    serialized, so factories can clone it in memory instead of from disk.
+    """
+    ds = load_dataset(single_dicom_file)
+    buf = BytesIO()
+    _save_with_transfer_syntax_encoding(ds, buf)
+    return buf.getvalue()
+
+
+# Parsed datasets kept by cached_dataset (files up to LARGE_FILE_DEFER_BYTES)
+_CACHED_DATASETS = 64
+
+
+@pytest.fixture(scope="session")
+def cached_dataset(dicom_file_entries: List[DicomFileEntry]):
+    """
+    Loader that returns a fresh dataset for a path on every call, so tests
+    can mutate the result freely.
+
+    Files up to LARGE_FILE_DEFER_BYTES are parsed once and deep-copied from
+    a bounded LRU cache (_CACHED_DATASETS entries; lru_cache is safe to call
+    from a prefetch thread). Larger files are re-read on each call so their
+    pixel data is not held for the session. File sizes come from discovery;
+    only paths outside dicom_file_entries are stat'ed.
+    """
+    sizes = {entry.path: entry.size for entry in dicom_file_entries}
+    parse = functools.lru_cache(maxsize=_CACHED_DATASETS)(load_dataset)
+
+    def load(path: Path) -> Dataset:
+        path = Path(path)
+        size = sizes.get(path)
+        if size is None:
+            size = path.stat().st_size
+        if size > LARGE_FILE_DEFER_BYTES:
+            return load_dataset(path, size=size)
+        return copy.deepcopy(parse(path, size=size))
+
+    yield load
+    parse.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def new_study_dataset(cached_dataset):
+    """
+    Loader like cached_dataset whose copies also get fresh Study, Series and
+    SOP Instance UIDs (from one session-wide uid_sequence), so every send
+    is a new study.
+    """
+    uids = uid_sequence()
+
+    def load(path: Path) -> Dataset:
+        ds = cached_dataset(path)
+        ds.StudyInstanceUID = next(uids)
+        ds.SeriesInstanceUID = next(uids)
+        ds.SOPInstanceUID = next(uids)
+        return ds
+
+    return load
+
+
+@functools.lru_cache(maxsize=256)
+def _attribute_tag(attr: str) -> tuple:
+    """
+    Resolve a factory kwarg to (keyword, Tag, VR), or (keyword, None, None)
+    if the keyword is not in the DICOM dictionary.
+    """
+    # Convert snake_case to PascalCase for DICOM keyword lookup
+    if '_' in attr:
+        dicom_attr = ''.join(word.capitalize() for word in attr.split('_'))
+    else:
+        dicom_attr = attr[0].upper() + attr[1:] if attr else attr
+    
+    tag = tag_for_keyword(dicom_attr)
+    if tag is None:
+        return dicom_attr, None, None
+    return dicom_attr, Tag(tag), dictionary_VR(tag)
+
+
 @pytest.fixture
-def test_dicom_with_attributes(single_dicom_file):
+def test_dicom_with_attributes(dicom_template_bytes):
     """
     Factory fixture to create test DICOM files with specific attributes.
     
@@ -521,9 +1273,8 @@ def test_dicom_with_attributes(single_dicom_file):
     Returns:
         Function that takes **kwargs and returns (file_path, dataset) tuple
     """
-    import tempfile
-    from pydicom.uid import generate_uid
-    
+    uids = uid_sequence()
+
     def _create_test_file(**attributes):
         """
         Create a DICOM file with specified attributes.
@@ -535,44 +1286,29 @@ def test_dicom_with_attributes(single_dicom_file):
         Returns:
             Tuple of (file_path, dataset)
         """
-        ds = load_dataset(single_dicom_file)
+        # Clone the already-normalized template in memory
+        ds = dcmread(BytesIO(dicom_template_bytes))
         
         # Apply custom attributes
         for attr, value in attributes.items():
-            # Convert snake_case to PascalCase for DICOM keyword lookup
-            if '_' in attr:
-                dicom_attr = ''.join(word.capitalize() for word in attr.split('_'))
+            dicom_attr, tag, vr = _attribute_tag(attr)
+            if tag is None:
+                # Not a dictionary keyword; keep plain attribute behaviour
+                setattr(ds, dicom_attr, value)
+            elif tag in ds:
+                ds[tag].value = value
             else:
-                dicom_attr = attr[0].upper() + attr[1:] if attr else attr
-            
-            setattr(ds, dicom_attr, value)
+                ds.add_new(tag, vr, value)
         
         # Generate unique UIDs to ensure each test is independent
-        ds.StudyInstanceUID = generate_uid()
-        ds.SeriesInstanceUID = generate_uid()
-        ds.SOPInstanceUID = generate_uid()
+        ds.StudyInstanceUID = next(uids)
+        ds.SeriesInstanceUID = next(uids)
+        ds.SOPInstanceUID = next(uids)
         
         # Save to temp file
         temp_fd, temp_path = tempfile.mkstemp(suffix='.dcm', prefix='test_transform_')
         os.close(temp_fd)
-        
-        # Ensure encoding consistency before saving
-        # Import the helper function to ensure proper encoding
-        from data_loader import ensure_encoding_consistency
-        ds = ensure_encoding_consistency(ds)
-        
-        # Get the transfer syntax to determine encoding parameters
-        transfer_syntax = str(ds.file_meta.TransferSyntaxUID) if hasattr(ds, 'file_meta') and hasattr(ds.file_meta, 'TransferSyntaxUID') else '1.2.840.10008.1.2.1'
-        
-        # Save with proper encoding parameters based on transfer syntax
-        # Use the recommended implicit_vr and little_endian arguments
-        # instead of deprecated is_implicit_VR and is_little_endian attributes
-        if transfer_syntax == '1.2.840.10008.1.2':  # Implicit VR Little Endian
-            ds.save_as(temp_path, implicit_vr=True, little_endian=True)
-        elif transfer_syntax == '1.2.840.10008.1.2.2':  # Explicit VR Big Endian
-            ds.save_as(temp_path, implicit_vr=False, little_endian=False)
-        else:  # Explicit VR Little Endian (default for most transfer syntaxes)
-            ds.save_as(temp_path, implicit_vr=False, little_endian=True)
+        _save_with_transfer_syntax_encoding(ds, temp_path)
         
         return temp_path, ds
     
@@ -583,6 +1319,26 @@ def test_dicom_with_attributes(single_dicom_file):
 # HTML Report Hooks
 # ============================================================================
 
+def pytest_report_collectionfinish(config, start_path, items):
+    """List the data-validation scenarios once, if that module was collected."""
+    if not any(item.path.name == "test_data_validation.py" for item in items):
+        return []
+    return [
+        "Data validation scenarios (tests/test_data_validation.py):",
+        "  1. Blank StudyDate/Time handling",
+        "  2. Accession number generation (IIMS API)",
+        "  3. Accession number preservation",
+        "  4. Patient demographic edge cases",
+        "  5. Missing required tags",
+    ]
+
+
+def pytest_configure(config):
+    """Enable data-selection fixture INFO messages only in verbose runs."""
+    verbose = config.getoption("verbose") > 0
+    _fixture_log.setLevel(logging.INFO if verbose else logging.WARNING)
+
+
 def pytest_sessionstart(session):
     """Record session start time and reset UID tracking."""
     global _report_session_start, _report_test_results
@@ -616,16 +1372,7 @@ def pytest_runtest_makereport(item, call):
         perf_metrics = getattr(item, "_perf_metrics", None)
         if perf_metrics is not None and perf_metrics.total > 0:
             perf_snapshot = perf_metrics.snapshot()
-            perf_samples = [
-                {
-                    "start_time": s.start_time,
-                    "end_time": s.end_time,
-                    "latency_ms": s.latency_ms,
-                    "success": s.success,
-                    "error": s.error,
-                }
-                for s in perf_metrics.samples
-            ]
+            perf_samples = sample_columns(perf_metrics.samples)
 
             # Extract thresholds from config if available
             if _report_config is not None:
@@ -662,51 +1409,32 @@ def pytest_sessionfinish(session, exitstatus):
     """Generate HTML report at session end."""
     duration = time.time() - _report_session_start
 
-    config_summary = None
-    if _report_config is not None:
-        cfg = _report_config
-        config_summary = {
-            "endpoint": {
-                "host": cfg.endpoint.host,
-                "port": cfg.endpoint.port,
-                "remote_ae_title": cfg.endpoint.remote_ae_title,
-                "local_ae_title": cfg.endpoint.local_ae_title,
-            },
-            "load_profile": {
-                "peak_images_per_second": cfg.load_profile.peak_images_per_second,
-                "load_multiplier": cfg.load_profile.load_multiplier,
-                "test_duration_seconds": cfg.load_profile.test_duration_seconds,
-                "concurrency": cfg.load_profile.concurrency,
-            },
-            "thresholds": {
-                "max_error_rate": f"{cfg.thresholds.max_error_rate:.1%}",
-                "max_p95_latency_ms": f"{cfg.thresholds.max_p95_latency_ms:.0f} ms",
-                "max_p95_latency_ms_short": f"{cfg.thresholds.max_p95_latency_ms_short:.0f} ms",
-            },
-            "dataset": {
-                "dicom_root_dir": str(cfg.dataset.dicom_root_dir),
-                "recursive": cfg.dataset.recursive,
-            },
-        }
-
     report_data = ReportData(
         timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         duration=duration,
         platform_info=f"Python {sys.version.split()[0]} on {platform.system()} {platform.release()}",
         test_results=_report_test_results,
-        config_summary=config_summary,
+        config_summary=_report_config_summary,
     )
 
     html_content = generate_html_report(report_data)
-    report_path = project_root / "test_report.html"
-    report_path.write_text(html_content, encoding="utf-8")
-    file_url = report_path.as_uri()
+    _REPORT_PATH.write_bytes(html_content.encode("utf-8"))
+    file_url = _REPORT_PATH.as_uri()
     tw = session.config.get_terminal_writer()
     tw.line()
     tw.sep("=", "Test Execution Report")
     tw.line(f" {file_url}")
     tw.sep("=")
 
+    # Persist the modality index if new files were parsed this session
+    if _modality_cache_dirty:
+        try:
+            _MODALITY_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(_MODALITY_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(_modality_cache, f)
+        except OSError as e:
+            print(f"[WARNING] Could not write modality index {_MODALITY_CACHE_PATH}: {e}")
+
     # Write study_uids.txt (overwritten each session)
     if _uid_log:
         uid_path = project_root / "study_uids.txt"
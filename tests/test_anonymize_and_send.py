@@ -7,59 +7,93 @@ Tests the end-to-end workflow of anonymizing DICOM files and sending them to Com
 import os
 import shutil
 import tempfile
-from datetime import datetime
-from typing import Tuple
+from pathlib import Path
+from typing import Optional, Tuple
 
 import pytest
-from pydicom import dcmread
-from pydicom.uid import generate_uid
+from pydicom.dataset import Dataset
+from pydicom.tag import Tag
 
 # Import framework modules from root
-from data_loader import load_dataset
+from data_loader import load_dataset, save_encoding
 from dicom_sender import DicomSender
 from metrics import PerfMetrics
+from tests.conftest import (
+    next_accession_number,
+    uid_sequence,
+    update_tags_recursively,
+    verify_study_arrived,
+)
 
 
-def generate_accession_number() -> str:
-    """Generate a unique accession number based on current timestamp."""
-    now = datetime.now()
-    microseconds = now.microsecond
-    return f"{now.strftime('%Y%m%d-%H%M%S')}-{microseconds:06d}"
+# PHI tags rewritten by anonymize_dicom_file, built once at import
+STUDY_INSTANCE_UID_TAG = Tag(0x0020, 0x000d)
+ACCESSION_NUMBER_TAG = Tag(0x0008, 0x0050)
+SERIES_INSTANCE_UID_TAG = Tag(0x0020, 0x000e)
+SOP_INSTANCE_UID_TAG = Tag(0x0008, 0x0018)
+PATIENT_ID_TAG = Tag(0x0010, 0x0020)
+PATIENT_NAME_TAG = Tag(0x0010, 0x0010)
+PATIENT_BIRTH_DATE_TAG = Tag(0x0010, 0x0030)
+INSTITUTION_NAME_TAG = Tag(0x0008, 0x0080)
+REFERRING_PHYSICIAN_NAME_TAG = Tag(0x0008, 0x0090)
 
+# Anonymized files are written then read straight back; keep them in RAM
+# (tmpfs) where available instead of on the disk behind /tmp.
+_TEMP_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else None
+_WRITE_BUFFER_SIZE = 1 << 20
 
-def update_tag_recursively(ds, tag_tuple: Tuple, value, vr: str = None) -> int:
+# Replacement identifiers for every anonymized dataset in this module
+_UIDS = uid_sequence()
+
+
+def anonymize_dicom_dataset(ds: Dataset) -> Tuple[Dataset, dict]:
     """
-    Recursively update a tag in the dataset and all nested sequences.
+    Anonymize a dataset in memory by replacing all PHI tags (no file I/O).
     
-    Args:
-        ds: pydicom Dataset object
-        tag_tuple: Tuple of (group, element) for the tag
-        value: Value to set for the tag
-        vr: Value Representation (e.g., 'PN', 'LO', 'DA')
-        
     Returns:
-        Count of how many times the tag was updated
+        Tuple of (ds, new_uids_dict); ds is modified in place
     """
-    count = 0
+    # Generate new unique identifiers
+    new_study_uid = next(_UIDS)
+    new_accession_number = next_accession_number()
+    new_series_uid = next(_UIDS)
+    new_sop_instance_uid = next(_UIDS)
     
-    if tag_tuple in ds:
-        ds[tag_tuple].value = value
-        count += 1
+    print(f"  [OK] Generated new StudyInstanceUID: {new_study_uid}")
     
-    for elem in ds:
-        if elem.VR == "SQ" and elem.value:
-            for seq_item in elem.value:
-                count += update_tag_recursively(seq_item, tag_tuple, value, vr)
+    # Replace UIDs and patient demographics (including nested sequences);
+    # missing top-level tags are added first
+    phi_tags = {
+        STUDY_INSTANCE_UID_TAG: ('UI', new_study_uid),
+        ACCESSION_NUMBER_TAG: ('SH', new_accession_number),
+        SERIES_INSTANCE_UID_TAG: ('UI', new_series_uid),
+        SOP_INSTANCE_UID_TAG: ('UI', new_sop_instance_uid),
+        PATIENT_ID_TAG: ('LO', "11043207"),
+        PATIENT_NAME_TAG: ('PN', "ZZTESTPATIENT^ANONYMIZED"),
+        PATIENT_BIRTH_DATE_TAG: ('DA', "19010101"),
+        INSTITUTION_NAME_TAG: ('LO', "TEST FACILITY"),
+        REFERRING_PHYSICIAN_NAME_TAG: ('PN', "TEST^PROVIDER"),
+    }
+    for tag, (vr, value) in phi_tags.items():
+        if tag not in ds:
+            ds.add_new(tag, vr, value)
+    update_tags_recursively(ds, phi_tags)
     
-    return count
+    new_uids = {
+        'study_uid': new_study_uid,
+        'accession_number': new_accession_number,
+        'series_uid': new_series_uid,
+        'sop_instance_uid': new_sop_instance_uid
+    }
+    return ds, new_uids
 
 
-def anonymize_dicom_file(input_file: str, output_file: str) -> Tuple[bool, str, dict]:
+def anonymize_dicom_file(input_file: str, output_file: str) -> Tuple[bool, str, dict, Optional[Dataset]]:
     """
     Anonymize a DICOM file by updating all PHI tags.
     
     Returns:
-        Tuple of (success, message, new_uids_dict)
+        Tuple of (success, message, new_uids_dict, anonymized_dataset)
     """
     try:
         print(f"\n{'='*60}")
@@ -67,109 +101,55 @@ def anonymize_dicom_file(input_file: str, output_file: str) -> Tuple[bool, str,
         print(f"{'='*60}")
         
         # Use load_dataset for proper encoding consistency
-        from pathlib import Path
         ds = load_dataset(Path(input_file))
         print(f"  [OK] File read successfully: {os.path.basename(input_file)}")
         
-        # Generate new unique identifiers
-        new_study_uid = generate_uid()
-        new_accession_number = generate_accession_number()
-        new_series_uid = generate_uid()
-        new_sop_instance_uid = generate_uid()
-        
-        print(f"  [OK] Generated new StudyInstanceUID: {new_study_uid}")
-        
-        # Update UIDs (including nested sequences)
-        if (0x0020, 0x000d) not in ds:
-            ds.add_new((0x0020, 0x000d), 'UI', new_study_uid)
-        update_tag_recursively(ds, (0x0020, 0x000d), new_study_uid, 'UI')
-        
-        if (0x0008, 0x0050) not in ds:
-            ds.add_new((0x0008, 0x0050), 'SH', new_accession_number)
-        update_tag_recursively(ds, (0x0008, 0x0050), new_accession_number, 'SH')
-        
-        if (0x0020, 0x000e) not in ds:
-            ds.add_new((0x0020, 0x000e), 'UI', new_series_uid)
-        update_tag_recursively(ds, (0x0020, 0x000e), new_series_uid, 'UI')
-        
-        if (0x0008, 0x0018) not in ds:
-            ds.add_new((0x0008, 0x0018), 'UI', new_sop_instance_uid)
-        update_tag_recursively(ds, (0x0008, 0x0018), new_sop_instance_uid, 'UI')
+        ds, new_uids = anonymize_dicom_dataset(ds)
         
-        # Anonymize patient demographics
-        if (0x0010, 0x0020) not in ds:
-            ds.add_new((0x0010, 0x0020), 'LO', "11043207")
-        update_tag_recursively(ds, (0x0010, 0x0020), "11043207", 'LO')
-        
-        if (0x0010, 0x0010) not in ds:
-            ds.add_new((0x0010, 0x0010), 'PN', "ZZTESTPATIENT^ANONYMIZED")
-        update_tag_recursively(ds, (0x0010, 0x0010), "ZZTESTPATIENT^ANONYMIZED", 'PN')
-        
-        if (0x0010, 0x0030) not in ds:
-            ds.add_new((0x0010, 0x0030), 'DA', "19010101")
-        update_tag_recursively(ds, (0x0010, 0x0030), "19010101", 'DA')
-        
-        if (0x0008, 0x0080) not in ds:
-            ds.add_new((0x0008, 0x0080), 'LO', "TEST FACILITY")
-        update_tag_recursively(ds, (0x0008, 0x0080), "TEST FACILITY", 'LO')
-        
-        if (0x0008, 0x0090) not in ds:
-            ds.add_new((0x0008, 0x0090), 'PN', "TEST^PROVIDER")
-        update_tag_recursively(ds, (0x0008, 0x0090), "TEST^PROVIDER", 'PN')
-        
-        # Save anonymized file with proper encoding
-        # Determine encoding based on transfer syntax
-        transfer_syntax = str(ds.file_meta.TransferSyntaxUID) if hasattr(ds, 'file_meta') and hasattr(ds.file_meta, 'TransferSyntaxUID') else '1.2.840.10008.1.2.1'
-        
-        if transfer_syntax == '1.2.840.10008.1.2':  # Implicit VR Little Endian
-            ds.save_as(output_file, implicit_vr=True, little_endian=True)
-        elif transfer_syntax == '1.2.840.10008.1.2.2':  # Explicit VR Big Endian
-            ds.save_as(output_file, implicit_vr=False, little_endian=False)
-        else:  # Explicit VR Little Endian (default)
-            ds.save_as(output_file, implicit_vr=False, little_endian=True)
+        # Save anonymized file with the encoding its transfer syntax requires,
+        # as one large buffered write instead of many small ones
+        implicit_vr, little_endian = save_encoding(ds)
+        with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as fp:
+            ds.save_as(fp, implicit_vr=implicit_vr, little_endian=little_endian)
         print(f"  [OK] Anonymized file saved")
         
-        new_uids = {
-            'study_uid': new_study_uid,
-            'accession_number': new_accession_number,
-            'series_uid': new_series_uid,
-            'sop_instance_uid': new_sop_instance_uid
-        }
-        
-        return True, "Successfully anonymized", new_uids
+        return True, "Successfully anonymized", new_uids, ds
         
     except Exception as e:
-        return False, f"Error during anonymization: {e}", {}
+        return False, f"Error during anonymization: {e}", {}, None
+
+
+@pytest.fixture(scope="module")
+def dicom_sender(dicom_sender):
+    """
+    Copy of the session sender that pings and sends over one shared association.
+
+    The session sender itself is untouched and keeps a fresh association per
+    send; this copy's association is released when the module finishes.
+    """
+    sender = dicom_sender.with_endpoint()
+    with sender.reusing_association():
+        yield sender
 
 
 @pytest.fixture
-def temp_anonymized_file(dicom_files):
+def anonymized_dataset(dicom_files):
     """
-    Fixture that creates an anonymized copy of the first DICOM file.
-    Cleans up after test completes.
+    Fixture that yields an anonymized in-memory copy of the first DICOM file.
     """
-    # Create temp directory
-    temp_dir = tempfile.mkdtemp(prefix="test_anon_")
-    anonymized_path = os.path.join(temp_dir, "anonymized.dcm")
-    
-    # Anonymize the first file
-    success, message, uids = anonymize_dicom_file(str(dicom_files[0]), anonymized_path)
-    
-    if not success:
-        shutil.rmtree(temp_dir)
-        pytest.fail(f"Failed to create anonymized file: {message}")
-    
-    yield anonymized_path, uids
-    
-    # Cleanup
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
+    print(f"\n{'='*60}")
+    print("STEP 1: ANONYMIZING DICOM DATASET")
+    print(f"{'='*60}")
+    ds = load_dataset(dicom_files[0])
+    print(f"  [OK] File read successfully: {dicom_files[0].name}")
+    ds, uids = anonymize_dicom_dataset(ds)
+    yield ds, uids
 
 
 @pytest.mark.integration
 def test_anonymize_and_send_single_file(
     dicom_sender: DicomSender,
-    temp_anonymized_file,
+    anonymized_dataset,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
@@ -182,7 +162,7 @@ def test_anonymize_and_send_single_file(
     - Compass accepts the anonymized file
     - Transmission completes successfully with acceptable latency
     """
-    anonymized_path, new_uids = temp_anonymized_file
+    ds, new_uids = anonymized_dataset
     
     print(f"\n{'='*60}")
     print("STEP 2: SENDING TO COMPASS SERVER")
@@ -193,10 +173,7 @@ def test_anonymize_and_send_single_file(
     assert dicom_sender.ping(timeout_seconds=10), "Compass did not respond to C-ECHO ping"
     print("  [OK] Compass server is reachable")
     
-    # Load and verify the anonymized dataset
-    print(f"  Loading anonymized file...")
-    ds = dcmread(anonymized_path)
-    
+    # Verify the anonymized dataset (the in-memory copy that was written to disk)
     # Verify anonymization was successful
     assert str(ds.StudyInstanceUID) == new_uids['study_uid'], "StudyInstanceUID mismatch"
     assert str(ds.PatientName) == "ZZTESTPATIENT^ANONYMIZED", "PatientName not anonymized"
@@ -229,7 +206,6 @@ def test_anonymize_and_send_single_file(
     print(f"  [OK] Average latency: {latency:.2f} ms")
     
     # C-FIND verification (uses C-FIND against IM server; see [CFIND VERIFY] logs)
-    from tests.conftest import verify_study_arrived
     print(f"\n{'='*60}")
     print("STEP 4: C-FIND VERIFICATION (querying C-FIND server for study)")
     print(f"{'='*60}")
@@ -279,19 +255,18 @@ def test_anonymize_and_send_from_shared_drive(
         pytest.fail(f"Input file does not exist: {input_file}")
     
     # Create temp directory for anonymized file
-    temp_dir = tempfile.mkdtemp(prefix="test_shared_")
+    temp_dir = tempfile.mkdtemp(prefix="test_shared_", dir=_TEMP_ROOT)
     anonymized_path = os.path.join(temp_dir, "anonymized.dcm")
     
     try:
         # Step 1: Anonymize
-        success, message, new_uids = anonymize_dicom_file(input_file, anonymized_path)
+        success, message, new_uids, ds = anonymize_dicom_file(input_file, anonymized_path)
         assert success, f"Anonymization failed: {message}"
         
         # Step 2: Verify connectivity
         assert dicom_sender.ping(), "Compass did not respond to C-ECHO ping"
         
         # Step 3: Send to Compass
-        ds = dcmread(anonymized_path)
         dicom_sender._send_single_dataset(ds, metrics)
         
         # Step 4: Verify success
@@ -302,7 +277,6 @@ def test_anonymize_and_send_from_shared_drive(
         print(f"\n[SUCCESS] Test passed. Metrics: {snapshot}")
 
         # C-FIND verification
-        from tests.conftest import verify_study_arrived
         expected_uid = new_uids['study_uid']
         study = verify_study_arrived(
             cfind_client, expected_uid, perf_config, patient_id="11043207"
@@ -338,8 +312,6 @@ def test_cfind_verification_fails_for_wrong_study_uid(
     if cfind_client is None:
         pytest.skip("C-FIND verification disabled (CFIND_VERIFY=false); cannot run negative C-FIND test")
 
-    from tests.conftest import verify_study_arrived
-
     wrong_study_uid = "1.2.3.99999.nonexistent.wrong.study.uid"
     print(f"\n[CFIND NEGATIVE] Querying for non-existent study: {wrong_study_uid}")
     print("[CFIND NEGATIVE] Expecting C-FIND to return no match and assertion to fail...")
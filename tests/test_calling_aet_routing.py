@@ -6,12 +6,24 @@ Tests that validate Compass correctly handles and routes studies to different ca
 
 from __future__ import annotations
 
+import copy
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import cycle
+
 import pytest
-from pydicom.uid import generate_uid
+from pydicom.dataelem import DataElement
+from pydicom.tag import Tag
 
-from data_loader import load_dataset
+from dicom_sender import DicomSender
 from metrics import PerfMetrics
-from tests.conftest import manual_verification_required, verify_study_arrived
+from tests.conftest import (
+    get_files_by_modality,
+    manual_verification_required,
+    patient_id_of,
+    uid_sequence,
+    verify_study_arrived,
+)
 
 
 # ============================================================================
@@ -44,6 +56,17 @@ CALLED_AET_TEST_CASES = [
     # },
 ]
 
+# Just the AE titles, in test-case order
+CALLED_AETS = tuple(tc['aet'] for tc in CALLED_AET_TEST_CASES)
+
+
+STUDY_DESCRIPTION_TAG = Tag(0x0008, 0x1030)
+
+
+def set_study_description(ds, value: str) -> None:
+    """Set StudyDescription, replacing or adding the element in one write."""
+    ds[STUDY_DESCRIPTION_TAG] = DataElement(STUDY_DESCRIPTION_TAG, 'LO', value)
+
 
 # ============================================================================
 # Individual Called AET Tests
@@ -54,10 +77,12 @@ CALLED_AET_TEST_CASES = [
 def test_called_aet_routing(
     test_case: dict,
     single_dicom_file,
+    new_study_dataset,
     dicom_sender,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
+    console,
 ):
     """
     Test that Compass accepts and correctly routes studies to different called AE Titles.
@@ -74,71 +99,55 @@ def test_called_aet_routing(
     """
     called_aet = test_case['aet']
 
-    print(f"\n{'='*70}")
-    print(f"TEST: Called AET = {called_aet}")
-    print(f"{'='*70}")
-    print(f"Description: {test_case['description']}")
-
-    # Load base file
-    ds = load_dataset(single_dicom_file)
+    console.line(f"\n{'='*70}")
+    console.line(f"TEST: Called AET = {called_aet}")
+    console.line(f"{'='*70}")
+    console.line(f"Description: {test_case['description']}")
 
-    # Generate unique study UID for this test
-    test_study_uid = generate_uid()
-    test_series_uid = generate_uid()
-    test_sop_uid = generate_uid()
-
-    ds.StudyInstanceUID = test_study_uid
-    ds.SeriesInstanceUID = test_series_uid
-    ds.SOPInstanceUID = test_sop_uid
+    # Copy of the session-parsed file with unique UIDs for this test
+    ds = new_study_dataset(single_dicom_file)
+    test_study_uid = ds.StudyInstanceUID
 
     # Add marker in StudyDescription for easy identification
     study_desc = f"AET_TEST_{called_aet}"
-    if hasattr(ds, 'StudyDescription'):
-        ds.StudyDescription = study_desc
-    else:
-        ds.add_new((0x0008, 0x1030), 'LO', study_desc)
-
-    print(f"\n[TEST IDENTIFIERS]")
-    print(f"  StudyInstanceUID: {test_study_uid}")
-    print(f"  StudyDescription: {ds.StudyDescription}")
-    print(f"  Called AE Title: {called_aet}")
-
-    # Override the remote AE title (called AET)
-    original_aet = dicom_sender.endpoint.remote_ae_title
-    dicom_sender.endpoint.remote_ae_title = called_aet
-
-    try:
-        # Send to Compass
-        print(f"\n[SENDING]")
-        print(f"  From (Calling AET): {dicom_sender.endpoint.local_ae_title}")
-        print(f"  To (Called AET): {called_aet}")
-        print(f"  Host: {dicom_sender.endpoint.host}:{dicom_sender.endpoint.port}")
-
-        dicom_sender._send_single_dataset(ds, metrics)
-
-        # Verify send succeeded
-        assert metrics.successes == 1, \
-            f"Send failed to {called_aet}: {metrics.failures} failures, " \
-            f"error rate: {metrics.error_rate:.1%}"
-
-        print(f"  Status: SUCCESS")
-        print(f"  Latency: {metrics.avg_latency_ms:.2f}ms")
-
-        # C-FIND verification
-        print(f"\n[C-FIND VERIFICATION]")
-        patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
-        study = verify_study_arrived(cfind_client, test_study_uid, perf_config, patient_id=patient_id)
-        if study is not None:
-            returned_uid = study.get('StudyInstanceUID', '')
-            assert returned_uid == test_study_uid, (
-                f"StudyInstanceUID mismatch: expected '{test_study_uid}', "
-                f"got '{returned_uid}'"
-            )
-            print(f"  [OK] Study CONFIRMED in Compass for called AET: {called_aet}")
-
-    finally:
-        # Restore original AE title
-        dicom_sender.endpoint.remote_ae_title = original_aet
+    set_study_description(ds, study_desc)
+
+    console.line(f"\n[TEST IDENTIFIERS]")
+    console.line(f"  StudyInstanceUID: {test_study_uid}")
+    console.line(f"  StudyDescription: {ds.StudyDescription}")
+    console.line(f"  Called AE Title: {called_aet}")
+
+    # Sender for the called AET under test
+    sender = dicom_sender.with_endpoint(remote_ae_title=called_aet)
+
+    # Send to Compass
+    console.line(f"\n[SENDING]")
+    console.line(f"  From (Calling AET): {sender.endpoint.local_ae_title}")
+    console.line(f"  To (Called AET): {called_aet}")
+    console.line(f"  Host: {sender.endpoint.host}:{sender.endpoint.port}")
+
+    sender._send_single_dataset(ds, metrics)
+
+    # Verify send succeeded
+    assert metrics.successes == 1, \
+        f"Send failed to {called_aet}: {metrics.failures} failures, " \
+        f"error rate: {metrics.error_rate:.1%}"
+
+    console.line(f"  Status: SUCCESS")
+    console.line(f"  Latency: {metrics.avg_latency_ms:.2f}ms")
+
+    # C-FIND verification
+    console.line(f"\n[C-FIND VERIFICATION]")
+    console.flush()
+    patient_id = patient_id_of(ds)
+    study = verify_study_arrived(cfind_client, test_study_uid, perf_config, patient_id=patient_id)
+    if study is not None:
+        returned_uid = study.get('StudyInstanceUID', '')
+        assert returned_uid == test_study_uid, (
+            f"StudyInstanceUID mismatch: expected '{test_study_uid}', "
+            f"got '{returned_uid}'"
+        )
+        console.line(f"  [OK] Study CONFIRMED in Compass for called AET: {called_aet}")
 
 
 # ============================================================================
@@ -180,9 +189,10 @@ def test_all_called_aets_summary():
 @pytest.mark.integration
 def test_multiple_aets_batch_send(
     small_dicom_files,
+    new_study_dataset,
     dicom_sender,
-    cfind_client,
-    perf_config,
+    verifier,
+    console,
 ):
     """
     Advanced test: Send multiple files to multiple different called AETs.
@@ -195,101 +205,103 @@ def test_multiple_aets_batch_send(
     - Multiple destinations can receive studies
     - Each destination's studies are tracked independently
     """
-    from itertools import cycle
-
-    print(f"\n{'='*70}")
-    print(f"BATCH TEST: Multiple Files with Rotating Called AETs")
-    print(f"{'='*70}")
-    print(f"  Files to send: {len(small_dicom_files)}")
-    print(f"  Called AETs: {len(CALLED_AET_TEST_CASES)}")
-
-    # Cycle through called AETs for each file
-    aet_cycle = cycle([tc['aet'] for tc in CALLED_AET_TEST_CASES])
-
-    results = []
-    original_aet = dicom_sender.endpoint.remote_ae_title
-
-    print(f"\n[SENDING]")
-
-    try:
-        for i, file in enumerate(small_dicom_files):
-            called_aet = next(aet_cycle)
-            metrics = PerfMetrics()
-
-            # Load and modify file
-            ds = load_dataset(file)
-            ds.StudyInstanceUID = generate_uid()
-            ds.SeriesInstanceUID = generate_uid()
-            ds.SOPInstanceUID = generate_uid()
-
-            # Set called AET
-            dicom_sender.endpoint.remote_ae_title = called_aet
-
-            # Send
-            dicom_sender._send_single_dataset(ds, metrics)
-
-            # Track results
-            result = {
+    console.line(f"\n{'='*70}")
+    console.line(f"BATCH TEST: Multiple Files with Rotating Called AETs")
+    console.line(f"{'='*70}")
+    console.line(f"  Files to send: {len(small_dicom_files)}")
+    console.line(f"  Called AETs: {len(CALLED_AETS)}")
+
+    # Prepare every file with its called AET (cycling through the AETs), then
+    # bucket by AET so each destination gets one association carrying all of
+    # its C-STOREs
+    prepared = []
+    by_aet: dict = {}
+    for i, (file, called_aet) in enumerate(zip(small_dicom_files, cycle(CALLED_AETS))):
+        ds = new_study_dataset(file)
+        prepared.append((file, called_aet, ds))
+        by_aet.setdefault(called_aet, []).append(i)
+
+    results = [None] * len(prepared)
+
+    console.line(f"\n[SENDING]")
+
+    for called_aet, indices in by_aet.items():
+        metrics = PerfMetrics()
+        dicom_sender._send_batch_on_association(
+            [prepared[i][2] for i in indices], called_aet, metrics
+        )
+
+        # Track results (one sample per dataset, in send order)
+        for i, sample in zip(indices, metrics.samples):
+            file, _, ds = prepared[i]
+            results[i] = {
                 'file': file.name,
                 'called_aet': called_aet,
                 'study_uid': ds.StudyInstanceUID,
-                'patient_id': str(ds.PatientID) if hasattr(ds, 'PatientID') else None,
-                'success': metrics.successes == 1,
-                'latency': metrics.avg_latency_ms
+                'patient_id': patient_id_of(ds),
+                'success': sample.success,
+                'latency': sample.latency_ms
             }
-            results.append(result)
-
-            status = 'OK  ' if result['success'] else 'FAIL'
-            print(f"  [{i+1:2d}/{len(small_dicom_files)}] {called_aet:20} -> "
-                  f"{status} ({result['latency']:.0f}ms) | StudyUID: {ds.StudyInstanceUID[:40]}...")
-
-        # Summary
-        print(f"\n{'='*70}")
-        print(f"[RESULTS SUMMARY]")
-        print(f"{'='*70}")
-        print(f"  Total sent: {len(results)}")
-        print(f"  Successful: {sum(1 for r in results if r['success'])}")
-        print(f"  Failed: {sum(1 for r in results if not r['success'])}")
-
-        # Group by called AET
-        from collections import Counter
-        aet_counts = Counter(r['called_aet'] for r in results)
-        print(f"\n  Sends per called AET:")
-        for aet, count in sorted(aet_counts.items()):
-            successes = sum(1 for r in results if r['called_aet'] == aet and r['success'])
-            avg_latency = sum(r['latency'] for r in results if r['called_aet'] == aet) / count
-            print(f"    {aet:20} : {successes}/{count} succeeded, avg {avg_latency:.0f}ms")
-
-        # Verify all succeeded
-        failed = [r for r in results if not r['success']]
-        if failed:
-            print(f"\n  Failed sends:")
-            for r in failed:
-                print(f"    - {r['called_aet']} : {r['file']}")
-
-        assert all(r['success'] for r in results), \
-            f"Some sends failed: {len(failed)}/{len(results)}"
-
-        print(f"\n[SUCCESS: All {len(results)} sends completed successfully]")
-
-        # C-FIND verification: verify first UID per AET
-        print(f"\n[C-FIND VERIFICATION]")
-        verified_aets = set()
-        for r in results:
-            if r['called_aet'] not in verified_aets and r['success']:
-                verified_aets.add(r['called_aet'])
-                expected_uid = str(r['study_uid'])
-                study = verify_study_arrived(cfind_client, expected_uid, perf_config, patient_id=r.get('patient_id'))
-                if study is not None:
-                    returned_uid = study.get('StudyInstanceUID', '')
-                    assert returned_uid == expected_uid, (
-                        f"StudyInstanceUID mismatch for AET {r['called_aet']}: "
-                        f"expected '{expected_uid}', got '{returned_uid}'"
-                    )
-                    print(f"  [OK] Verified AET {r['called_aet']}")
-
-    finally:
-        dicom_sender.endpoint.remote_ae_title = original_aet
+
+    # One pass: print each send and fold it into per-AET
+    # [count, successes, latency_sum] plus the failed list
+    per_aet = defaultdict(lambda: [0, 0, 0.0])
+    failed = []
+    for i, result in enumerate(results):
+        status = 'OK  ' if result['success'] else 'FAIL'
+        console.line(f"  [{i+1:2d}/{len(small_dicom_files)}] {result['called_aet']:20} -> "
+              f"{status} ({result['latency']:.0f}ms) | StudyUID: {result['study_uid']}")
+        bucket = per_aet[result['called_aet']]
+        bucket[0] += 1
+        bucket[1] += result['success']
+        bucket[2] += result['latency']
+        if not result['success']:
+            failed.append(result)
+
+    # Summary
+    console.line(f"\n{'='*70}")
+    console.line(f"[RESULTS SUMMARY]")
+    console.line(f"{'='*70}")
+    console.line(f"  Total sent: {len(results)}")
+    console.line(f"  Successful: {len(results) - len(failed)}")
+    console.line(f"  Failed: {len(failed)}")
+
+    # Group by called AET
+    console.line(f"\n  Sends per called AET:")
+    for aet, (count, successes, latency_sum) in sorted(per_aet.items()):
+        console.line(f"    {aet:20} : {successes}/{count} succeeded, avg {latency_sum / count:.0f}ms")
+
+    # Verify all succeeded
+    if failed:
+        console.line(f"\n  Failed sends:")
+        for r in failed:
+            console.line(f"    - {r['called_aet']} : {r['file']}")
+
+    assert not failed, \
+        f"Some sends failed: {len(failed)}/{len(results)}"
+
+    console.line(f"\n[SUCCESS: All {len(results)} sends completed successfully]")
+
+    # C-FIND verification: verify first UID per AET, all AETs concurrently
+    console.line(f"\n[C-FIND VERIFICATION]")
+    console.flush()
+    first_per_aet = {}
+    for r in results:
+        if r['success']:
+            first_per_aet.setdefault(r['called_aet'], r)
+    to_verify = list(first_per_aet.values())
+    studies = verifier.verify_all(
+        (str(r['study_uid']), r.get('patient_id')) for r in to_verify
+    )
+    for r, study in zip(to_verify, studies):
+        if study is not None:
+            expected_uid = str(r['study_uid'])
+            returned_uid = study.get('StudyInstanceUID', '')
+            assert returned_uid == expected_uid, (
+                f"StudyInstanceUID mismatch for AET {r['called_aet']}: "
+                f"expected '{expected_uid}', got '{returned_uid}'"
+            )
+            console.line(f"  [OK] Verified AET {r['called_aet']}")
 
 
 # ============================================================================
@@ -300,8 +312,10 @@ def test_multiple_aets_batch_send(
 @pytest.mark.manual_verify
 def test_unknown_called_aet(
     single_dicom_file,
+    new_study_dataset,
     dicom_sender,
     metrics: PerfMetrics,
+    console,
 ):
     """
     Test that Compass rejects a send to an unknown/unregistered called AE Title.
@@ -312,48 +326,37 @@ def test_unknown_called_aet(
     """
     unknown_aet = 'UNKNOWN_TEST_AET'
 
-    print(f"\n{'='*70}")
-    print(f"TEST: Unknown Called AET")
-    print(f"{'='*70}")
-    print(f"  Called AET: {unknown_aet} (not registered in Compass)")
+    console.line(f"\n{'='*70}")
+    console.line(f"TEST: Unknown Called AET")
+    console.line(f"{'='*70}")
+    console.line(f"  Called AET: {unknown_aet} (not registered in Compass)")
 
-    ds = load_dataset(single_dicom_file)
-    test_study_uid = generate_uid()
-    ds.StudyInstanceUID = test_study_uid
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    ds = new_study_dataset(single_dicom_file)
+    test_study_uid = ds.StudyInstanceUID
 
     study_desc = f"UNKNOWN_AET_TEST_{unknown_aet}"
-    if hasattr(ds, 'StudyDescription'):
-        ds.StudyDescription = study_desc
-    else:
-        ds.add_new((0x0008, 0x1030), 'LO', study_desc)
-
-    print(f"  StudyInstanceUID: {test_study_uid}")
-
-    original_aet = dicom_sender.endpoint.remote_ae_title
-    dicom_sender.endpoint.remote_ae_title = unknown_aet
-
-    try:
-        print(f"\n[SENDING]")
-        dicom_sender._send_single_dataset(ds, metrics)
-
-        print(f"\n[RESULT]")
-        print(f"  Successes: {metrics.successes}, Failures: {metrics.failures}")
-
-        with manual_verification_required(
-            "Unknown called AET rejection -- verify on Compass server that "
-            f"'{unknown_aet}' is not a configured destination"
-        ):
-            assert metrics.failures >= 1, (
-                f"Compass ACCEPTED unknown called AET '{unknown_aet}' — "
-                f"expected rejection. Study {test_study_uid} may have been "
-                f"routed to an unintended destination."
-            )
-        print(f"  Compass correctly rejected unknown called AET '{unknown_aet}'")
+    set_study_description(ds, study_desc)
 
-    finally:
-        dicom_sender.endpoint.remote_ae_title = original_aet
+    console.line(f"  StudyInstanceUID: {test_study_uid}")
+
+    sender = dicom_sender.with_endpoint(remote_ae_title=unknown_aet)
+
+    console.line(f"\n[SENDING]")
+    sender._send_single_dataset(ds, metrics)
+
+    console.line(f"\n[RESULT]")
+    console.line(f"  Successes: {metrics.successes}, Failures: {metrics.failures}")
+
+    with manual_verification_required(
+        "Unknown called AET rejection -- verify on Compass server that "
+        f"'{unknown_aet}' is not a configured destination"
+    ):
+        assert metrics.failures >= 1, (
+            f"Compass ACCEPTED unknown called AET '{unknown_aet}' — "
+            f"expected rejection. Study {test_study_uid} may have been "
+            f"routed to an unintended destination."
+        )
+    console.line(f"  Compass correctly rejected unknown called AET '{unknown_aet}'")
 
 
 # ============================================================================
@@ -364,10 +367,12 @@ def test_unknown_called_aet(
 @pytest.mark.parametrize("modality", ["CT", "MR", "CR", "US", "OPV"])
 def test_called_aet_with_modality_combinations(
     dicom_by_modality: dict,
+    cached_dataset,
     dicom_sender,
     modality: str,
-    cfind_client,
     perf_config,
+    verifier,
+    console,
 ):
     """
     Test called AET routing with different modalities.
@@ -375,74 +380,76 @@ def test_called_aet_with_modality_combinations(
     Some routing rules may depend on both called AET and modality.
     This test validates that all called AETs work with all modalities.
     """
-    from tests.conftest import get_files_by_modality
-
     # Get files for this modality (will skip if not available)
     files = get_files_by_modality(dicom_by_modality, modality, count=1)
 
-    print(f"\n{'='*70}")
-    print(f"TEST: All Called AETs with Modality {modality}")
-    print(f"{'='*70}")
-
-    results = []
-    original_aet = dicom_sender.endpoint.remote_ae_title
-
-    try:
-        for test_case in CALLED_AET_TEST_CASES:
-            called_aet = test_case['aet']
-            metrics = PerfMetrics()
-
-            # Load and modify file
-            ds = load_dataset(files[0])
-            ds.Modality = modality  # Ensure modality is set
-            ds.StudyInstanceUID = generate_uid()
-            ds.SeriesInstanceUID = generate_uid()
-            ds.SOPInstanceUID = generate_uid()
-
-            # Set called AET
-            dicom_sender.endpoint.remote_ae_title = called_aet
-
-            # Send
-            dicom_sender._send_single_dataset(ds, metrics)
-
-            # Track results
-            result = {
-                'aet': called_aet,
-                'modality': modality,
-                'study_uid': ds.StudyInstanceUID,
-                'patient_id': str(ds.PatientID) if hasattr(ds, 'PatientID') else None,
-                'success': metrics.successes == 1,
-                'latency': metrics.avg_latency_ms
-            }
-            results.append(result)
-
-            status = 'OK  ' if result['success'] else 'FAIL'
-            print(f"  {called_aet:20} + {modality:3} -> {status} ({result['latency']:.0f}ms)")
-
-        # Summary
-        successful = sum(1 for r in results if r['success'])
-        print(f"\n  Results: {successful}/{len(results)} succeeded for modality {modality}")
-
-        # Verify all succeeded
-        assert all(r['success'] for r in results), \
-            f"Some AET+Modality combinations failed for {modality}"
-
-        # C-FIND verification for each send
-        print(f"\n[C-FIND VERIFICATION]")
-        for r in results:
-            if r['success']:
-                expected_uid = str(r['study_uid'])
-                study = verify_study_arrived(cfind_client, expected_uid, perf_config, patient_id=r.get('patient_id'))
-                if study is not None:
-                    returned_uid = study.get('StudyInstanceUID', '')
-                    assert returned_uid == expected_uid, (
-                        f"StudyInstanceUID mismatch for {r['aet']} + {modality}: "
-                        f"expected '{expected_uid}', got '{returned_uid}'"
-                    )
-                    print(f"  [OK] Verified {r['aet']} + {modality}")
-
-    finally:
-        dicom_sender.endpoint.remote_ae_title = original_aet
+    console.line(f"\n{'='*70}")
+    console.line(f"TEST: All Called AETs with Modality {modality}")
+    console.line(f"{'='*70}")
+
+    base_ds = cached_dataset(files[0])
+    base_ds.Modality = modality  # Ensure modality is set
+
+    def send_one(sender: DicomSender, ds, metrics: PerfMetrics) -> dict:
+        sender._send_single_dataset(ds, metrics)
+        return {
+            'aet': sender.endpoint.remote_ae_title,
+            'modality': modality,
+            'study_uid': ds.StudyInstanceUID,
+            'patient_id': patient_id_of(ds),
+            'success': metrics.successes == 1,
+            'latency': metrics.avg_latency_ms
+        }
+
+    # One sender per called AET (endpoint preset, nothing shared between
+    # workers) and one dataset copy per worker, so the AETs can be sent in
+    # parallel, up to PARALLEL_SENDS associations at once
+    by_aet = {}
+    workers = max(1, min(len(CALLED_AETS), perf_config.integration.parallel_sends))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        uids = uid_sequence()
+        for called_aet in CALLED_AETS:
+            sender = dicom_sender.with_endpoint(remote_ae_title=called_aet)
+            ds = copy.deepcopy(base_ds)
+            ds.StudyInstanceUID = next(uids)
+            ds.SeriesInstanceUID = next(uids)
+            ds.SOPInstanceUID = next(uids)
+            futures.append(executor.submit(send_one, sender, ds, PerfMetrics()))
+
+        for future in as_completed(futures):
+            result = future.result()
+            by_aet[result['aet']] = result
+
+    results = [by_aet[aet] for aet in CALLED_AETS]
+    for result in results:
+        status = 'OK  ' if result['success'] else 'FAIL'
+        console.line(f"  {result['aet']:20} + {modality:3} -> {status} ({result['latency']:.0f}ms)")
+
+    # Summary
+    successful = sum(1 for r in results if r['success'])
+    console.line(f"\n  Results: {successful}/{len(results)} succeeded for modality {modality}")
+
+    # Verify all succeeded
+    assert all(r['success'] for r in results), \
+        f"Some AET+Modality combinations failed for {modality}"
+
+    # C-FIND verification for each send
+    console.line(f"\n[C-FIND VERIFICATION]")
+    console.flush()
+    # All sends succeeded (asserted above); one batched UID-list C-FIND covers them
+    studies = verifier.verify_all(
+        (str(r['study_uid']), r.get('patient_id')) for r in results
+    )
+    for r, study in zip(results, studies):
+        if study is not None:
+            expected_uid = str(r['study_uid'])
+            returned_uid = study.get('StudyInstanceUID', '')
+            assert returned_uid == expected_uid, (
+                f"StudyInstanceUID mismatch for {r['aet']} + {modality}: "
+                f"expected '{expected_uid}', got '{returned_uid}'"
+            )
+            console.line(f"  [OK] Verified {r['aet']} + {modality}")
 
 
 # ============================================================================
@@ -6,14 +6,20 @@ Example tests demonstrating how to use test data selection fixtures for differen
 
 from __future__ import annotations
 
-import pytest
+import logging
+from itertools import islice
 from pathlib import Path
 from typing import List
 
-from pydicom.uid import generate_uid
+import pytest
 
+from data_loader import DicomFileEntry, load_dataset, prefetch
 from metrics import PerfMetrics
-from tests.conftest import verify_study_arrived
+from tests.conftest import get_files_by_modality, patient_id_of, uid_sequence, verify_study_arrived
+
+# Progress lines are logged at INFO (%-style, formatted only when enabled);
+# show them with --log-cli-level=INFO, as in test_data_validation.
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -21,20 +27,19 @@ from tests.conftest import verify_study_arrived
 # ============================================================================
 
 @pytest.mark.integration
-def test_send_large_file(dicom_sender, large_dicom_file: Path, metrics: PerfMetrics,
-                         cfind_client, perf_config):
+def test_send_large_file(dicom_sender, large_dicom_entry: DicomFileEntry, cached_dataset,
+                         metrics: PerfMetrics, cfind_client, perf_config):
     """
     Test sending a large DICOM file (>10MB).
 
     Automatically skips if no large file is available.
-    Uses the large_dicom_file fixture which selects appropriately.
+    Uses the large_dicom_entry fixture, which selects appropriately and
+    carries the size recorded at discovery.
     """
-    from data_loader import load_dataset
-
-    file_size_mb = large_dicom_file.stat().st_size / (1024 * 1024)
-    print(f"Testing with large file: {file_size_mb:.2f}MB")
+    file_size_mb = large_dicom_entry.size / (1024 * 1024)
+    logger.info("Testing with large file: %.2fMB", file_size_mb)
 
-    ds = load_dataset(large_dicom_file)
+    ds = cached_dataset(large_dicom_entry.path)
     dicom_sender._send_single_dataset(ds, metrics)
 
     assert metrics.successes == 1, "Large file send failed"
@@ -44,10 +49,11 @@ def test_send_large_file(dicom_sender, large_dicom_file: Path, metrics: PerfMetr
     assert metrics.avg_latency_ms < 10000, f"Large file took too long: {metrics.avg_latency_ms}ms"
 
     # C-FIND verification
-    study_uid = str(ds.StudyInstanceUID) if hasattr(ds, 'StudyInstanceUID') else None
+    study_uid = ds.get('StudyInstanceUID')
     if study_uid:
-        patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
-        verify_study_arrived(cfind_client, study_uid, perf_config, patient_id=patient_id)
+        verify_study_arrived(
+            cfind_client, str(study_uid), perf_config, patient_id=patient_id_of(ds)
+        )
 
 
 # ============================================================================
@@ -55,35 +61,40 @@ def test_send_large_file(dicom_sender, large_dicom_file: Path, metrics: PerfMetr
 # ============================================================================
 
 @pytest.mark.integration
-def test_send_batch_small_files(dicom_sender, small_dicom_files: List[Path], metrics: PerfMetrics,
-                                cfind_client, perf_config):
+def test_send_batch_small_files(dicom_sender, small_dicom_files: List[Path], cached_dataset,
+                                metrics: PerfMetrics, verifier, perf_config):
     """
     Test sending a batch of small files (<1MB each).
 
     Automatically skips if fewer than 3 small files available.
-    Returns up to 10 small files from the dataset.
+    Returns up to 10 small files from the dataset. Files are loaded by
+    data_loader.prefetch so parsing overlaps with the sends.
     """
-    from data_loader import load_dataset
-
-    print(f"Sending batch of {len(small_dicom_files)} small files...")
+    logger.info("Sending batch of %d small files...", len(small_dicom_files))
 
     uid_to_patient: dict = {}
-    for file in small_dicom_files:
-        ds = load_dataset(file)
-        dicom_sender._send_single_dataset(ds, metrics)
-        if hasattr(ds, 'StudyInstanceUID'):
-            uid = str(ds.StudyInstanceUID)
-            uid_to_patient[uid] = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+
+    def load(file: Path):
+        ds = cached_dataset(file)
+        uid = ds.get('StudyInstanceUID')
+        if uid is not None:
+            uid_to_patient[str(uid)] = patient_id_of(ds)
+        return ds
+
+    # Parse the next files in the background while earlier ones are sent
+    dicom_sender.send_datasets(
+        prefetch(load(file) for file in small_dicom_files), metrics,
+        concurrency=perf_config.integration.parallel_sends,
+    )
 
     expected_count = len(small_dicom_files)
     assert metrics.total == expected_count, f"Expected {expected_count} sends, got {metrics.total}"
     assert metrics.error_rate == 0, f"Some sends failed: {metrics.failures} failures"
 
-    print(f"Successfully sent {metrics.successes} files")
+    logger.info("Successfully sent %d files", metrics.successes)
 
-    # C-FIND verification (sample up to 5)
-    for uid in list(uid_to_patient.keys())[:5]:
-        verify_study_arrived(cfind_client, uid, perf_config, patient_id=uid_to_patient[uid])
+    # C-FIND verification (sample up to 5, polled concurrently)
+    verifier.verify_all(islice(uid_to_patient.items(), 5))
 
 
 # ============================================================================
@@ -95,9 +106,10 @@ def test_send_batch_small_files(dicom_sender, small_dicom_files: List[Path], met
 def test_send_by_modality(
     dicom_sender,
     dicom_by_modality: dict,
+    cached_dataset,
     metrics: PerfMetrics,
     modality: str,
-    cfind_client,
+    verifier,
     perf_config,
 ):
     """
@@ -106,30 +118,29 @@ def test_send_by_modality(
     Parametrized to run for CT, MR, CR, and US.
     Gracefully skips if a particular modality is not available.
     """
-    from data_loader import load_dataset
-    from tests.conftest import get_files_by_modality
-
     # This will skip if modality not available
     files = get_files_by_modality(dicom_by_modality, modality, count=3)
 
-    print(f"Testing {modality} modality with {len(files)} files")
+    logger.info("Testing %s modality with %d files", modality, len(files))
+
+    datasets = [cached_dataset(file) for file in files]
+    dicom_sender.send_datasets(
+        datasets, metrics, concurrency=perf_config.integration.parallel_sends
+    )
 
     uid_to_patient: dict = {}
-    for file in files:
-        ds = load_dataset(file)
-        dicom_sender._send_single_dataset(ds, metrics)
-        if hasattr(ds, 'StudyInstanceUID'):
-            uid = str(ds.StudyInstanceUID)
-            uid_to_patient[uid] = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+    for ds in datasets:
+        uid = ds.get('StudyInstanceUID')
+        if uid is not None:
+            uid_to_patient[str(uid)] = patient_id_of(ds)
 
     assert metrics.successes == len(files), f"{modality}: Some sends failed"
     assert metrics.error_rate == 0, f"{modality}: Error rate too high"
 
-    print(f"{modality}: All {len(files)} files sent successfully")
+    logger.info("%s: All %d files sent successfully", modality, len(files))
 
-    # C-FIND verification (sample up to 3)
-    for uid in list(uid_to_patient.keys())[:3]:
-        verify_study_arrived(cfind_client, uid, perf_config, patient_id=uid_to_patient[uid])
+    # C-FIND verification (sample up to 3, polled concurrently)
+    verifier.verify_all(islice(uid_to_patient.items(), 3))
 
 
 # ============================================================================
@@ -141,7 +152,9 @@ def test_send_by_modality(
 def test_send_variable_batch_sizes(
     dicom_sender,
     dicom_file_subset: List[Path],
-    metrics: PerfMetrics
+    cached_dataset,
+    metrics: PerfMetrics,
+    perf_config,
 ):
     """
     Test sending different batch sizes (1, 5, 10 files).
@@ -149,20 +162,18 @@ def test_send_variable_batch_sizes(
     Uses indirect parametrization to pass count to fixture.
     Automatically skips if not enough files available.
     """
-    from data_loader import load_dataset
-    
     batch_size = len(dicom_file_subset)
-    print(f"Testing batch size: {batch_size}")
+    logger.info("Testing batch size: %d", batch_size)
     
-    for file in dicom_file_subset:
-        ds = load_dataset(file)
-        dicom_sender._send_single_dataset(ds, metrics)
+    dicom_sender.send_datasets(
+        (cached_dataset(file) for file in dicom_file_subset), metrics,
+        concurrency=perf_config.integration.parallel_sends,
+    )
     
     assert metrics.total == batch_size
     assert metrics.error_rate == 0
     
-    avg_latency = metrics.avg_latency_ms
-    print(f"Batch of {batch_size}: avg latency {avg_latency:.2f}ms")
+    logger.info("Batch of %d: avg C-STORE latency %.2fms", batch_size, metrics.avg_latency_ms)
 
 
 # ============================================================================
@@ -172,6 +183,9 @@ def test_send_variable_batch_sizes(
 # Minimum number of images in one study to consider "large" for this test
 _STUDY_LARGE_IMAGE_COUNT = 20
 
+# Values above this size stay on disk until the dataset is encoded for sending
+_STUDY_DEFER_SIZE = "1 KB"
+
 
 @pytest.mark.integration
 def test_send_one_study_with_many_images(
@@ -187,9 +201,10 @@ def test_send_one_study_with_many_images(
     Verifies Compass accepts and stores one study with many instances.
     Uses small files from the dataset to keep runtime reasonable.
     Skips if fewer than _STUDY_LARGE_IMAGE_COUNT files are available.
-    """
-    from data_loader import load_dataset
 
+    Each file is loaded once with deferred reads and only its UIDs are
+    rewritten, so PixelData is never copied in memory before the send.
+    """
     if len(dicom_files) < _STUDY_LARGE_IMAGE_COUNT:
         pytest.skip(
             f"Need at least {_STUDY_LARGE_IMAGE_COUNT} DICOM files, found {len(dicom_files)}"
@@ -197,17 +212,18 @@ def test_send_one_study_with_many_images(
 
     # Use first N files (prefer smaller for speed; take first N from sorted list)
     test_files = dicom_files[:_STUDY_LARGE_IMAGE_COUNT]
-    study_uid = generate_uid()
+    uids = uid_sequence()
+    study_uid = next(uids)
 
-    print(f"\nSending one study with {len(test_files)} images (StudyInstanceUID: {study_uid[:40]}...)")
+    logger.info("Sending one study with %d images (StudyInstanceUID: %s)", len(test_files), study_uid)
 
     last_patient_id = None
     for i, file in enumerate(test_files, 1):
-        ds = load_dataset(file)
+        ds = load_dataset(file, defer_size=_STUDY_DEFER_SIZE)
         ds.StudyInstanceUID = study_uid
-        ds.SeriesInstanceUID = generate_uid()
-        ds.SOPInstanceUID = generate_uid()
-        last_patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+        ds.SeriesInstanceUID = next(uids)
+        ds.SOPInstanceUID = next(uids)
+        last_patient_id = patient_id_of(ds)
         dicom_sender._send_single_dataset(ds, metrics)
 
     assert metrics.total == len(test_files), f"Expected {len(test_files)} sends, got {metrics.total}"
@@ -224,9 +240,9 @@ def test_send_one_study_with_many_images(
         assert count >= len(test_files), (
             f"Expected >= {len(test_files)} instances in study, C-FIND returned {count}"
         )
-        print(f"  [OK] NumberOfStudyRelatedInstances: {count}")
+        logger.info("[OK] NumberOfStudyRelatedInstances: %d", count)
 
-    print(f"[SUCCESS] One study with {len(test_files)} images sent and verified")
+    logger.info("[SUCCESS] One study with %d images sent and verified", len(test_files))
 
 
 # ============================================================================
@@ -234,21 +250,30 @@ def test_send_one_study_with_many_images(
 # ============================================================================
 
 @pytest.mark.integration
-@pytest.mark.parametrize("size_category", ["small", "medium", "large"])
+@pytest.mark.parametrize(
+    "size_category,max_latency",
+    [
+        ("small", 1000),    # 1 second
+        ("medium", 3000),   # 3 seconds
+        ("large", 10000),   # 10 seconds
+    ],
+)
 def test_send_by_size_category(
     dicom_sender,
     dicom_by_size_category: dict,
+    cached_dataset,
     metrics: PerfMetrics,
-    size_category: str
+    size_category: str,
+    max_latency: int,
 ):
     """
     Test sending files from different size categories.
     
-    Categories: small (<1MB), medium (1-10MB), large (>10MB)
+    Categories: small (<1MB), medium (1-10MB), large (>10MB), each with its
+    own average-latency threshold in ms, measured per file from association
+    to C-STORE response.
     Gracefully skips if category has no files.
     """
-    from data_loader import load_dataset
-    
     files = dicom_by_size_category.get(size_category, [])
     
     if not files:
@@ -256,22 +281,15 @@ def test_send_by_size_category(
     
     # Test with up to 3 files from this category
     test_files = files[:3]
-    print(f"Testing {size_category} category with {len(test_files)} files")
+    logger.info("Testing %s category with %d files", size_category, len(test_files))
     
+    # One association per file: the thresholds cover handshake + C-STORE,
+    # which send_datasets' samples (C-STORE only) would not.
     for file in test_files:
-        ds = load_dataset(file)
-        dicom_sender._send_single_dataset(ds, metrics)
+        dicom_sender._send_single_dataset(cached_dataset(file), metrics)
     
     assert metrics.successes == len(test_files)
     
-    # Different latency expectations by size
-    latency_thresholds = {
-        'small': 1000,   # 1 second
-        'medium': 3000,  # 3 seconds
-        'large': 10000   # 10 seconds
-    }
-    
-    max_latency = latency_thresholds[size_category]
     assert metrics.avg_latency_ms < max_latency, \
         f"{size_category} files exceeded latency threshold"
 
@@ -281,24 +299,22 @@ def test_send_by_size_category(
 # ============================================================================
 
 @pytest.mark.integration
-def test_single_file_basic(dicom_sender, single_dicom_file: Path, metrics: PerfMetrics):
+def test_single_file_basic(dicom_sender, single_dicom_file: Path, cached_dataset, metrics: PerfMetrics):
     """
     Basic test with a single file - simplest case.
     
     Uses single_dicom_file fixture which just picks any available file.
     Good for smoke tests or basic connectivity checks.
     """
-    from data_loader import load_dataset
+    logger.info("Testing with file: %s", single_dicom_file.name)
     
-    print(f"Testing with file: {single_dicom_file.name}")
-    
-    ds = load_dataset(single_dicom_file)
+    ds = cached_dataset(single_dicom_file)
     dicom_sender._send_single_dataset(ds, metrics)
     
     assert metrics.successes == 1, "Basic send failed"
     assert metrics.error_rate == 0, "Error occurred"
     
-    print("Basic send test passed")
+    logger.info("Basic send test passed")
 
 
 # ============================================================================
@@ -306,29 +322,30 @@ def test_single_file_basic(dicom_sender, single_dicom_file: Path, metrics: PerfM
 # ============================================================================
 
 @pytest.mark.integration
-def test_all_available_modalities(dicom_sender, dicom_by_modality: dict, metrics: PerfMetrics):
+def test_all_available_modalities(dicom_sender, dicom_by_modality: dict, cached_dataset,
+                                  metrics: PerfMetrics, perf_config):
     """
     Test all modalities that are available in the dataset.
     
     Dynamically adapts to whatever modalities are present.
     Won't skip - will test whatever is available.
     """
-    from data_loader import load_dataset
-    
     if not dicom_by_modality:
         pytest.skip("No DICOM files with readable modality available")
     
     results = {}
+    modality_metrics = PerfMetrics()  # Reset per modality
     
     for modality, files in dicom_by_modality.items():
-        modality_metrics = PerfMetrics()  # Separate metrics per modality
+        modality_metrics.reset()
         
         # Test first 2 files of each modality
         test_files = files[:2]
         
-        for file in test_files:
-            ds = load_dataset(file)
-            dicom_sender._send_single_dataset(ds, modality_metrics)
+        dicom_sender.send_datasets(
+            (cached_dataset(file) for file in test_files), modality_metrics,
+            concurrency=perf_config.integration.parallel_sends,
+        )
         
         results[modality] = {
             'count': len(test_files),
@@ -337,11 +354,13 @@ def test_all_available_modalities(dicom_sender, dicom_by_modality: dict, metrics
             'avg_latency': modality_metrics.avg_latency_ms
         }
     
-    print("\nResults by modality:")
-    for modality, result in results.items():
-        latency_str = f"{result['avg_latency']:.2f}ms" if result['avg_latency'] is not None else "N/A"
-        print(f"  {modality}: {result['successes']}/{result['count']} succeeded, "
-              f"avg latency {latency_str}")
+    if logger.isEnabledFor(logging.INFO):
+        lines = ["Results by modality:"]
+        for modality, result in results.items():
+            latency_str = f"{result['avg_latency']:.2f}ms" if result['avg_latency'] is not None else "N/A"
+            lines.append(f"  {modality}: {result['successes']}/{result['count']} succeeded, "
+                         f"avg latency {latency_str}")
+        logger.info("\n".join(lines))
     
     # Overall assertion
     failed_modalities = {
@@ -6,18 +6,63 @@ Tests that validate Compass data handling including blank fields, accession numb
 
 from __future__ import annotations
 
-import os
-import tempfile
-import time
+import logging
+from io import BytesIO
 from pathlib import Path
 
 import pytest
+from pydicom import config as pydicom_config
 from pydicom import dcmread
-from pydicom.uid import generate_uid
 
-from data_loader import load_dataset
+from data_loader import save_encoding
 from metrics import PerfMetrics
-from tests.conftest import manual_verification_required, verify_study_arrived
+from tests.conftest import (
+    manual_verification_required,
+    next_accession_number,
+    patient_id_of,
+    verify_study_arrived,
+)
+
+# Test progress is logged at INFO (%-style, formatted only when enabled); show
+# it with --log-cli-level=INFO.
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="module")
+def dicom_sender(dicom_sender):
+    """
+    Copy of the session sender that keeps one association open for this module.
+
+    Every test here sends one dataset at a time to the default endpoint, so
+    the C-STOREs share an association instead of negotiating one per test.
+    The session sender itself is untouched; tests that need other AE titles
+    still get a fresh sender from with_endpoint().
+
+    Fails fast with a C-ECHO on that association if Compass is unreachable.
+    """
+    sender = dicom_sender.with_endpoint()
+    with sender.reusing_association():
+        assert sender.ping(timeout_seconds=10), "Compass not reachable"
+        yield sender
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _skip_pydicom_validation():
+    """
+    Turn off pydicom's value checks (VR length, charset, UID format) for this module.
+
+    These tests build out-of-spec values on purpose (e.g. a 100-character
+    AccessionNumber) to see how Compass handles them, so the per-assignment
+    checks only cost time and warnings. Such tests must assert on the send
+    status or C-FIND result; pydicom no longer flags the value locally.
+    The previous modes are restored when the module finishes.
+    """
+    settings = pydicom_config.settings
+    saved = (settings.reading_validation_mode, settings.writing_validation_mode)
+    settings.reading_validation_mode = pydicom_config.IGNORE
+    settings.writing_validation_mode = pydicom_config.IGNORE
+    yield
+    settings.reading_validation_mode, settings.writing_validation_mode = saved
 
 
 # ============================================================================
@@ -29,6 +74,7 @@ from tests.conftest import manual_verification_required, verify_study_arrived
 def test_populate_blank_study_date(
     dicom_sender,
     single_dicom_file: Path,
+    new_study_dataset,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
@@ -47,12 +93,7 @@ def test_populate_blank_study_date(
     3. Send to Compass
     4. C-FIND verification: Query for study and check date was populated
     """
-    ds = load_dataset(single_dicom_file)
-    
-    # Generate unique UIDs for tracking
-    ds.StudyInstanceUID = generate_uid()
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    ds = new_study_dataset(single_dicom_file)
     
     # Store original dates for reference
     original_acquisition_date = ds.AcquisitionDate if hasattr(ds, 'AcquisitionDate') else None
@@ -67,46 +108,42 @@ def test_populate_blank_study_date(
     if had_study_time:
         del ds.StudyTime
     
-    print(f"\n{'='*70}")
-    print(f"BLANK STUDY DATE TEST")
-    print(f"{'='*70}")
-    print(f"  StudyInstanceUID: {ds.StudyInstanceUID}")
-    print(f"  Original had StudyDate: {had_study_date}")
-    print(f"  Original had StudyTime: {had_study_time}")
-    print(f"  AcquisitionDate: {original_acquisition_date}")
-    print(f"  AcquisitionTime: {original_acquisition_time}")
-    print(f"\n  Removed StudyDate and StudyTime before sending...")
+    logger.info("BLANK STUDY DATE TEST")
+    logger.info("StudyInstanceUID: %s", ds.StudyInstanceUID)
+    logger.info("Original had StudyDate: %s", had_study_date)
+    logger.info("Original had StudyTime: %s", had_study_time)
+    logger.info("AcquisitionDate: %s", original_acquisition_date)
+    logger.info("AcquisitionTime: %s", original_acquisition_time)
+    logger.info("Removed StudyDate and StudyTime before sending...")
     
     # Verify tags are removed
     assert not hasattr(ds, 'StudyDate'), "StudyDate still present"
     assert not hasattr(ds, 'StudyTime'), "StudyTime still present"
     
     # Send to Compass
-    print(f"\n  Sending to Compass...")
+    logger.info("Sending to Compass...")
     dicom_sender._send_single_dataset(ds, metrics)
     
     assert metrics.successes == 1, "Send failed"
-    print(f"  Status: SUCCESS")
-    print(f"  Latency: {metrics.avg_latency_ms:.2f}ms")
+    logger.info("Status: SUCCESS")
+    logger.info("Latency: %.2fms", metrics.avg_latency_ms)
     
     # C-FIND verification
-    print(f"\n{'='*70}")
-    print(f"C-FIND VERIFICATION")
-    print(f"{'='*70}")
+    logger.info("C-FIND VERIFICATION")
     if cfind_client is None:
         pytest.skip("C-FIND verification is required for this test (set CFIND_VERIFY=true)")
 
-    patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+    patient_id = patient_id_of(ds)
     study = verify_study_arrived(cfind_client, str(ds.StudyInstanceUID), perf_config, patient_id=patient_id)
 
-    strategy = getattr(cfind_client, 'last_find_strategy', None) or 'unknown'
+    strategy = study.get('_cfind_strategy') or 'unknown'
     cfind_date = study.get('StudyDate', '')
     assert cfind_date and cfind_date.strip(), (
         f"StudyDate was not populated by Compass after sending with blank StudyDate. "
         f"Strategy used: '{strategy}'. "
         f"C-FIND response keys: {list(study.keys())}."
     )
-    print(f"  [OK] StudyDate was populated by Compass: {cfind_date}")
+    logger.info("[OK] StudyDate was populated by Compass: %s", cfind_date)
 
     expected_date = original_acquisition_date or ''
     if expected_date:
@@ -114,7 +151,7 @@ def test_populate_blank_study_date(
             f"StudyDate ({cfind_date.strip()}) does not match "
             f"AcquisitionDate ({expected_date.strip()})"
         )
-        print(f"  [OK] StudyDate matches AcquisitionDate: {expected_date}")
+        logger.info("[OK] StudyDate matches AcquisitionDate: %s", expected_date)
 
 
 @pytest.mark.integration
@@ -122,6 +159,7 @@ def test_populate_blank_study_date(
 def test_preserve_existing_study_date(
     dicom_sender,
     single_dicom_file: Path,
+    new_study_dataset,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
@@ -134,11 +172,7 @@ def test_preserve_existing_study_date(
     2. Verify send succeeds
     3. C-FIND verification: Confirm date was not changed
     """
-    ds = load_dataset(single_dicom_file)
-    
-    ds.StudyInstanceUID = generate_uid()
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    ds = new_study_dataset(single_dicom_file)
     
     # Set specific study date/time
     test_study_date = "20240101"
@@ -147,27 +181,25 @@ def test_preserve_existing_study_date(
     ds.StudyDate = test_study_date
     ds.StudyTime = test_study_time
     
-    print(f"\n{'='*70}")
-    print(f"PRESERVE STUDY DATE TEST")
-    print(f"{'='*70}")
-    print(f"  StudyInstanceUID: {ds.StudyInstanceUID}")
-    print(f"  StudyDate: {test_study_date}")
-    print(f"  StudyTime: {test_study_time}")
+    logger.info("PRESERVE STUDY DATE TEST")
+    logger.info("StudyInstanceUID: %s", ds.StudyInstanceUID)
+    logger.info("StudyDate: %s", test_study_date)
+    logger.info("StudyTime: %s", test_study_time)
     
     dicom_sender._send_single_dataset(ds, metrics)
     
     assert metrics.successes == 1
-    print(f"  Status: SUCCESS")
+    logger.info("Status: SUCCESS")
     
     # C-FIND verification
-    print(f"\n[C-FIND VERIFICATION]")
+    logger.info("[C-FIND VERIFICATION]")
     if cfind_client is None:
         pytest.skip("C-FIND verification is required for this test (set CFIND_VERIFY=true)")
 
-    patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+    patient_id = patient_id_of(ds)
     study = verify_study_arrived(cfind_client, str(ds.StudyInstanceUID), perf_config, patient_id=patient_id)
 
-    strategy = getattr(cfind_client, 'last_find_strategy', None) or 'unknown'
+    strategy = study.get('_cfind_strategy') or 'unknown'
     cfind_date = study.get('StudyDate', '')
     with manual_verification_required("StudyDate preservation -- verified manually on server"):
         assert cfind_date and cfind_date.strip(), (
@@ -182,7 +214,7 @@ def test_preserve_existing_study_date(
             f"StudyDate was not preserved: expected '{test_study_date}', "
             f"got '{cfind_date.strip()}'"
         )
-    print(f"  [OK] StudyDate preserved: {cfind_date}")
+    logger.info("[OK] StudyDate preserved: %s", cfind_date)
 
 
 # ============================================================================
@@ -194,6 +226,7 @@ def test_preserve_existing_study_date(
 def test_iims_accession_number_generation(
     dicom_sender,
     single_dicom_file: Path,
+    new_study_dataset,
     metrics: PerfMetrics,
     perf_config,
 ):
@@ -214,11 +247,7 @@ def test_iims_accession_number_generation(
     4. Verify send succeeds
     5. MANUAL: Check AccessionNumber on destination server
     """
-    ds = load_dataset(single_dicom_file)
-    
-    ds.StudyInstanceUID = generate_uid()
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    ds = new_study_dataset(single_dicom_file)
     
     # Set accession number to empty string
     ds.AccessionNumber = ''
@@ -228,26 +257,19 @@ def test_iims_accession_number_generation(
     default_local_ae = dicom_sender.endpoint.local_ae_title
     default_remote_ae = dicom_sender.endpoint.remote_ae_title
     
-    print(f"\n{'='*70}")
-    print(f"BLANK ACCESSION NUMBER TEST")
-    print(f"{'='*70}")
-    print(f"  StudyInstanceUID: {ds.StudyInstanceUID}")
-    print(f"  AccessionNumber: '' (empty string)")
-    print(f"  Called AE (SCP) override: {default_remote_ae} -> {iims_scp}")
-    print(f"  Calling AE (SCU) override: {default_local_ae} -> {iims_scu}")
-    print(f"\n  Expecting IIMS web service to be called...")
-    
-    # Override both AE titles for the non-ordered studies route
-    dicom_sender.endpoint.local_ae_title = iims_scu
-    dicom_sender.endpoint.remote_ae_title = iims_scp
-    try:
-        dicom_sender._send_single_dataset(ds, metrics)
-    finally:
-        dicom_sender.endpoint.local_ae_title = default_local_ae
-        dicom_sender.endpoint.remote_ae_title = default_remote_ae
+    logger.info("BLANK ACCESSION NUMBER TEST")
+    logger.info("StudyInstanceUID: %s", ds.StudyInstanceUID)
+    logger.info("AccessionNumber: '' (empty string)")
+    logger.info("Called AE (SCP) override: %s -> %s", default_remote_ae, iims_scp)
+    logger.info("Calling AE (SCU) override: %s -> %s", default_local_ae, iims_scu)
+    logger.info("Expecting IIMS web service to be called...")
+    
+    # Both AE titles for the non-ordered studies route
+    sender = dicom_sender.with_endpoint(local_ae_title=iims_scu, remote_ae_title=iims_scp)
+    sender._send_single_dataset(ds, metrics)
     
     assert metrics.successes == 1, "Send failed"
-    print(f"  Status: SUCCESS")
+    logger.info("Status: SUCCESS")
     
     # Fail with manual verification banner -- C-FIND cannot verify this automatically
     banner = (
@@ -274,6 +296,7 @@ def test_iims_accession_number_generation(
 def test_pass_device_accession_number(
     dicom_sender,
     single_dicom_file: Path,
+    new_study_dataset,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
@@ -291,36 +314,30 @@ def test_pass_device_accession_number(
     2. Send to Compass
     3. Verify accession number is preserved
     """
-    ds = load_dataset(single_dicom_file)
-    
-    ds.StudyInstanceUID = generate_uid()
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    ds = new_study_dataset(single_dicom_file)
     
     # Set specific accession number
     test_accession = "TEST-ACC-12345678"
     ds.AccessionNumber = test_accession
     
-    print(f"\n{'='*70}")
-    print(f"PASS DEVICE ACCESSION NUMBER TEST")
-    print(f"{'='*70}")
-    print(f"  StudyInstanceUID: {ds.StudyInstanceUID}")
-    print(f"  AccessionNumber: {test_accession}")
+    logger.info("PASS DEVICE ACCESSION NUMBER TEST")
+    logger.info("StudyInstanceUID: %s", ds.StudyInstanceUID)
+    logger.info("AccessionNumber: %s", test_accession)
     
     dicom_sender._send_single_dataset(ds, metrics)
     
     assert metrics.successes == 1, "Send failed"
-    print(f"  Status: SUCCESS")
+    logger.info("Status: SUCCESS")
     
     # C-FIND verification
-    print(f"\n[C-FIND VERIFICATION]")
+    logger.info("[C-FIND VERIFICATION]")
     if cfind_client is None:
         pytest.skip("C-FIND verification is required for this test (set CFIND_VERIFY=true)")
 
-    patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+    patient_id = patient_id_of(ds)
     study = verify_study_arrived(cfind_client, str(ds.StudyInstanceUID), perf_config, patient_id=patient_id)
 
-    strategy = getattr(cfind_client, 'last_find_strategy', None) or 'unknown'
+    strategy = study.get('_cfind_strategy') or 'unknown'
     acc = study.get('AccessionNumber', '')
     with manual_verification_required("AccessionNumber preservation -- verified manually on server"):
         assert acc and acc.strip(), (
@@ -333,89 +350,70 @@ def test_pass_device_accession_number(
             f"AccessionNumber was not preserved: expected '{test_accession}', "
             f"got '{acc.strip()}'"
         )
-    print(f"  [OK] AccessionNumber preserved: {acc}")
+    logger.info("[OK] AccessionNumber preserved: %s", acc)
 
 
 @pytest.mark.integration
+@pytest.mark.parametrize(
+    "name,action,expected",
+    [
+        (
+            'Missing tag entirely',
+            lambda ds: delattr(ds, 'AccessionNumber') if hasattr(ds, 'AccessionNumber') else None,
+            'Compass should generate or leave blank',
+        ),
+        (
+            'Very long accession number',
+            lambda ds: setattr(ds, 'AccessionNumber', 'A' * 100),
+            'Compass should accept or truncate',
+        ),
+        (
+            'Special characters',
+            lambda ds: setattr(ds, 'AccessionNumber', 'TEST-ACC#123@456'),
+            'Compass should handle or sanitize',
+        ),
+    ],
+    ids=["missing", "very-long", "special-chars"],
+)
 def test_accession_number_edge_cases(
     dicom_sender,
     single_dicom_file: Path,
+    new_study_dataset,
+    metrics: PerfMetrics,
     cfind_client,
     perf_config,
+    name: str,
+    action,
+    expected: str,
 ):
     """
-    Test various accession number edge cases.
-    
-    Test Steps:
-    1. Send with missing AccessionNumber tag (not just blank)
-    2. Send with very long AccessionNumber
-    3. Send with special characters in AccessionNumber
+    Test various accession number edge cases, one case per parametrization:
+    missing AccessionNumber tag (not just blank), a very long value, and
+    special characters.
     """
-    print(f"\n{'='*70}")
-    print(f"ACCESSION NUMBER EDGE CASES")
-    print(f"{'='*70}")
-    
-    test_cases = [
-        {
-            'name': 'Missing tag entirely',
-            'action': lambda ds: delattr(ds, 'AccessionNumber') if hasattr(ds, 'AccessionNumber') else None,
-            'expected': 'Compass should generate or leave blank'
-        },
-        {
-            'name': 'Very long accession number',
-            'action': lambda ds: setattr(ds, 'AccessionNumber', 'A' * 100),
-            'expected': 'Compass should accept or truncate'
-        },
-        {
-            'name': 'Special characters',
-            'action': lambda ds: setattr(ds, 'AccessionNumber', 'TEST-ACC#123@456'),
-            'expected': 'Compass should handle or sanitize'
-        },
-    ]
-    
-    failures = []
-
-    for i, test_case in enumerate(test_cases, 1):
-        print(f"\n[Test {i}/{len(test_cases)}]: {test_case['name']}")
-        
-        metrics = PerfMetrics()
-        ds = load_dataset(single_dicom_file)
-        
-        ds.StudyInstanceUID = generate_uid()
-        ds.SeriesInstanceUID = generate_uid()
-        ds.SOPInstanceUID = generate_uid()
-        
-        test_case['action'](ds)
-        
-        accession_value = ds.AccessionNumber if hasattr(ds, 'AccessionNumber') else 'NOT_PRESENT'
-        print(f"  AccessionNumber: {accession_value}")
-        print(f"  Expected: {test_case['expected']}")
-        
-        dicom_sender._send_single_dataset(ds, metrics)
-        
-        if metrics.successes != 1:
-            msg = f"Edge case '{test_case['name']}': send failed (error rate {metrics.error_rate:.1%})"
-            print(f"  Result: FAILED - {msg}")
-            failures.append(msg)
-        else:
-            print(f"  Result: SUCCESS")
-            print(f"  StudyInstanceUID: {ds.StudyInstanceUID}")
-            if cfind_client is not None:
-                patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
-                try:
-                    study = verify_study_arrived(cfind_client, str(ds.StudyInstanceUID), perf_config, patient_id=patient_id)
-                    acc = study.get('AccessionNumber', '')
-                    print(f"  C-FIND AccessionNumber: '{acc}'")
-                except AssertionError as e:
-                    msg = f"Edge case '{test_case['name']}': study not found via C-FIND ({e})"
-                    print(f"  C-FIND: FAILED - {msg}")
-                    failures.append(msg)
-
-        time.sleep(2)
-
-    assert not failures, (
-        f"{len(failures)} edge case(s) failed:\n" + "\n".join(f"  - {f}" for f in failures)
+    logger.info("ACCESSION NUMBER EDGE CASE: %s", name)
+
+    ds = new_study_dataset(single_dicom_file)
+
+    action(ds)
+
+    accession_value = ds.get('AccessionNumber', 'NOT_PRESENT')
+    logger.info("AccessionNumber: %s", accession_value)
+    logger.info("Expected: %s", expected)
+
+    dicom_sender._send_single_dataset(ds, metrics)
+
+    assert metrics.successes == 1, (
+        f"Edge case '{name}': send failed (error rate {metrics.error_rate:.1%})"
     )
+    logger.info("Result: SUCCESS")
+    logger.info("StudyInstanceUID: %s", ds.StudyInstanceUID)
+
+    if cfind_client is not None:
+        patient_id = patient_id_of(ds)
+        study = verify_study_arrived(cfind_client, str(ds.StudyInstanceUID), perf_config, patient_id=patient_id)
+        acc = study.get('AccessionNumber', '')
+        logger.info("C-FIND AccessionNumber: '%s'", acc)
 
 
 # ============================================================================
@@ -426,6 +424,7 @@ def test_accession_number_edge_cases(
 def test_blank_patient_name_handling(
     dicom_sender,
     single_dicom_file: Path,
+    new_study_dataset,
     metrics: PerfMetrics,
 ):
     """
@@ -437,11 +436,7 @@ def test_blank_patient_name_handling(
     2. Send to Compass
     3. Verify handling
     """
-    ds = load_dataset(single_dicom_file)
-    
-    ds.StudyInstanceUID = generate_uid()
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    ds = new_study_dataset(single_dicom_file)
     
     # Blank patient name (the variable under test)
     ds.PatientName = ''
@@ -450,44 +445,35 @@ def test_blank_patient_name_handling(
     # so that blank PatientName is the only difference.
     ds.PatientID = 'TEST-ID-12345'
     ds.PatientBirthDate = '19010101'
-    ds.AccessionNumber = generate_uid().split('.')[-1][:16]
+    ds.AccessionNumber = next_accession_number()
     ds.InstitutionName = 'TEST FACILITY'
     ds.ReferringPhysicianName = 'TEST^PROVIDER'
     
-    # Save to disk and reload to normalize encoding (same pattern as
-    # test_anonymize_and_send, which avoids Read PDU errors).
-    tmp_fd, tmp_path = tempfile.mkstemp(suffix=".dcm")
-    os.close(tmp_fd)
-    try:
-        transfer_syntax = str(ds.file_meta.TransferSyntaxUID) if hasattr(ds, 'file_meta') and hasattr(ds.file_meta, 'TransferSyntaxUID') else '1.2.840.10008.1.2.1'
-        if transfer_syntax == '1.2.840.10008.1.2':
-            ds.save_as(tmp_path, implicit_vr=True, little_endian=True)
-        elif transfer_syntax == '1.2.840.10008.1.2.2':
-            ds.save_as(tmp_path, implicit_vr=False, little_endian=False)
-        else:
-            ds.save_as(tmp_path, implicit_vr=False, little_endian=True)
-        ds = dcmread(tmp_path)
-    finally:
-        os.unlink(tmp_path)
-    
-    print(f"\n{'='*70}")
-    print(f"BLANK PATIENT NAME TEST")
-    print(f"{'='*70}")
-    print(f"  StudyInstanceUID: {ds.StudyInstanceUID}")
-    print(f"  PatientName: '' (blank)")
-    print(f"  PatientID: {ds.PatientID}")
-    print(f"  AccessionNumber: {ds.AccessionNumber}")
+    # Encode and re-parse to normalize encoding (same pattern as
+    # test_anonymize_and_send, which avoids Read PDU errors). Done in memory;
+    # nothing is written to disk.
+    buffer = BytesIO()
+    implicit_vr, little_endian = save_encoding(ds)
+    ds.save_as(buffer, implicit_vr=implicit_vr, little_endian=little_endian)
+    buffer.seek(0)
+    ds = dcmread(buffer)
+    
+    logger.info("BLANK PATIENT NAME TEST")
+    logger.info("StudyInstanceUID: %s", ds.StudyInstanceUID)
+    logger.info("PatientName: '' (blank)")
+    logger.info("PatientID: %s", ds.PatientID)
+    logger.info("AccessionNumber: %s", ds.AccessionNumber)
     
     dicom_sender._send_single_dataset(ds, metrics)
     
     sample = metrics.samples[0]
     if sample.success:
-        print(f"  Status: ACCEPTED by Compass")
+        logger.info("Status: ACCEPTED by Compass")
     else:
         status_hex = f"0x{sample.status_code:04X}" if sample.status_code is not None else "N/A"
-        print(f"  Status: REJECTED by Compass")
-        print(f"  Status code: {status_hex}")
-        print(f"  Error: {sample.error}")
+        logger.info("Status: REJECTED by Compass")
+        logger.info("Status code: %s", status_hex)
+        logger.info("Error: %s", sample.error)
         pytest.fail(
             f"Compass rejected blank PatientName (status {status_hex}). "
             f"Expected Compass to accept and route to destination."
@@ -495,10 +481,21 @@ def test_blank_patient_name_handling(
 
 
 @pytest.mark.integration
+@pytest.mark.parametrize(
+    "patient_name",
+    [
+        "O'Brien^John",  # Apostrophe
+        "Smith-Jones^Mary",  # Hyphen
+        "García^José",  # Accented characters
+        "Patient^Test^Jr.",  # Suffix
+    ],
+)
 def test_special_characters_in_patient_data(
     dicom_sender,
     single_dicom_file: Path,
-    metrics: PerfMetrics
+    new_study_dataset,
+    metrics: PerfMetrics,
+    patient_name: str,
 ):
     """
     Test patient data with special characters and Unicode.
@@ -510,54 +507,17 @@ def test_special_characters_in_patient_data(
     2. Send to Compass
     3. Verify proper handling
     """
-    ds = load_dataset(single_dicom_file)
+    ds = new_study_dataset(single_dicom_file)
+    ds.PatientName = patient_name
     
-    ds.StudyInstanceUID = generate_uid()
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    logger.info("SPECIAL CHARACTERS IN PATIENT DATA")
+    logger.info("PatientName: %s", patient_name)
     
-    # Special characters in patient name
-    test_names = [
-        "O'Brien^John",  # Apostrophe
-        "Smith-Jones^Mary",  # Hyphen
-        "García^José",  # Accented characters
-        "Patient^Test^Jr.",  # Suffix
-    ]
-    
-    print(f"\n{'='*70}")
-    print(f"SPECIAL CHARACTERS IN PATIENT DATA")
-    print(f"{'='*70}")
-    
-    failures = []
-
-    for i, name in enumerate(test_names, 1):
-        test_metrics = PerfMetrics()
-        ds_copy = load_dataset(single_dicom_file)
-        
-        ds_copy.StudyInstanceUID = generate_uid()
-        ds_copy.SeriesInstanceUID = generate_uid()
-        ds_copy.SOPInstanceUID = generate_uid()
-        ds_copy.PatientName = name
-        
-        print(f"\n[Test {i}/{len(test_names)}]")
-        print(f"  PatientName: {name}")
-        
-        dicom_sender._send_single_dataset(ds_copy, test_metrics)
-        
-        if test_metrics.successes == 1:
-            print(f"  Status: SUCCESS")
-            print(f"  StudyUID: {ds_copy.StudyInstanceUID}")
-        else:
-            msg = f"PatientName '{name}': send failed"
-            print(f"  Status: FAILED")
-            failures.append(msg)
-        
-        time.sleep(1)
-
-    assert not failures, (
-        f"{len(failures)} special character case(s) failed:\n"
-        + "\n".join(f"  - {f}" for f in failures)
-    )
+    dicom_sender._send_single_dataset(ds, metrics)
+    
+    assert metrics.successes == 1, f"PatientName '{patient_name}': send failed"
+    logger.info("Status: SUCCESS")
+    logger.info("StudyUID: %s", ds.StudyInstanceUID)
 
 
 # ============================================================================
@@ -568,6 +528,7 @@ def test_special_characters_in_patient_data(
 def test_missing_modality_tag(
     dicom_sender,
     single_dicom_file: Path,
+    new_study_dataset,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
@@ -582,11 +543,7 @@ def test_missing_modality_tag(
     2. Attempt to send
     3. Verify behavior (accept or reject)
     """
-    ds = load_dataset(single_dicom_file)
-    
-    ds.StudyInstanceUID = generate_uid()
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    ds = new_study_dataset(single_dicom_file)
     
     # Store original modality
     original_modality = ds.Modality if hasattr(ds, 'Modality') else None
@@ -595,12 +552,10 @@ def test_missing_modality_tag(
     if hasattr(ds, 'Modality'):
         del ds.Modality
     
-    print(f"\n{'='*70}")
-    print(f"MISSING MODALITY TAG TEST")
-    print(f"{'='*70}")
-    print(f"  StudyInstanceUID: {ds.StudyInstanceUID}")
-    print(f"  Original Modality: {original_modality}")
-    print(f"  Modality tag: REMOVED")
+    logger.info("MISSING MODALITY TAG TEST")
+    logger.info("StudyInstanceUID: %s", ds.StudyInstanceUID)
+    logger.info("Original Modality: %s", original_modality)
+    logger.info("Modality tag: REMOVED")
     
     dicom_sender._send_single_dataset(ds, metrics)
     
@@ -608,42 +563,10 @@ def test_missing_modality_tag(
         f"Compass rejected file with missing Modality tag "
         f"(error rate {metrics.error_rate:.1%})"
     )
-    print(f"  Result: ACCEPTED")
+    logger.info("Result: ACCEPTED")
     
     # C-FIND verification
     if cfind_client is not None:
-        patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+        patient_id = patient_id_of(ds)
         verify_study_arrived(cfind_client, str(ds.StudyInstanceUID), perf_config, patient_id=patient_id)
-        print(f"  [OK] Study stored in Compass despite missing Modality")
-
-
-# ============================================================================
-# Helper: Data Integrity Summary Test
-# ============================================================================
-
-@pytest.mark.integration
-def test_data_validation_summary(dicom_sender):
-    """
-    Summary test: Quick check of all data validation scenarios.
-    
-    Provides overview of Compass data handling capabilities.
-    """
-    print(f"\n{'='*70}")
-    print(f"DATA VALIDATION TEST SUITE SUMMARY")
-    print(f"{'='*70}")
-    print(f"\nThis test suite validates:")
-    print(f"  1. Blank StudyDate/Time handling")
-    print(f"  2. Accession number generation (IIMS API)")
-    print(f"  3. Accession number preservation")
-    print(f"  4. Patient demographic edge cases")
-    print(f"  5. Missing required tags")
-    print(f"\nAll tests send files, verify via C-FIND, and document expected behavior.")
-    print(f"\nRun individual tests for detailed results:")
-    print(f"  pytest tests/test_data_validation.py -v -s")
-    
-    # Quick connectivity check
-    is_reachable = dicom_sender.ping(timeout_seconds=10)
-    assert is_reachable, "Compass not reachable"
-    
-    print(f"\n[SUCCESS] Compass is ready for data validation testing")
-
+        logger.info("[OK] Study stored in Compass despite missing Modality")
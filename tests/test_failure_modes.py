@@ -11,11 +11,23 @@ from pathlib import Path
 from typing import List
 
 import pytest
-from pydicom.uid import generate_uid
 
 from data_loader import load_dataset
 from metrics import PerfMetrics
-from tests.conftest import verify_study_arrived
+from tests.conftest import patient_id_of, uid_sequence, verify_study_arrived
+
+
+@pytest.fixture
+def reusing_sender(dicom_sender):
+    """
+    Copy of the session sender that keeps one association open for the test.
+
+    Only for tests whose pauses are short; the delay and interruption tests
+    below need a fresh association per send, as a real modality would open.
+    """
+    sender = dicom_sender.with_endpoint()
+    with sender.reusing_association():
+        yield sender
 
 
 # ============================================================================
@@ -27,9 +39,9 @@ from tests.conftest import verify_study_arrived
 def test_send_with_2min_pause_between_files(
     dicom_sender,
     small_dicom_files: List[Path],
+    cached_dataset,
     metrics: PerfMetrics,
-    cfind_client,
-    perf_config,
+    verifier,
 ):
     """
     COMPASS_FailureMode_DelayDuringSend
@@ -57,28 +69,39 @@ def test_send_with_2min_pause_between_files(
     print(f"{'='*70}")
     print(f"  Total estimated time: {len(test_files) * delay_seconds / 60:.1f} minutes")
     
-    uid_to_patient: dict = {}
-    for i, file in enumerate(test_files, 1):
-        ds = load_dataset(file)
+    # Each study is verified in the background during the following pause
+    pending_checks = []
+    uids = uid_sequence()
+    try:
+        for i, file in enumerate(test_files, 1):
+            ds = cached_dataset(file)
 
-        # Generate unique UIDs for tracking
-        ds.StudyInstanceUID = generate_uid()
-        ds.SeriesInstanceUID = generate_uid()
-        ds.SOPInstanceUID = generate_uid()
-        uid_to_patient[str(ds.StudyInstanceUID)] = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+            # Generate unique UIDs for tracking
+            ds.StudyInstanceUID = next(uids)
+            ds.SeriesInstanceUID = next(uids)
+            ds.SOPInstanceUID = next(uids)
 
-        print(f"\n[{i}/{len(test_files)}] Sending file: {file.name}")
-        print(f"  StudyInstanceUID: {ds.StudyInstanceUID}")
+            print(f"\n[{i}/{len(test_files)}] Sending file: {file.name}")
+            print(f"  StudyInstanceUID: {ds.StudyInstanceUID}")
 
-        start_time = time.time()
-        dicom_sender._send_single_dataset(ds, metrics)
-        send_duration = time.time() - start_time
+            start_time = time.time()
+            dicom_sender._send_single_dataset(ds, metrics)
+            send_duration = time.time() - start_time
 
-        print(f"  Send completed in {send_duration:.2f}s")
+            print(f"  Send completed in {send_duration:.2f}s")
+            pending_checks.append(
+                verifier.submit([(str(ds.StudyInstanceUID), patient_id_of(ds))])
+            )
 
-        if i < len(test_files):
-            print(f"  Pausing for {delay_seconds}s before next send...")
-            time.sleep(delay_seconds)
+            if i < len(test_files):
+                print(f"  Pausing for {delay_seconds}s before next send...")
+                time.sleep(delay_seconds)
+    except BaseException:
+        verifier.drain(pending_checks, cancel=True)
+        raise
+    # Let every background check finish before asserting; its error (if
+    # any) is raised after the send asserts
+    verification_error = verifier.drain(pending_checks)
 
     # Verify all files sent successfully
     print(f"\n{'='*70}")
@@ -95,10 +118,10 @@ def test_send_with_2min_pause_between_files(
     assert metrics.error_rate == 0, \
         f"Some sends failed despite delays: {metrics.failures} failures"
 
-    # C-FIND verification
+    # C-FIND verification (started after each send, already drained above)
     print(f"\n[C-FIND VERIFICATION]")
-    for uid, patient_id in uid_to_patient.items():
-        verify_study_arrived(cfind_client, uid, perf_config, patient_id=patient_id)
+    if verification_error is not None:
+        raise verification_error
 
     print(f"\n[SUCCESS] All {len(test_files)} files sent and verified with 2-min delays")
 
@@ -108,9 +131,9 @@ def test_send_with_2min_pause_between_files(
 def test_slow_send_one_at_a_time(
     dicom_sender,
     small_dicom_files: List[Path],
+    cached_dataset,
     metrics: PerfMetrics,
-    cfind_client,
-    perf_config,
+    verifier,
 ):
     """
     COMPASS_FailureMode_DelayDuringSend_Slow
@@ -133,25 +156,36 @@ def test_slow_send_one_at_a_time(
     print(f"{'='*70}")
     
     sent_study_uids = []
+    # Each study is verified in the background during the following pause
+    pending_checks = []
+    uids = uid_sequence()
     
-    for i, file in enumerate(test_files, 1):
-        ds = load_dataset(file)
+    try:
+        for i, file in enumerate(test_files, 1):
+            ds = cached_dataset(file)
         
-        study_uid = generate_uid()
-        ds.StudyInstanceUID = study_uid
-        ds.SeriesInstanceUID = generate_uid()
-        ds.SOPInstanceUID = generate_uid()
-        sent_study_uids.append(study_uid)
+            study_uid = next(uids)
+            ds.StudyInstanceUID = study_uid
+            ds.SeriesInstanceUID = next(uids)
+            ds.SOPInstanceUID = next(uids)
+            sent_study_uids.append(study_uid)
         
-        print(f"\n[{i}/{len(test_files)}] Sending image {i}")
-        print(f"  File: {file.name}")
-        print(f"  StudyInstanceUID: {study_uid}")
+            print(f"\n[{i}/{len(test_files)}] Sending image {i}")
+            print(f"  File: {file.name}")
+            print(f"  StudyInstanceUID: {study_uid}")
         
-        dicom_sender._send_single_dataset(ds, metrics)
+            dicom_sender._send_single_dataset(ds, metrics)
+            pending_checks.append(verifier.submit([(str(study_uid), patient_id_of(ds))]))
         
-        if i < len(test_files):
-            print(f"  Waiting {delay_seconds}s before next image...")
-            time.sleep(delay_seconds)
+            if i < len(test_files):
+                print(f"  Waiting {delay_seconds}s before next image...")
+                time.sleep(delay_seconds)
+    except BaseException:
+        verifier.drain(pending_checks, cancel=True)
+        raise
+    # Let every background check finish before asserting; its error (if
+    # any) is raised after the send asserts
+    verification_error = verifier.drain(pending_checks)
     
     print(f"\n{'='*70}")
     print(f"RESULTS")
@@ -164,10 +198,9 @@ def test_slow_send_one_at_a_time(
     
     # C-FIND verification: confirm each study arrived individually
     print(f"\n[C-FIND VERIFICATION]")
-    patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
-    for i, uid in enumerate(sent_study_uids, 1):
-        print(f"  [{i}/{len(sent_study_uids)}] Verifying StudyInstanceUID: {uid}")
-        verify_study_arrived(cfind_client, str(uid), perf_config, patient_id=patient_id)
+    print(f"  Checked {len(sent_study_uids)} StudyInstanceUIDs")
+    if verification_error is not None:
+        raise verification_error
     
     print(f"\n[OK] All {len(sent_study_uids)} images verified via C-FIND")
 
@@ -178,8 +211,9 @@ def test_slow_send_one_at_a_time(
 
 @pytest.mark.integration
 def test_send_duplicate_study_multiple_times(
-    dicom_sender,
+    reusing_sender,
     single_dicom_file: Path,
+    cached_dataset,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
@@ -206,12 +240,13 @@ def test_send_duplicate_study_multiple_times(
     print(f"{'='*70}")
     
     # Load and prepare study once
-    ds = load_dataset(single_dicom_file)
+    ds = cached_dataset(single_dicom_file)
     
     # Use fixed UIDs (same for all sends - this is the duplicate scenario)
-    fixed_study_uid = generate_uid()
-    fixed_series_uid = generate_uid()
-    fixed_sop_uid = generate_uid()
+    uids = uid_sequence()
+    fixed_study_uid = next(uids)
+    fixed_series_uid = next(uids)
+    fixed_sop_uid = next(uids)
     
     ds.StudyInstanceUID = fixed_study_uid
     ds.SeriesInstanceUID = fixed_series_uid
@@ -225,7 +260,7 @@ def test_send_duplicate_study_multiple_times(
         print(f"\n[Send {i}/{num_sends}]")
         
         send_metrics = PerfMetrics()  # Separate metrics per send
-        dicom_sender._send_single_dataset(ds, send_metrics)
+        reusing_sender._send_single_dataset(ds, send_metrics)
         
         if send_metrics.successes == 1:
             print(f"  Status: SUCCESS")
@@ -255,7 +290,7 @@ def test_send_duplicate_study_multiple_times(
     
     # C-FIND verification
     print(f"\n[C-FIND VERIFICATION]")
-    patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+    patient_id = patient_id_of(ds)
     cfind_study = verify_study_arrived(cfind_client, str(fixed_study_uid), perf_config, patient_id=patient_id)
     if cfind_study is not None:
         instances = cfind_study.get('NumberOfStudyRelatedInstances')
@@ -267,8 +302,9 @@ def test_send_duplicate_study_multiple_times(
 
 @pytest.mark.integration
 def test_resend_after_modifications(
-    dicom_sender,
+    reusing_sender,
     single_dicom_file: Path,
+    cached_dataset,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
@@ -284,12 +320,13 @@ def test_resend_after_modifications(
     3. Resend modified study
     4. Verify both sends succeed
     """
-    ds = load_dataset(single_dicom_file)
+    ds = cached_dataset(single_dicom_file)
     
-    study_uid = generate_uid()
+    uids = uid_sequence()
+    study_uid = next(uids)
     ds.StudyInstanceUID = study_uid
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    ds.SeriesInstanceUID = next(uids)
+    ds.SOPInstanceUID = next(uids)
     
     original_patient = "ORIGINAL^PATIENT"
     ds.PatientName = original_patient
@@ -304,7 +341,7 @@ def test_resend_after_modifications(
     print(f"  PatientName: {original_patient}")
     
     send1_metrics = PerfMetrics()
-    dicom_sender._send_single_dataset(ds, send1_metrics)
+    reusing_sender._send_single_dataset(ds, send1_metrics)
     
     assert send1_metrics.successes == 1, "First send failed"
     print(f"  Status: SUCCESS")
@@ -314,22 +351,22 @@ def test_resend_after_modifications(
     # Modify and resend
     modified_patient = "MODIFIED^PATIENT"
     ds.PatientName = modified_patient
-    ds.SeriesInstanceUID = generate_uid()  # New series
-    ds.SOPInstanceUID = generate_uid()  # New SOP
+    ds.SeriesInstanceUID = next(uids)  # New series
+    ds.SOPInstanceUID = next(uids)  # New SOP
     
     print(f"\n[SEND 2: Modified]")
     print(f"  PatientName: {modified_patient} (CHANGED)")
     print(f"  StudyInstanceUID: {study_uid} (SAME)")
     
     send2_metrics = PerfMetrics()
-    dicom_sender._send_single_dataset(ds, send2_metrics)
+    reusing_sender._send_single_dataset(ds, send2_metrics)
     
     assert send2_metrics.successes == 1, "Second send failed"
     print(f"  Status: SUCCESS")
     
     # C-FIND verification
     print(f"\n[C-FIND VERIFICATION]")
-    patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+    patient_id = patient_id_of(ds)
     cfind_study = verify_study_arrived(cfind_client, str(study_uid), perf_config, patient_id=patient_id)
     if cfind_study is not None:
         pn = cfind_study.get('PatientName', '')
@@ -349,6 +386,7 @@ def test_resend_after_modifications(
 def test_send_with_variable_delays(
     dicom_sender,
     small_dicom_files: List[Path],
+    cached_dataset,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
@@ -365,17 +403,18 @@ def test_send_with_variable_delays(
     import random
     
     test_files = small_dicom_files[:5]
-    study_uid = generate_uid()
+    uids = uid_sequence()
+    study_uid = next(uids)
     
     print(f"\n{'='*70}")
     print(f"VARIABLE DELAY TEST: {len(test_files)} files")
     print(f"{'='*70}")
     
     for i, file in enumerate(test_files, 1):
-        ds = load_dataset(file)
+        ds = cached_dataset(file)
         ds.StudyInstanceUID = study_uid
-        ds.SeriesInstanceUID = generate_uid()
-        ds.SOPInstanceUID = generate_uid()
+        ds.SeriesInstanceUID = next(uids)
+        ds.SOPInstanceUID = next(uids)
         
         delay = random.uniform(5, 60) if i < len(test_files) else 0
         
@@ -391,7 +430,7 @@ def test_send_with_variable_delays(
 
     # C-FIND verification for the shared study
     print(f"\n[C-FIND VERIFICATION]")
-    patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+    patient_id = patient_id_of(ds)
     cfind_study = verify_study_arrived(cfind_client, str(study_uid), perf_config, patient_id=patient_id)
     if cfind_study is not None:
         instances = cfind_study.get('NumberOfStudyRelatedInstances')
@@ -410,6 +449,7 @@ def test_send_with_variable_delays(
 def test_interrupted_send_then_resend_complete_study(
     dicom_sender,
     small_dicom_files: List[Path],
+    cached_dataset,
     metrics: PerfMetrics,
     cfind_client,
     perf_config,
@@ -449,8 +489,9 @@ def test_interrupted_send_then_resend_complete_study(
 
     test_files = small_dicom_files[:total_files]
 
-    study_uid = generate_uid()
-    series_uid = generate_uid()
+    uids = uid_sequence()
+    study_uid = next(uids)
+    series_uid = next(uids)
 
     print(f"\n{'='*70}")
     print(f"INTERRUPTED TRANSMISSION TEST")
@@ -465,7 +506,7 @@ def test_interrupted_send_then_resend_complete_study(
     # reuses the same UIDs for files 1-3, allowing Compass to
     # de-duplicate the orphans from the interrupted partial send.
     # ------------------------------------------------------------------
-    all_sop_uids = [generate_uid() for _ in range(total_files)]
+    all_sop_uids = [next(uids) for _ in range(total_files)]
 
     # ------------------------------------------------------------------
     # Phase 1: Partial send (simulate interrupted transmission)
@@ -474,7 +515,7 @@ def test_interrupted_send_then_resend_complete_study(
     partial_metrics = PerfMetrics()
 
     for i, file in enumerate(test_files[:interrupt_after], 1):
-        ds = load_dataset(file)
+        ds = cached_dataset(file)
         ds.StudyInstanceUID = study_uid
         ds.SeriesInstanceUID = series_uid
         ds.SOPInstanceUID = all_sop_uids[i - 1]
@@ -503,7 +544,7 @@ def test_interrupted_send_then_resend_complete_study(
     resend_metrics = PerfMetrics()
 
     for i, file in enumerate(test_files, 1):
-        ds = load_dataset(file)
+        ds = cached_dataset(file)
         ds.StudyInstanceUID = study_uid
         ds.SeriesInstanceUID = series_uid
         ds.SOPInstanceUID = all_sop_uids[i - 1]
@@ -528,9 +569,9 @@ def test_interrupted_send_then_resend_complete_study(
     # ------------------------------------------------------------------
     print(f"\n--- PHASE 3: C-FIND verification ---")
 
-    ds_last = load_dataset(test_files[0])
+    ds_last = load_dataset(test_files[0], stop_before_pixels=True, specific_tags=["PatientID"])
     ds_last.StudyInstanceUID = study_uid
-    patient_id = str(ds_last.PatientID) if hasattr(ds_last, 'PatientID') else None
+    patient_id = patient_id_of(ds_last)
 
     cfind_study = verify_study_arrived(
         cfind_client, str(study_uid), perf_config, patient_id=patient_id,
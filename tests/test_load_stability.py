@@ -9,7 +9,7 @@ from __future__ import annotations
 import pytest
 
 from metrics import PerfMetrics
-from tests.conftest import verify_study_arrived
+from tests.conftest import patient_id_of
 
 
 @pytest.mark.load
@@ -18,7 +18,7 @@ def test_load_stability_3x_peak(
     dicom_datasets,
     metrics: PerfMetrics,
     perf_config,
-    cfind_client,
+    verifier,
 ):
     """
     Drives approximate 3x-peak load for a configurable time window.
@@ -52,15 +52,16 @@ def test_load_stability_3x_peak(
         p95 is not None and p95 <= max_p95_latency
     ), f"p95 latency too high: {p95} ms > {max_p95_latency} ms"
 
-    # Sample-based C-FIND verification (up to 5 unique StudyInstanceUIDs)
-    uid_to_patient = {
-        str(ds.StudyInstanceUID): str(ds.PatientID) if hasattr(ds, 'PatientID') else None
-        for ds in dicom_datasets
-        if hasattr(ds, 'StudyInstanceUID')
-    }
-    sample_uids = list(uid_to_patient.keys())[:5]
-    if sample_uids:
-        print(f"\n[C-FIND VERIFICATION] Verifying sample of {len(sample_uids)} study UIDs")
-        for uid in sample_uids:
-            verify_study_arrived(cfind_client, uid, perf_config, patient_id=uid_to_patient[uid])
+    # Sample-based C-FIND verification (up to 5 unique StudyInstanceUIDs,
+    # polled concurrently)
+    uid_to_patient: dict = {}
+    for ds in dicom_datasets:
+        uid = ds.get('StudyInstanceUID')
+        if uid is not None:
+            uid_to_patient.setdefault(str(uid), patient_id_of(ds))
+            if len(uid_to_patient) == 5:
+                break
+    if uid_to_patient:
+        print(f"\n[C-FIND VERIFICATION] Verifying sample of {len(uid_to_patient)} study UIDs")
+        verifier.verify_all(uid_to_patient.items())
 
@@ -10,72 +10,99 @@ import copy
 import itertools
 import tempfile
 import shutil
-import threading
-from datetime import datetime
 from typing import Tuple
 
 import pytest
-from pydicom import dcmread
-from pydicom.uid import generate_uid
+from pydicom.dataelem import DataElement
+from pydicom.dataset import Dataset
+from pydicom.tag import Tag
 
+from data_loader import prefetch
 from metrics import PerfMetrics
-from tests.conftest import verify_study_arrived
+from tests.conftest import (
+    next_accession_number,
+    patient_id_of,
+    uid_sequence,
+    update_tags_recursively,
+)
 
 
-def generate_accession_number() -> str:
-    """Generate a unique accession number based on current timestamp."""
-    now = datetime.now()
-    microseconds = now.microsecond
-    return f"{now.strftime('%Y%m%d-%H%M%S')}-{microseconds:06d}"
+STUDY_INSTANCE_UID_TAG = Tag(0x0020, 0x000d)
+ACCESSION_NUMBER_TAG = Tag(0x0008, 0x0050)
+SERIES_INSTANCE_UID_TAG = Tag(0x0020, 0x000e)
+SOP_INSTANCE_UID_TAG = Tag(0x0008, 0x0018)
 
+# Tags rewritten for every anonymized variant, with their VRs
+_VARIANT_TAGS = {
+    STUDY_INSTANCE_UID_TAG: 'UI',
+    ACCESSION_NUMBER_TAG: 'SH',
+    SERIES_INSTANCE_UID_TAG: 'UI',
+    SOP_INSTANCE_UID_TAG: 'UI',
+}
 
-def update_tag_recursively(ds, tag_tuple: Tuple, value, vr: str = None) -> int:
-    """Recursively update a tag in the dataset and all nested sequences."""
-    count = 0
-    
-    if tag_tuple in ds:
-        ds[tag_tuple].value = value
-        count += 1
-    
-    for elem in ds:
-        if elem.VR == "SQ" and elem.value:
-            for seq_item in elem.value:
-                count += update_tag_recursively(seq_item, tag_tuple, value, vr)
-    
-    return count
 
 
-def create_anonymized_variant(ds):
+# Replacement identifiers for every variant in this module
+_UIDS = uid_sequence()
+
+
+def prepare_template(ds) -> Tuple[Dataset, bool]:
     """
-    Create an anonymized copy of a dataset with unique UIDs.
-    Returns a new dataset object (doesn't modify original).
+    Prepare a copy of a parsed dataset as the source of anonymized variants.
+
+    The copy gets any missing top-level UID/accession tags and has every
+    element converted up front, so variants can share its elements
+    read-only. ds itself (e.g. from the session-wide dicom_datasets) is left
+    untouched.
+
+    Returns:
+        Tuple of (template, nested); nested is True if any of the rewritten
+        tags also occur inside a sequence item.
     """
-    ds_copy = copy.deepcopy(ds)
-    
-    # Generate new unique identifiers
-    new_study_uid = generate_uid()
-    new_accession_number = generate_accession_number()
-    new_series_uid = generate_uid()
-    new_sop_instance_uid = generate_uid()
-    
-    # Update UIDs
-    if (0x0020, 0x000d) not in ds_copy:
-        ds_copy.add_new((0x0020, 0x000d), 'UI', new_study_uid)
-    update_tag_recursively(ds_copy, (0x0020, 0x000d), new_study_uid, 'UI')
-    
-    if (0x0008, 0x0050) not in ds_copy:
-        ds_copy.add_new((0x0008, 0x0050), 'SH', new_accession_number)
-    update_tag_recursively(ds_copy, (0x0008, 0x0050), new_accession_number, 'SH')
-    
-    if (0x0020, 0x000e) not in ds_copy:
-        ds_copy.add_new((0x0020, 0x000e), 'UI', new_series_uid)
-    update_tag_recursively(ds_copy, (0x0020, 0x000e), new_series_uid, 'UI')
-    
-    if (0x0008, 0x0018) not in ds_copy:
-        ds_copy.add_new((0x0008, 0x0018), 'UI', new_sop_instance_uid)
-    update_tag_recursively(ds_copy, (0x0008, 0x0018), new_sop_instance_uid, 'UI')
-    
-    return ds_copy
+    ds = copy.deepcopy(ds)
+    for tag, vr in _VARIANT_TAGS.items():
+        if tag not in ds:
+            ds.add_new(tag, vr, '')
+
+    nested = False
+
+    def visit(dataset, elem):
+        nonlocal nested
+        if dataset is not ds and elem.tag in _VARIANT_TAGS:
+            nested = True
+
+    ds.walk(visit)
+    return ds, nested
+
+
+def create_anonymized_variant(template, nested: bool = False):
+    """
+    Create an anonymized copy of a template with unique UIDs.
+    Returns a new dataset object (doesn't modify the template).
+
+    The copy shares every element except the four rewritten ones, so
+    PixelData and the rest of the header are not duplicated. Templates with
+    nested occurrences of those tags are deep-copied and updated throughout.
+    """
+    values = {
+        STUDY_INSTANCE_UID_TAG: next(_UIDS),
+        ACCESSION_NUMBER_TAG: next_accession_number(),
+        SERIES_INSTANCE_UID_TAG: next(_UIDS),
+        SOP_INSTANCE_UID_TAG: next(_UIDS),
+    }
+
+    if nested:
+        ds_copy = copy.deepcopy(template)
+        update_tags_recursively(
+            ds_copy, {tag: (_VARIANT_TAGS[tag], value) for tag, value in values.items()}
+        )
+        return ds_copy
+
+    variant = Dataset({tag: template[tag] for tag in template.keys()})
+    variant.file_meta = template.file_meta
+    for tag, value in values.items():
+        variant[tag] = DataElement(tag, _VARIANT_TAGS[tag], value)
+    return variant
 
 
 @pytest.mark.load
@@ -86,7 +113,7 @@ def test_routing_throughput_under_peak_plus(
     metrics: PerfMetrics,
     perf_config,
     multiplier,
-    cfind_client,
+    verifier,
 ):
     """
     Push Compass to 150 percent and 200 percent of configured peak_images_per_second.
@@ -97,35 +124,42 @@ def test_routing_throughput_under_peak_plus(
     target_peak = perf_config.load_profile.peak_images_per_second * multiplier
     duration = perf_config.load_profile.test_duration_seconds
 
-    # Thread-safe collection of sample (uid, patient_id) pairs for verification
+    # Sample (uid, patient_id) pairs for verification. The generator is only
+    # advanced by the prefetch thread, so no lock.
     _sampled_pairs: list = []
-    _sample_lock = threading.Lock()
     _max_samples = 20
 
+    # Parse each source file once, before the timed run
+    templates = [prepare_template(ds) for ds in dicom_datasets]
+
     # Create anonymized variants generator
     # This will continuously create new anonymized copies with unique UIDs
     def anonymized_dataset_generator():
-        for ds in itertools.cycle(dicom_datasets):
-            variant = create_anonymized_variant(ds)
+        for template, nested in itertools.cycle(templates):
+            variant = create_anonymized_variant(template, nested)
             # Collect a sample of UID+PatientID pairs for post-test verification
             if len(_sampled_pairs) < _max_samples:
-                with _sample_lock:
-                    if len(_sampled_pairs) < _max_samples:
-                        patient_id = str(variant.PatientID) if hasattr(variant, 'PatientID') else None
-                        _sampled_pairs.append((str(variant.StudyInstanceUID), patient_id))
+                patient_id = patient_id_of(variant)
+                _sampled_pairs.append((str(variant.StudyInstanceUID), patient_id))
             yield variant
 
     print(f"\n[INFO] Starting throughput test with {multiplier}x multiplier")
     print(f"[INFO] Each file will be anonymized with unique UIDs before sending")
     print(f"[INFO] Source files: {len(dicom_datasets)}")
     
-    total_sent = dicom_sender.load_test_for_duration(
-        datasets=anonymized_dataset_generator(),
-        metrics=metrics,
-        duration_seconds=duration,
-        concurrency=perf_config.load_profile.concurrency,
-        rate_limit_images_per_second=target_peak,
-    )
+    # Anonymize on a background thread, a few variants ahead of the sends
+    concurrency = perf_config.load_profile.concurrency
+    variants = prefetch(anonymized_dataset_generator(), depth=2 * concurrency)
+    try:
+        total_sent = dicom_sender.load_test_for_duration(
+            datasets=variants,
+            metrics=metrics,
+            duration_seconds=duration,
+            concurrency=concurrency,
+            rate_limit_images_per_second=target_peak,
+        )
+    finally:
+        variants.close()
 
     snapshot = metrics.snapshot()
     actual_rate = metrics.throughput_per_second()
@@ -155,10 +189,10 @@ def test_routing_throughput_under_peak_plus(
     print(f"\n[SUCCESS] Sent {total_sent} anonymized files with unique IDs")
     print("Throughput snapshot:", snapshot)
 
-    # Sample-based C-FIND verification (up to 5 from collected UIDs)
-    sample_pairs = _sampled_pairs[:5]
+    # Sample-based C-FIND verification (up to 5 from collected UIDs; the
+    # prefetch buffer may hold variants that were never sent)
+    sample_pairs = _sampled_pairs[:min(5, total_sent)]
     if sample_pairs:
         print(f"\n[C-FIND VERIFICATION] Verifying sample of {len(sample_pairs)} study UIDs")
-        for uid, patient_id in sample_pairs:
-            verify_study_arrived(cfind_client, uid, perf_config, patient_id=patient_id)
+        verifier.verify_all(sample_pairs)
 
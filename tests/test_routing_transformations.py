@@ -17,7 +17,12 @@ def _accession(suffix: str) -> str:
 
 from data_loader import load_dataset
 from metrics import PerfMetrics
-from tests.conftest import manual_verification_required, verify_study_arrived
+from tests.conftest import (
+    manual_verification_required,
+    patient_id_of,
+    uid_sequence,
+    verify_study_arrived,
+)
 
 
 # ============================================================================
@@ -173,42 +178,34 @@ def test_routing_transformation(
         print(f"  SeriesInstanceUID: {test_dataset.SeriesInstanceUID}")
         print(f"  SOPInstanceUID: {test_dataset.SOPInstanceUID}")
         
-        # Override both AE titles to match the test case's route
-        original_local_ae = dicom_sender.endpoint.local_ae_title
-        original_remote_ae = dicom_sender.endpoint.remote_ae_title
-        dicom_sender.endpoint.local_ae_title = local_ae
-        dicom_sender.endpoint.remote_ae_title = remote_ae
+        # Sender with both AE titles matching the test case's route
+        sender = dicom_sender.with_endpoint(local_ae_title=local_ae, remote_ae_title=remote_ae)
         
-        try:
-            # Send to Compass
-            print(f"\n[STEP 1: SENDING TO COMPASS]")
-            print(f"  Compass Host: {dicom_sender.endpoint.host}")
-            print(f"  Compass Port: {dicom_sender.endpoint.port}")
-            
-            ds = load_dataset(test_file_path)
-            dicom_sender._send_single_dataset(ds, metrics)
-            
-            # Verify send was successful
-            assert metrics.successes == 1, \
-                f"Send failed: {metrics.failures} failures, error rate: {metrics.error_rate:.1%}"
-            
-            print(f"  Status: SUCCESS")
-            print(f"  Latency: {metrics.avg_latency_ms:.2f}ms")
-            
-            # Automated verification via C-FIND
-            print(f"\n[STEP 2: AUTOMATED VERIFICATION VIA C-FIND]")
-            patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
-            query_and_verify(
-                cfind_client, perf_config,
-                str(test_dataset.StudyInstanceUID), test_case['expected'],
-                patient_id=patient_id,
-            )
-            
-            print(f"\n[RESULT: TEST COMPLETE]")
-            
-        finally:
-            dicom_sender.endpoint.local_ae_title = original_local_ae
-            dicom_sender.endpoint.remote_ae_title = original_remote_ae
+        # Send to Compass
+        print(f"\n[STEP 1: SENDING TO COMPASS]")
+        print(f"  Compass Host: {sender.endpoint.host}")
+        print(f"  Compass Port: {sender.endpoint.port}")
+
+        ds = load_dataset(test_file_path)
+        sender._send_single_dataset(ds, metrics)
+
+        # Verify send was successful
+        assert metrics.successes == 1, \
+            f"Send failed: {metrics.failures} failures, error rate: {metrics.error_rate:.1%}"
+
+        print(f"  Status: SUCCESS")
+        print(f"  Latency: {metrics.avg_latency_ms:.2f}ms")
+
+        # Automated verification via C-FIND
+        print(f"\n[STEP 2: AUTOMATED VERIFICATION VIA C-FIND]")
+        patient_id = patient_id_of(ds)
+        query_and_verify(
+            cfind_client, perf_config,
+            str(test_dataset.StudyInstanceUID), test_case['expected'],
+            patient_id=patient_id,
+        )
+
+        print(f"\n[RESULT: TEST COMPLETE]")
     
     finally:
         # Cleanup temp file
@@ -237,7 +234,7 @@ def query_and_verify(cfind_client, perf_config, study_uid: str, expected_attribu
         pytest.skip("C-FIND verification is required for transformation tests (set CFIND_VERIFY=true)")
 
     study_data = verify_study_arrived(cfind_client, study_uid, perf_config, patient_id=patient_id)
-    strategy = getattr(cfind_client, 'last_find_strategy', None) or 'unknown'
+    strategy = study_data.get('_cfind_strategy') or 'unknown'
 
     # STUDY-level: verify each expected attribute
 
@@ -309,17 +306,16 @@ def test_patient_id_coerced_from_other_patient_ids(
     5. Send via LB-HTM-IM route (SCU=TEAM_SCP, SCP=LB-HTM-IM)
     6. C-FIND verification: PatientID should equal original MRN (coerced)
     """
-    from pydicom.uid import generate_uid
-
     ds = load_dataset(single_dicom_file)
 
-    study_uid = generate_uid()
+    uids = uid_sequence()
+    study_uid = next(uids)
     ds.StudyInstanceUID = study_uid
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID = generate_uid()
+    ds.SeriesInstanceUID = next(uids)
+    ds.SOPInstanceUID = next(uids)
 
     # Keep the original PatientID (MRN) from the file
-    original_patient_id = str(ds.PatientID) if hasattr(ds, 'PatientID') else None
+    original_patient_id = patient_id_of(ds)
 
     # Blank AccessionNumber so the non-ordered route accepts the study
     ds.AccessionNumber = ''
@@ -336,8 +332,6 @@ def test_patient_id_coerced_from_other_patient_ids(
     # Use the IIMS route: SCU=TEAM_SCP, SCP=LB-HTM-IM
     iims_scu = perf_config.integration.iims_scu_ae_title
     iims_scp = perf_config.integration.iims_scp_ae_title
-    default_local_ae = dicom_sender.endpoint.local_ae_title
-    default_remote_ae = dicom_sender.endpoint.remote_ae_title
 
     print(f"\n{'='*70}")
     print(f"PATIENT ID COERCION TEST (OtherPatientIDs -> PatientID)")
@@ -350,66 +344,60 @@ def test_patient_id_coerced_from_other_patient_ids(
     print(f"  Expected PatientID after Compass: {mrn_value}  (coerced from 0010,1000)")
     print(f"  Route: SCU={iims_scu} -> SCP={iims_scp}")
 
-    # Override AE titles for the LB-HTM-IM route
-    dicom_sender.endpoint.local_ae_title = iims_scu
-    dicom_sender.endpoint.remote_ae_title = iims_scp
+    # Sender for the LB-HTM-IM route
+    sender = dicom_sender.with_endpoint(local_ae_title=iims_scu, remote_ae_title=iims_scp)
+
+    # Send to Compass
+    print(f"\n[STEP 1: SENDING TO COMPASS via {iims_scp}]")
+    print(f"  [DEBUG] Tags being sent:")
+    print(f"    PatientID (0010,0020)       : '{ds.PatientID}'")
+    print(f"    AccessionNumber (0008,0050)  : '{ds.AccessionNumber}'")
+    print(f"    OtherPatientIDs (0010,1000)  : '{ds.OtherPatientIDs if hasattr(ds, 'OtherPatientIDs') else '<NOT PRESENT>'}'")
+    print(f"    StudyInstanceUID             : '{ds.StudyInstanceUID}'")
+    print(f"    Calling AE: {sender.endpoint.local_ae_title}")
+    print(f"    Called AE : {sender.endpoint.remote_ae_title}")
+    sender._send_single_dataset(ds, metrics)
+
+    assert metrics.successes == 1, (
+        f"Send failed: {metrics.failures} failure(s), "
+        f"error rate: {metrics.error_rate:.1%}"
+    )
+    print(f"  Status : SUCCESS")
+    print(f"  Latency: {metrics.avg_latency_ms:.2f}ms")
+
+    # C-FIND verification when we expect the study to have been routed
+    print(f"\n[STEP 2: C-FIND VERIFICATION]")
 
-    try:
-        # Send to Compass
-        print(f"\n[STEP 1: SENDING TO COMPASS via {iims_scp}]")
-        print(f"  [DEBUG] Tags being sent:")
-        print(f"    PatientID (0010,0020)       : '{ds.PatientID}'")
-        print(f"    AccessionNumber (0008,0050)  : '{ds.AccessionNumber}'")
-        print(f"    OtherPatientIDs (0010,1000)  : '{ds.OtherPatientIDs if hasattr(ds, 'OtherPatientIDs') else '<NOT PRESENT>'}'")
-        print(f"    StudyInstanceUID             : '{ds.StudyInstanceUID}'")
-        print(f"    Calling AE: {dicom_sender.endpoint.local_ae_title}")
-        print(f"    Called AE : {dicom_sender.endpoint.remote_ae_title}")
-        dicom_sender._send_single_dataset(ds, metrics)
-
-        assert metrics.successes == 1, (
-            f"Send failed: {metrics.failures} failure(s), "
-            f"error rate: {metrics.error_rate:.1%}"
+    if cfind_client is None:
+        pytest.skip(
+            "C-FIND verification is required for this test (set CFIND_VERIFY=true)"
         )
-        print(f"  Status : SUCCESS")
-        print(f"  Latency: {metrics.avg_latency_ms:.2f}ms")
-
-        # C-FIND verification when we expect the study to have been routed
-        print(f"\n[STEP 2: C-FIND VERIFICATION]")
-
-        if cfind_client is None:
-            pytest.skip(
-                "C-FIND verification is required for this test (set CFIND_VERIFY=true)"
-            )
 
-        cfind_study = verify_study_arrived(
-            cfind_client, str(study_uid), perf_config, patient_id=mrn_value,
+    cfind_study = verify_study_arrived(
+        cfind_client, str(study_uid), perf_config, patient_id=mrn_value,
+    )
+
+    actual_patient_id = cfind_study.get('PatientID', '') if cfind_study else ''
+
+    print(f"\n  [COERCION CHECK]")
+    print(f"    Sent PatientID (0010,0020)        : {patient_id_value} (AC-prefixed)")
+    print(f"    Sent OtherPatientIDs (0010,1000)  : {mrn_value} (MRN)")
+    print(f"    Received PatientID via C-FIND     : {actual_patient_id}")
+
+    with manual_verification_required(
+        f"PatientID coercion -- verify on Compass that PatientID "
+        f"for study {study_uid} equals '{mrn_value}' (coerced from "
+        f"OtherPatientIDs). Sent PatientID was '{patient_id_value}'."
+    ):
+        assert actual_patient_id == mrn_value, (
+            f"PatientID coercion failed: expected '{mrn_value}' "
+            f"(from OtherPatientIDs) but C-FIND returned '{actual_patient_id}'. "
+            f"Original PatientID sent was '{patient_id_value}'. "
+            f"Route: SCU={iims_scu}, SCP={iims_scp}."
         )
 
-        actual_patient_id = cfind_study.get('PatientID', '') if cfind_study else ''
-
-        print(f"\n  [COERCION CHECK]")
-        print(f"    Sent PatientID (0010,0020)        : {patient_id_value} (AC-prefixed)")
-        print(f"    Sent OtherPatientIDs (0010,1000)  : {mrn_value} (MRN)")
-        print(f"    Received PatientID via C-FIND     : {actual_patient_id}")
-
-        with manual_verification_required(
-            f"PatientID coercion -- verify on Compass that PatientID "
-            f"for study {study_uid} equals '{mrn_value}' (coerced from "
-            f"OtherPatientIDs). Sent PatientID was '{patient_id_value}'."
-        ):
-            assert actual_patient_id == mrn_value, (
-                f"PatientID coercion failed: expected '{mrn_value}' "
-                f"(from OtherPatientIDs) but C-FIND returned '{actual_patient_id}'. "
-                f"Original PatientID sent was '{patient_id_value}'. "
-                f"Route: SCU={iims_scu}, SCP={iims_scp}."
-            )
-
-        print(f"    Result: PatientID correctly coerced from OtherPatientIDs")
-        print(f"\n[DONE] PatientID coercion test complete")
-
-    finally:
-        dicom_sender.endpoint.local_ae_title = default_local_ae
-        dicom_sender.endpoint.remote_ae_title = default_remote_ae
+    print(f"    Result: PatientID correctly coerced from OtherPatientIDs")
+    print(f"\n[DONE] PatientID coercion test complete")
 
 
 # ============================================================================